@@ -0,0 +1,106 @@
+"""Sound effects, decoded once at startup and played through a fixed channel pool.
+
+Every WAV is loaded into a `pygame.mixer.Sound` when the game starts, so
+playing one is just handing a ready buffer to a channel and never touches
+the disk. Effects have a priority and a voice limit. When an effect is
+already at its limit, its oldest voice is restarted. When every channel is
+busy, the lowest-priority, oldest voice is stolen, or the new sound is
+dropped if everything playing matters more. A move every MOVE_TICKS
+therefore never stacks up voices or blocks a frame.
+
+Background music is a pre-rendered WAV (see midi_render.py) streamed by the
+mixer, so it costs next to nothing per frame and does not depend on the
+platform's MIDI synth.
+
+If the mixer could not be initialised (no audio device), `play` does nothing.
+"""
+
+import os
+import random
+
+import pygame
+
+SOUND_DIR = os.path.dirname(os.path.abspath(__file__))
+CHANNELS = 8
+
+# name -> (files, priority, max voices); one of the files is picked at random per play
+EFFECTS = {
+    'move': (('sounds/move1.wav', 'sounds/move2.wav', 'sounds/move3.wav'), 1, 2),
+    'backtrack': (('move_beep.wav',), 2, 2),
+    'victory': (('sounds/victory_A.wav', 'sounds/victory_B.wav', 'victory_melody.wav'), 10, 1),
+}
+
+
+class SoundEffects:
+    """Pre-decoded effects plus a fixed pool of mixer channels with priority-based voice stealing."""
+
+    def __init__(self, effects=EFFECTS, channels=CHANNELS, base_dir=SOUND_DIR, volume=0.6, rng=random):
+        self.enabled = pygame.mixer.get_init() is not None
+        self.rng = rng
+        self.volume = volume
+        self.sounds = {} # name -> list of Sound
+        self.rules = {} # name -> (priority, max voices)
+        self.voices = [None] * channels # Per channel: (name, priority, start order) of its last sound
+        self._order = 0
+        if not self.enabled:
+            return
+        pygame.mixer.set_num_channels(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        for name, (files, priority, max_voices) in effects.items():
+            sounds = [pygame.mixer.Sound(os.path.join(base_dir, f)) for f in files]
+            for sound in sounds:
+                sound.set_volume(volume)
+            self.sounds[name] = sounds
+            self.rules[name] = (priority, max_voices)
+
+    def set_sounds(self, name, sounds):
+        """Replaces the sounds of effect `name` (e.g. with synthesized ones), keeping its priority and voice limit."""
+        for sound in sounds:
+            sound.set_volume(self.volume)
+        self.sounds[name] = list(sounds)
+
+    def _pick_channel(self, name, priority, max_voices):
+        """Index of the channel to play on, or None to drop the sound."""
+        busy = []
+        free = None
+        for i, voice in enumerate(self.voices):
+            if voice and self.channels[i].get_busy():
+                busy.append((voice, i))
+            elif free is None:
+                free = i
+        same = [(voice[2], i) for voice, i in busy if voice[0] == name]
+        if len(same) >= max_voices:
+            return min(same)[1] # Restart this effect's oldest voice
+        if free is not None:
+            return free
+        victim, index = min(busy, key=lambda b: (b[0][1], b[0][2])) # Lowest priority, then oldest
+        return index if victim[1] <= priority else None
+
+    def play(self, name, priority=None):
+        """Starts effect `name` without blocking. Returns the Channel used, or None if dropped."""
+        if not self.enabled:
+            return None
+        default_priority, max_voices = self.rules[name]
+        priority = default_priority if priority is None else priority
+        index = self._pick_channel(name, priority, max_voices)
+        if index is None:
+            return None
+        channel = self.channels[index]
+        channel.play(self.rng.choice(self.sounds[name])) # Replaces whatever the channel was playing
+        self._order += 1
+        self.voices[index] = (name, priority, self._order)
+        return channel
+
+    def stop(self):
+        if self.enabled:
+            pygame.mixer.stop()
+
+
+def start_music(path, volume=0.4):
+    """Loops a pre-rendered music file in the background. Returns False if there is no mixer."""
+    if pygame.mixer.get_init() is None:
+        return False
+    pygame.mixer.music.load(path) # Streamed in the mixer thread, not decoded up front
+    pygame.mixer.music.set_volume(volume)
+    pygame.mixer.music.play(-1)
+    return True
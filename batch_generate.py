@@ -0,0 +1,110 @@
+"""Headless batch maze generation (no pygame needed).
+
+Generates N mazes across a process pool. Every maze gets its own seed derived
+from one master seed and its index, so the output is identical whatever the
+worker count. Workers write each maze to disk as soon as it is done, and the
+parent appends one line per maze to manifest.jsonl in index order, holding
+back mazes that finish ahead of an earlier one.
+
+Usage: python batch_generate.py --count 1000 --width 200 --height 200 --algorithm kruskal --seed 42 --out pack/
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from generators import GENERATORS, generate
+from maze_file import save_maze
+
+
+# --- Seeding ---
+def derive_seed(master_seed, index):
+    """64-bit seed for maze `index`, stable across runs, platforms and worker counts."""
+    digest = hashlib.blake2b(f"{master_seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+# --- Worker ---
+def generate_one(index, seed, width, height, algorithm, out_dir):
+    """Generates one maze and saves it as a .maze file in out_dir. Returns its manifest entry."""
+    grid = generate(algorithm, width, height, rng=random.Random(seed))
+    filename = f"maze_{index:06d}.maze"
+    save_maze(os.path.join(out_dir, filename), grid, algorithm, seed)
+    return {
+        'index': index, 'file': filename, 'width': width, 'height': height,
+        'algorithm': algorithm, 'seed': seed,
+        'start': [0, 0], 'end': [width - 1, height - 1],
+    }
+
+
+# --- Batch Driver ---
+def run_batch(count, width, height, algorithm, master_seed, out_dir, workers=None, on_done=None):
+    """Generates `count` mazes into out_dir and returns the elapsed wall time.
+
+    At most a few tasks per worker are in flight or finished but held back
+    (to keep the manifest in index order) at once, so memory stays flat no
+    matter how large `count` is, even while an early maze is slow.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 4
+    start_time = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            open(os.path.join(out_dir, 'manifest.jsonl'), 'w') as manifest:
+        pending = set()
+        next_index = 0
+        finished = {} # index -> entry, until every earlier entry is written
+        next_write = 0
+        while next_index < count or pending:
+            while next_index < count and len(pending) + len(finished) < max_pending:
+                seed = derive_seed(master_seed, next_index)
+                pending.add(pool.submit(generate_one, next_index, seed, width, height, algorithm, out_dir))
+                next_index += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entry = future.result()
+                finished[entry['index']] = entry
+                if on_done:
+                    on_done(entry)
+            while next_write in finished:
+                manifest.write(json.dumps(finished.pop(next_write)) + '\n')
+                next_write += 1
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a pack of mazes without pygame.")
+    parser.add_argument('--count', type=int, required=True, help="number of mazes to generate")
+    parser.add_argument('--width', type=int, default=40)
+    parser.add_argument('--height', type=int, default=40)
+    parser.add_argument('--algorithm', default='dfs', choices=sorted(GENERATORS))
+    parser.add_argument('--seed', type=int, default=None, help="master seed (random if omitted)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--out', default='maze_pack', help="output directory")
+    args = parser.parse_args()
+
+    master_seed = args.seed if args.seed is not None else random.randrange(2 ** 63)
+    print(f"Generating {args.count} {args.algorithm} mazes ({args.width}x{args.height}), master seed {master_seed}")
+
+    finished = 0
+    last_report = time.perf_counter()
+
+    def report(entry):
+        nonlocal finished, last_report
+        finished += 1
+        now = time.perf_counter()
+        if now - last_report >= 1.0:
+            print(f"  {finished}/{args.count} mazes")
+            last_report = now
+
+    elapsed = run_batch(args.count, args.width, args.height, args.algorithm, master_seed, args.out, args.workers, report)
+    print(f"Done: {args.count} mazes in {elapsed:.2f}s ({args.count / elapsed:.1f} mazes/s) -> {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""Benchmark suite: every registered generator and solver across maze sizes.
+
+For each generator and size it records the best wall time, cells/second and
+the tracemalloc peak, the time of each solver from corner to corner, and
+maze quality metrics (dead ends, junctions, mean corridor length, solution
+length).
+A speed-up that changes the character of the mazes therefore shows up in
+the numbers. Results are written as JSON. `--compare` loads an earlier run
+and prints the differences, so two commits can be checked against each other.
+
+By default every generator runs at every size. With `--budget`, a
+generator or solver whose predicted time (scaled from its previous size) is
+over the budget is skipped at that size; the skip and the predicted time are
+still reported, in the table and the JSON, so every size of the sweep shows
+up for every generator.
+
+Usage: python benchmarks/bench_suite.py [--sizes 40,256,1024,4096] [--out bench.json] [--compare old.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import GENERATORS
+from maze_grid import MazeGrid
+from solver import SOLVERS
+
+# Open directions per wall mask (4 minus the wall count)
+_OPENINGS = bytes(4 - bin(mask & 0x0F).count('1') for mask in range(256))
+
+
+# --- Quality Metrics ---
+def maze_quality(grid, solution):
+    """Dead ends, junctions, mean corridor length and solution length of a generated maze.
+
+    The mean corridor length is in moves: the number of open passages divided
+    by the number of corridors between dead ends and junctions.
+    Long winding corridors give a high value; bushy mazes with many short
+    branches a low one.
+    """
+    openings = bytes(grid.walls).translate(_OPENINGS)
+    counts = [openings.count(n) for n in range(5)]
+    passages = (counts[1] + 2 * counts[2] + 3 * counts[3] + 4 * counts[4]) // 2
+    corridor_ends = counts[1] + 3 * counts[3] + 4 * counts[4]
+    return {
+        'dead_ends': counts[1],
+        'junctions': counts[3] + counts[4],
+        'mean_corridor': round(passages / (corridor_ends / 2), 3) if corridor_ends else float(passages),
+        'solution_length': len(solution) - 1 if solution else None, # None: every solver was skipped
+    }
+
+
+# --- Measurement ---
+def run_generator(func, size, seed):
+    """Carves one size x size maze. Returns (grid, seconds)."""
+    grid = MazeGrid(size, size)
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    func(grid, rng)
+    return grid, time.perf_counter() - start
+
+
+def peak_memory(func, size, seed):
+    """Peak bytes allocated by Python (tracemalloc) while building and carving one maze."""
+    tracemalloc.start()
+    try:
+        grid = MazeGrid(size, size)
+        func(grid, random.Random(seed))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def predicted(previous, cells):
+    """Seconds predicted for `cells` from the (cells, seconds) of a smaller run, assuming linear cost."""
+    return previous[1] * cells / previous[0] if previous else None
+
+
+def bench_one(name, func, size, seed, repeats, memory, budget=None, previous_solvers=None):
+    """Times one generator at one size, then each solver on its maze.
+
+    previous_solvers maps solver names to (cells, seconds) of their last run;
+    solvers predicted to take longer than `budget` are skipped.
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        grid, seconds = run_generator(func, size, seed)
+        best = min(best, seconds)
+    cells = size * size
+    result = {
+        'algorithm': name, 'width': size, 'height': size, 'cells': cells,
+        'seconds': round(best, 6), 'cells_per_s': round(cells / best),
+        'peak_bytes': peak_memory(func, size, seed) if memory else None,
+        'solvers': {},
+    }
+    solution = None
+    previous_solvers = {} if previous_solvers is None else previous_solvers
+    for solver_name, solver in SOLVERS.items():
+        estimate = predicted(previous_solvers.get(solver_name), cells)
+        if budget is not None and estimate is not None and estimate > budget:
+            result['solvers'][solver_name] = {'skipped': True, 'predicted_seconds': round(estimate, 3)}
+            continue
+        start = time.perf_counter()
+        path, stats = solver(grid, 0, grid.size - 1)
+        result['solvers'][solver_name] = {
+            'seconds': round(time.perf_counter() - start, 6),
+            'nodes_expanded': stats.nodes_expanded,
+            'peak_frontier': stats.peak_frontier,
+        }
+        previous_solvers[solver_name] = (cells, result['solvers'][solver_name]['seconds'])
+        if solution is None:
+            solution = path
+    result['quality'] = maze_quality(grid, solution)
+    return result
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- Reporting ---
+def print_result(r):
+    size = f"{r['width']}x{r['height']}"
+    if r.get('skipped'):
+        print(f"{r['algorithm']:<15} {size:>11}   skipped (predicted {r['predicted_seconds']:g}s, over budget)")
+        return
+    peak = f"{r['peak_bytes'] / 2**20:9.1f}" if r['peak_bytes'] is not None else f"{'-':>9}"
+    bfs = r['solvers']['bfs']
+    bfs = f"{'skipped':>8}" if bfs.get('skipped') else f"{bfs['seconds']:8.3f}"
+    q = r['quality']
+    solution = q['solution_length'] if q['solution_length'] is not None else '-'
+    print(f"{r['algorithm']:<15} {size:>11} {r['seconds']:9.3f} "
+          f"{r['cells_per_s'] / 1e6:9.2f} {peak} {bfs} "
+          f"{q['dead_ends']:>9} {q['mean_corridor']:>8} {solution:>9}")
+
+
+def compare(old_results, new_results, threshold=0.10):
+    """Prints time changes beyond `threshold` and any change in the quality metrics."""
+    old = {(r['algorithm'], r['width'], r['height']): r for r in old_results}
+    print(f"\nCompared with previous run ({threshold:.0%} time threshold):")
+    changes = 0
+    for r in new_results:
+        key = (r['algorithm'], r['width'], r['height'])
+        prev = old.get(key)
+        if prev is None or r.get('skipped') or prev.get('skipped'):
+            continue
+        label = f"{key[0]} {key[1]}x{key[2]}"
+        ratio = r['seconds'] / prev['seconds'] if prev['seconds'] else 1.0
+        if abs(ratio - 1) > threshold:
+            print(f"  {label}: generation {prev['seconds']:.3f}s -> {r['seconds']:.3f}s ({ratio:.2f}x)")
+            changes += 1
+        for metric, value in r['quality'].items():
+            if metric in prev['quality'] and prev['quality'][metric] != value:
+                print(f"  {label}: {metric} changed {prev['quality'].get(metric)} -> {value}  (maze character changed)")
+                changes += 1
+    if not changes:
+        print("  no significant changes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='40,256,1024,4096', help="comma-separated square maze sizes")
+    parser.add_argument('--algorithms', default=None, help="comma-separated generators (default: all registered)")
+    parser.add_argument('--repeats', type=int, default=3, help="timed runs per measurement (best is kept)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--budget', type=float, default=None,
+                        help="skip generator and solver runs predicted to take longer (seconds; default: run everything)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the extra tracemalloc run")
+    parser.add_argument('--out', default='bench_results.json', help="JSON output path")
+    parser.add_argument('--compare', metavar='PATH', help="earlier JSON results to compare against")
+    args = parser.parse_args()
+
+    sizes = sorted(int(s) for s in args.sizes.split(','))
+    names = args.algorithms.split(',') if args.algorithms else list(GENERATORS)
+    results = []
+
+    print(f"{'algorithm':<15} {'size':>11} {'gen (s)':>9} {'Mcells/s':>9} {'peak MiB':>9} {'bfs (s)':>8} "
+          f"{'dead ends':>9} {'corridor':>8} {'solution':>9}")
+    for name in names:
+        func = GENERATORS[name]
+        previous = None # (cells, seconds) of the last size run
+        previous_solvers = {} # Solver name -> (cells, seconds) of its last run
+        for size in sizes:
+            estimate = predicted(previous, size * size)
+            if args.budget is not None and estimate is not None and estimate > args.budget:
+                result = {'algorithm': name, 'width': size, 'height': size, 'cells': size * size,
+                          'skipped': True, 'predicted_seconds': round(estimate, 3)}
+            else:
+                repeats = args.repeats if estimate is None or estimate < 1.0 else 1
+                result = bench_one(name, func, size, args.seed, repeats, not args.no_memory, args.budget, previous_solvers)
+                previous = (result['cells'], result['seconds'])
+            results.append(result)
+            print_result(result)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seed': args.seed,
+            'max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        'results': results,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=1)
+    print(f"\nWrote {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f)['results'], results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: NumPy-vectorized binary-tree/sidewinder vs the per-cell Python loops.
+
+Usage: python benchmarks/bench_vectorized.py [--sizes 256,1024,4096] [--loop-max 2048]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import generate_binary_tree, generate_sidewinder
+from generators.vectorized import generate_binary_tree_np, generate_sidewinder_np
+from maze_grid import MazeGrid
+
+PAIRS = [
+    ('binary-tree', generate_binary_tree, generate_binary_tree_np),
+    ('sidewinder', generate_sidewinder, generate_sidewinder_np),
+]
+
+
+def time_generator(func, size, seed, repeats):
+    """Best-of-`repeats` wall time for carving one size x size maze."""
+    best = float('inf')
+    for _ in range(repeats):
+        grid = MazeGrid(size, size)
+        rng = random.Random(seed)
+        start = time.perf_counter()
+        func(grid, rng)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='256,1024,2048,4096', help="comma-separated square maze sizes")
+    parser.add_argument('--loop-max', type=int, default=2048, help="skip the per-cell loop above this size")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'algorithm':<12} {'size':>11} {'loop (s)':>10} {'numpy (s)':>10} {'Mcells/s':>9} {'speedup':>8}")
+    for name, loop_func, numpy_func in PAIRS:
+        for size in (int(s) for s in args.sizes.split(',')):
+            cells = size * size
+            numpy_time = time_generator(numpy_func, size, args.seed, args.repeats)
+            if size <= args.loop_max:
+                loop_time = time_generator(loop_func, size, args.seed, 1)
+                loop_col, speedup_col = f"{loop_time:10.3f}", f"{loop_time / numpy_time:7.1f}x"
+            else:
+                loop_col, speedup_col = f"{'-':>10}", f"{'-':>8}"
+            print(f"{name:<12} {f'{size}x{size}':>11} {loop_col} {numpy_time:10.3f} {cells / numpy_time / 1e6:9.1f} {speedup_col}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Lazily generated maze worlds, built chunk by chunk around the player.
+
+The world is split into square chunks. Each chunk is a perfect maze carved
+on demand by a registered generator, seeded from the world seed and the
+chunk's coordinates, so it comes out the same every time it is rebuilt.
+Chunks are joined by one door per shared border. Which borders get a door
+is decided by sidewinder run over the chunk grid, which makes the chunks
+themselves form a perfect maze, and so the whole world is one. Every
+decision is a hash of the seed and the coordinates, computable from a few
+neighbouring chunks, so any chunk can be built without its neighbours
+existing.
+
+Only the most recently used chunks are kept (an LRU), so memory stays
+constant whatever the world size, and startup costs only the chunks on
+screen.
+"""
+
+import hashlib
+import random
+from collections import OrderedDict
+
+from generators import get_generator
+from maze_grid import MazeGrid, TOP, RIGHT, BOTTOM, LEFT, ALL_WALLS
+
+
+def _hash(seed, *parts):
+    """Stable 64-bit hash of the world seed and some coordinates."""
+    key = ':'.join(str(p) for p in (seed,) + parts).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+class SparseMasks(dict):
+    """Per-cell bit masks for huge grids, storing only non-zero cells.
+
+    Reads of unset cells give 0, so it stands in for a `bytearray(grid.size)`
+    (e.g. for trail edges) where that would be far too large.
+    """
+
+    def __missing__(self, index):
+        return 0
+
+
+class _ChunkedWalls:
+    """`walls[index]` view over the chunks, like MazeGrid.walls."""
+    __slots__ = ('maze',)
+
+    def __init__(self, maze):
+        self.maze = maze
+
+    def __len__(self):
+        return self.maze.size
+
+    def __getitem__(self, index):
+        return self.maze.mask(index)
+
+
+class ChunkedMaze:
+    """A width x height cell maze whose chunks are generated on first use.
+
+    Offers the read side of MazeGrid (width, height, size, index, coords,
+    mask, has_wall, walls[index]), so code that only reads walls can use it.
+    """
+
+    def __init__(self, seed, width_chunks, height_chunks, chunk_size=32, algorithm='dfs', max_chunks=64):
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.width_chunks, self.height_chunks = width_chunks, height_chunks
+        self.width, self.height = width_chunks * chunk_size, height_chunks * chunk_size
+        self.size = self.width * self.height
+        self.algorithm = algorithm
+        self.max_chunks = max_chunks
+        self.walls = _ChunkedWalls(self)
+        self._generate = get_generator(algorithm)
+        self._chunks = OrderedDict() # (cx, cy) -> bytearray of wall masks, least recently used first
+        self.chunks_generated = 0
+
+    # --- Cell Access ---
+    def index(self, x, y):
+        return y * self.width + x
+
+    def coords(self, index):
+        return index % self.width, index // self.width
+
+    def mask(self, index):
+        x, y = index % self.width, index // self.width
+        size = self.chunk_size
+        return self.chunk(x // size, y // size)[(y % size) * size + x % size]
+
+    def has_wall(self, index, bit):
+        return bool(self.mask(index) & bit)
+
+    # --- Chunk Cache ---
+    def chunk(self, cx, cy):
+        """Wall masks of chunk (cx, cy), generating it if it is not cached."""
+        key = (cx, cy)
+        chunks = self._chunks
+        walls = chunks.get(key)
+        if walls is not None:
+            chunks.move_to_end(key)
+            return walls
+        walls = chunks[key] = self._build_chunk(cx, cy)
+        self.chunks_generated += 1
+        if len(chunks) > self.max_chunks:
+            chunks.popitem(last=False) # Evict the chunk unused for longest, i.e. far from the view
+        return walls
+
+    # --- Chunk Borders (sidewinder over the chunk grid) ---
+    def _east_link(self, cx, cy):
+        """Whether chunk (cx, cy) has a door to its east neighbour."""
+        if cx >= self.width_chunks - 1:
+            return False
+        return cy == 0 or _hash(self.seed, 'e', cx, cy) & 1 == 1
+
+    def _north_link(self, cx, cy):
+        """Whether chunk (cx, cy) has a door to its north neighbour: one per run of east-linked chunks."""
+        if cy == 0:
+            return False
+        start = end = cx
+        while start > 0 and self._east_link(start - 1, cy):
+            start -= 1
+        while self._east_link(end, cy):
+            end += 1
+        return cx == start + _hash(self.seed, 'n', start, cy) % (end - start + 1)
+
+    def _door(self, kind, cx, cy):
+        """Offset along the border of the door between (cx, cy) and its east or north neighbour."""
+        return _hash(self.seed, kind, cx, cy) % self.chunk_size
+
+    def _build_chunk(self, cx, cy):
+        size = self.chunk_size
+        grid = MazeGrid(size, size)
+        self._generate(grid, random.Random(_hash(self.seed, 'chunk', cx, cy)))
+        walls = grid.walls
+        last = size - 1
+        # Open this chunk's side of each door; the neighbour opens the other side identically
+        if self._east_link(cx, cy):
+            walls[self._door('de', cx, cy) * size + last] &= ALL_WALLS ^ RIGHT
+        if cx > 0 and self._east_link(cx - 1, cy):
+            walls[self._door('de', cx - 1, cy) * size] &= ALL_WALLS ^ LEFT
+        if self._north_link(cx, cy):
+            walls[self._door('dn', cx, cy)] &= ALL_WALLS ^ TOP
+        if cy < self.height_chunks - 1 and self._north_link(cx, cy + 1):
+            walls[last * size + self._door('dn', cx, cy + 1)] &= ALL_WALLS ^ BOTTOM
+        return walls
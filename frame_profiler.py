@@ -0,0 +1,112 @@
+"""Per-phase frame timing for the game loop.
+
+The loop calls `start_frame()`, then `mark(phase)` at the end of each phase
+and `end_frame()` after presenting. Every mark charges the time since the
+previous mark to that phase, measured with perf_counter_ns. Rolling windows
+give p50/p95/p99 per phase for the overlay. Per-frame rows are kept for
+`dump()`, which writes CSV or JSON.
+
+When profiling is off, the loop skips the calls behind a single boolean
+check, so the cost is one branch per phase.
+"""
+
+import csv
+import json
+from collections import deque
+from time import perf_counter_ns
+
+TOTAL = 'total'
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class FrameProfiler:
+    """Times named phases of each frame and keeps rolling percentiles."""
+
+    def __init__(self, window=240, max_trace_frames=100000, enabled=False):
+        self.enabled = enabled
+        self.window = window
+        self.phases = [] # Phase names in first-seen order
+        self.samples = {} # phase -> deque of recent durations (ns)
+        self.trace = deque(maxlen=max_trace_frames) # Per-frame {phase: ns} rows
+        self.frame_index = 0
+        self._frame_start = 0
+        self._last = 0
+        self._current = {}
+        self._overlay = None # (rendered lines, refreshed_at_ns)
+
+    # --- Recording ---
+    def start_frame(self):
+        self._frame_start = self._last = perf_counter_ns()
+        self._current = {}
+
+    def mark(self, phase):
+        """Charges the time since the previous mark (or frame start) to `phase`."""
+        now = perf_counter_ns()
+        self._current[phase] = self._current.get(phase, 0) + now - self._last
+        self._last = now
+
+    def end_frame(self):
+        current = self._current
+        current[TOTAL] = perf_counter_ns() - self._frame_start
+        for phase, duration in current.items():
+            samples = self.samples.get(phase)
+            if samples is None:
+                samples = self.samples[phase] = deque(maxlen=self.window)
+                self.phases.append(phase)
+            samples.append(duration)
+        current['frame'] = self.frame_index
+        self.trace.append(current)
+        self.frame_index += 1
+
+    # --- Reporting ---
+    def percentiles(self):
+        """{phase: (p50, p95, p99)} in milliseconds over the rolling window."""
+        result = {}
+        for phase in self.phases:
+            values = sorted(self.samples[phase])
+            result[phase] = tuple(percentile(values, f) / 1e6 for f in (0.50, 0.95, 0.99))
+        return result
+
+    def draw_overlay(self, screen, font, topright, color=(255, 255, 0), background=(0, 0, 0), refresh_ms=500):
+        """Blits the percentile table at `topright` and returns the covered rect.
+
+        The lines are re-rendered at most every `refresh_ms`, so the overlay
+        does not add its own font rendering to every frame it measures.
+        """
+        now = perf_counter_ns()
+        if self._overlay is None or now - self._overlay[1] >= refresh_ms * 1_000_000:
+            lines = [f"{'phase':<8}{'p50':>7}{'p95':>7}{'p99':>7}"]
+            for phase, (p50, p95, p99) in self.percentiles().items():
+                lines.append(f"{phase:<8}{p50:7.2f}{p95:7.2f}{p99:7.2f}")
+            self._overlay = ([font.render(line, True, color, background) for line in lines], now)
+        x, y = topright
+        rects = []
+        for line in self._overlay[0]:
+            rects.append(screen.blit(line, line.get_rect(topright=(x, y))))
+            y += line.get_height()
+        return rects[0].unionall(rects[1:])
+
+    def dump(self, path):
+        """Writes the per-frame trace (durations in ns) as CSV or JSON, chosen by extension."""
+        columns = ['frame'] + self.phases
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({
+                    'phases': self.phases,
+                    'percentiles_ms': self.percentiles(),
+                    'frames': [[row.get(c, 0) for c in columns] for row in self.trace],
+                    'columns': columns,
+                }, f)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for row in self.trace:
+                    writer.writerow([row.get(c, 0) for c in columns])
@@ -0,0 +1,61 @@
+"""Pluggable maze generators working on the compact MazeGrid representation.
+
+Every generator has the signature `generate_<name>(grid, rng=random)`,
+carves the maze into `grid` in place and returns it. `rng` is anything
+with the `random.Random` interface, so a seeded instance makes the result
+reproducible.
+"""
+
+import random
+
+from maze_grid import MazeGrid
+from generators.binary_tree import generate_binary_tree
+from generators.dfs import generate_dfs
+from generators.division import generate_division
+from generators.growing_tree import generate_growing_tree
+from generators.kruskal import generate_kruskal
+from generators.prim import generate_prim
+from generators.sidewinder import generate_sidewinder
+from generators.wilson import generate_wilson
+
+# --- Registry ---
+GENERATORS = {
+    'dfs': generate_dfs,
+    'kruskal': generate_kruskal,
+    'prim': generate_prim,
+    'wilson': generate_wilson,
+    'sidewinder': generate_sidewinder,
+    'binary-tree': generate_binary_tree,
+    'growing-tree': generate_growing_tree,
+    'division': generate_division,
+}
+
+try:
+    from generators.vectorized import generate_binary_tree_np, generate_sidewinder_np
+except ImportError: # NumPy is optional; the pure-Python generators always work
+    pass
+else:
+    GENERATORS['binary-tree-np'] = generate_binary_tree_np
+    GENERATORS['sidewinder-np'] = generate_sidewinder_np
+
+
+def register(name, func):
+    """Adds (or replaces) a generator under `name`."""
+    GENERATORS[name] = func
+    return func
+
+
+def get_generator(name):
+    try:
+        return GENERATORS[name]
+    except KeyError:
+        raise ValueError(f"unknown maze generator '{name}' (choose from: {', '.join(GENERATORS)})") from None
+
+
+def generate(name, width, height, rng=None, seed=None):
+    """Creates a width x height MazeGrid and carves it with the named generator."""
+    if rng is None:
+        rng = random.Random(seed) if seed is not None else random
+    grid = MazeGrid(width, height)
+    get_generator(name)(grid, rng)
+    return grid
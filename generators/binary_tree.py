@@ -0,0 +1,21 @@
+"""Binary Tree algorithm maze generator."""
+
+import random
+
+from maze_grid import NO_TOP, NO_BOTTOM, NO_LEFT, NO_RIGHT
+
+
+def generate_binary_tree(grid, rng=random):
+    """Carves a maze into `grid` with the binary-tree algorithm (north/west bias)."""
+    width, size = grid.width, grid.size
+    walls = grid.walls
+    rand = rng.random
+
+    for cell in range(1, size):
+        x = cell % width
+        # Carve north or west; cells on the top row or left column have one choice
+        if cell < width or (x > 0 and rand() < 0.5):
+            walls[cell] &= NO_LEFT; walls[cell - 1] &= NO_RIGHT
+        else:
+            walls[cell] &= NO_TOP; walls[cell - width] &= NO_BOTTOM
+    return grid
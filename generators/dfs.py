@@ -0,0 +1,38 @@
+"""Depth-First Search (recursive backtracker) maze generator."""
+
+import random
+from array import array
+
+
+def generate_dfs(grid, rng=random, start=0):
+    """Carves a maze into `grid` by randomized depth-first search.
+
+    Uses an explicit array-backed stack and the grid's visited bitset, so
+    extra memory is one int per cell on the current path.
+    """
+    width, size = grid.width, grid.size
+    visited = grid.visited
+    visited.clear()
+    choice = rng.choice
+    stack = array('i')
+    current = start
+    visited.add(current)
+
+    while True:
+        x = current % width
+        neighbors = []
+        if current >= width and current - width not in visited: neighbors.append(current - width)
+        if x < width - 1 and current + 1 not in visited: neighbors.append(current + 1)
+        if current + width < size and current + width not in visited: neighbors.append(current + width)
+        if x > 0 and current - 1 not in visited: neighbors.append(current - 1)
+
+        if neighbors:
+            next_cell = choice(neighbors)
+            grid.carve(current, next_cell)
+            stack.append(current)
+            current = next_cell
+            visited.add(current)
+        elif stack:
+            current = stack.pop()
+        else: break
+    return grid
@@ -0,0 +1,56 @@
+"""Recursive Division maze generator."""
+
+import random
+
+from maze_grid import TOP, RIGHT, BOTTOM, LEFT
+
+
+def generate_division(grid, rng=random):
+    """Builds a maze in `grid` by recursive division.
+
+    Starts from an open chamber and keeps splitting it with walls that have
+    one passage each. The recursion is replaced by an explicit chamber stack.
+    """
+    width, height = grid.width, grid.height
+    walls = grid.walls
+    randint = rng.randint
+
+    # Start with no inner walls, only the outer boundary
+    for y in range(height):
+        row = y * width
+        for x in range(width):
+            mask = 0
+            if y == 0: mask |= TOP
+            if y == height - 1: mask |= BOTTOM
+            if x == 0: mask |= LEFT
+            if x == width - 1: mask |= RIGHT
+            walls[row + x] = mask
+
+    chambers = [(0, 0, width, height)]
+    while chambers:
+        x, y, w, h = chambers.pop()
+        if w < 2 or h < 2:
+            continue # Chamber is too small to divide
+
+        if w < h:
+            # --- Horizontal wall below row wall_y ---
+            wall_y = y + randint(0, h - 2)
+            passage_x = x + randint(0, w - 1)
+            row = wall_y * width
+            for i in range(x, x + w):
+                if i != passage_x:
+                    walls[row + i] |= BOTTOM
+                    walls[row + width + i] |= TOP
+            chambers.append((x, wall_y + 1, w, y + h - (wall_y + 1)))
+            chambers.append((x, y, w, wall_y - y + 1))
+        else:
+            # --- Vertical wall right of column wall_x ---
+            wall_x = x + randint(0, w - 2)
+            passage_y = y + randint(0, h - 1)
+            for i in range(y, y + h):
+                if i != passage_y:
+                    walls[i * width + wall_x] |= RIGHT
+                    walls[i * width + wall_x + 1] |= LEFT
+            chambers.append((wall_x + 1, y, x + w - (wall_x + 1), h))
+            chambers.append((x, y, wall_x - x + 1, h))
+    return grid
@@ -0,0 +1,47 @@
+"""Growing Tree algorithm maze generator."""
+
+import random
+from array import array
+
+
+def generate_growing_tree(grid, rng=random):
+    """Carves a maze into `grid` with the growing-tree algorithm.
+
+    Picks a random active cell each step (picking the newest would be DFS,
+    the oldest BFS-like). Finished cells leave the active list in O(1) by
+    swapping with the last entry.
+    """
+    width, size = grid.width, grid.size
+    visited = grid.visited
+    visited.clear()
+    randrange = rng.randrange
+    choice = rng.choice
+    active = array('i')
+
+    # 1. Start with a random cell
+    start = randrange(size)
+    visited.add(start)
+    active.append(start)
+
+    # 2. Grow the tree
+    while active:
+        i = randrange(len(active))
+        cell = active[i]
+        x = cell % width
+
+        neighbors = []
+        if cell >= width and cell - width not in visited: neighbors.append(cell - width)
+        if cell + width < size and cell + width not in visited: neighbors.append(cell + width)
+        if x > 0 and cell - 1 not in visited: neighbors.append(cell - 1)
+        if x < width - 1 and cell + 1 not in visited: neighbors.append(cell + 1)
+
+        if neighbors:
+            neighbor = choice(neighbors)
+            grid.carve(cell, neighbor)
+            visited.add(neighbor)
+            active.append(neighbor)
+        else:
+            # No unvisited neighbours, so this path is done
+            active[i] = active[-1]
+            active.pop()
+    return grid
@@ -0,0 +1,55 @@
+"""Kruskal's algorithm maze generator."""
+
+import random
+from array import array
+
+from maze_grid import NO_TOP, NO_BOTTOM, NO_LEFT, NO_RIGHT
+
+
+def generate_kruskal(grid, rng=random):
+    """Carves a maze into `grid` by randomized Kruskal's algorithm.
+
+    Every interior wall is encoded as one int (cell * 2 + 0 for its left
+    wall, cell * 2 + 1 for its top wall), shuffled once, then merged with a
+    union-find using path halving and union by rank.
+    """
+    width, size = grid.width, grid.size
+    walls = grid.walls
+
+    edges = array('i')
+    for cell in range(size):
+        if cell % width > 0: edges.append(cell * 2)
+        if cell >= width: edges.append(cell * 2 + 1)
+    rng.shuffle(edges)
+
+    # --- Disjoint Set Union ---
+    parent = array('i', range(size))
+    rank = bytearray(size)
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]] # Path halving
+            cell = parent[cell]
+        return cell
+
+    merges = size - 1
+    for edge in edges:
+        cell = edge >> 1
+        other = cell - width if edge & 1 else cell - 1
+        root_a, root_b = find(cell), find(other)
+        if root_a == root_b:
+            continue
+        if rank[root_a] < rank[root_b]:
+            root_a, root_b = root_b, root_a
+        parent[root_b] = root_a
+        if rank[root_a] == rank[root_b]:
+            rank[root_a] += 1
+
+        if edge & 1:
+            walls[cell] &= NO_TOP; walls[other] &= NO_BOTTOM
+        else:
+            walls[cell] &= NO_LEFT; walls[other] &= NO_RIGHT
+        merges -= 1
+        if merges == 0: # Spanning tree complete
+            break
+    return grid
@@ -0,0 +1,43 @@
+"""Prim's algorithm maze generator."""
+
+import random
+from array import array
+
+
+def generate_prim(grid, rng=random):
+    """Carves a maze into `grid` by randomized Prim's algorithm.
+
+    The frontier holds edges as (from_cell, to_cell) pairs in two parallel
+    arrays. A random edge is removed in O(1) by swapping it with the last one.
+    """
+    width, size = grid.width, grid.size
+    in_maze = grid.visited
+    in_maze.clear()
+    randrange = rng.randrange
+    frontier_from = array('i')
+    frontier_to = array('i')
+
+    def add_frontier(cell):
+        x = cell % width
+        if cell >= width and cell - width not in in_maze: frontier_from.append(cell); frontier_to.append(cell - width)
+        if cell + width < size and cell + width not in in_maze: frontier_from.append(cell); frontier_to.append(cell + width)
+        if x > 0 and cell - 1 not in in_maze: frontier_from.append(cell); frontier_to.append(cell - 1)
+        if x < width - 1 and cell + 1 not in in_maze: frontier_from.append(cell); frontier_to.append(cell + 1)
+
+    # 1. Start with a random cell
+    start = randrange(size)
+    in_maze.add(start)
+    add_frontier(start)
+
+    # 2. Grow the maze
+    while frontier_to:
+        i = randrange(len(frontier_to))
+        cell_from, cell_to = frontier_from[i], frontier_to[i]
+        frontier_from[i] = frontier_from[-1]; frontier_from.pop()
+        frontier_to[i] = frontier_to[-1]; frontier_to.pop()
+
+        if cell_to not in in_maze:
+            grid.carve(cell_from, cell_to)
+            in_maze.add(cell_to)
+            add_frontier(cell_to)
+    return grid
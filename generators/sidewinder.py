@@ -0,0 +1,32 @@
+"""Sidewinder algorithm maze generator."""
+
+import random
+
+from maze_grid import NO_TOP, NO_BOTTOM, NO_LEFT, NO_RIGHT
+
+
+def generate_sidewinder(grid, rng=random):
+    """Carves a maze into `grid` row by row with the sidewinder algorithm."""
+    width, height = grid.width, grid.height
+    walls = grid.walls
+    rand = rng.random
+    randrange = rng.randrange
+
+    # The top row is a special case: it must be a single passage
+    for x in range(width - 1):
+        walls[x] &= NO_RIGHT; walls[x + 1] &= NO_LEFT
+
+    for y in range(1, height):
+        row = y * width
+        run_start = 0
+        for x in range(width):
+            cell = row + x
+            # Decide whether to close the run or carve east
+            if x == width - 1 or rand() < 0.5:
+                # Close the run: carve north from a random cell in the run
+                passage = row + run_start + randrange(x - run_start + 1)
+                walls[passage] &= NO_TOP; walls[passage - width] &= NO_BOTTOM
+                run_start = x + 1
+            else:
+                walls[cell] &= NO_RIGHT; walls[cell + 1] &= NO_LEFT
+    return grid
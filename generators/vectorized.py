@@ -0,0 +1,107 @@
+"""NumPy-vectorized binary-tree and sidewinder generators.
+
+Both algorithms only make row-local decisions, so all random choices can be
+drawn up front and the walls carved with a few whole-array operations. The
+output is the same wall-mask layout as the per-cell generators.
+"""
+
+import random
+
+import numpy as np
+
+from maze_grid import TOP, RIGHT, BOTTOM, LEFT, ALL_WALLS
+
+# Rows processed per sidewinder block, sized to keep temporaries near 1M cells
+BLOCK_CELLS = 1 << 20
+
+
+def _numpy_rng(rng):
+    """Returns a NumPy Generator, deriving one from a random.Random if needed."""
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+def _wall_array(grid):
+    """Zero-copy (height, width) uint8 view of the grid's wall masks.
+
+    The walls are carved in place, so they must be a writable bytearray, one
+    mask per cell: not nibble-packed (PackedWalls) or memory-mapped read-only.
+    """
+    if not isinstance(grid.walls, bytearray):
+        raise TypeError(f"vectorized generators carve a MazeGrid with bytearray walls, not {type(grid.walls).__name__}")
+    return np.frombuffer(grid.walls, dtype=np.uint8).reshape(grid.height, grid.width)
+
+
+def _clear(walls, bit, where):
+    """Clears wall `bit` in place for the cells selected by the boolean array `where`.
+
+    Done as a dense AND with a per-cell mask, which is much faster than
+    boolean fancy indexing on large grids.
+    """
+    keep = where.view(np.uint8) * np.uint8(bit)
+    np.bitwise_xor(keep, np.uint8(ALL_WALLS), out=keep)
+    walls &= keep
+
+
+def generate_binary_tree_np(grid, rng=random):
+    """Vectorized binary-tree maze (north/west bias), carved in place into `grid`."""
+    rng = _numpy_rng(rng)
+    walls = _wall_array(grid)
+
+    # True = carve north, False = carve west
+    north = rng.integers(0, 2, size=walls.shape, dtype=np.uint8).astype(bool)
+    north[0, :] = False # Top row can only go west
+    north[:, 0] = True # Left column can only go north
+    west = ~north
+    north[0, 0] = False # The corner cell carves nothing
+
+    _clear(walls, TOP, north)
+    _clear(walls[:-1], BOTTOM, north[1:])
+    _clear(walls, LEFT, west)
+    _clear(walls[:, :-1], RIGHT, west[:, 1:])
+    return grid
+
+
+def generate_sidewinder_np(grid, rng=random):
+    """Vectorized sidewinder maze, carved in place into `grid`."""
+    rng = _numpy_rng(rng)
+    walls = _wall_array(grid)
+    height, width = walls.shape
+
+    # The top row is a single east-west passage
+    walls[0, :-1] &= ALL_WALLS ^ RIGHT
+    walls[0, 1:] &= ALL_WALLS ^ LEFT
+
+    columns = np.arange(width, dtype=np.int32)
+    block_rows = max(1, BLOCK_CELLS // width)
+    for first in range(1, height, block_rows):
+        last = min(height, first + block_rows)
+        block = walls[first:last]
+        rows = last - first
+
+        # Each cell either closes its run or carves east; the last column always closes
+        close = rng.integers(0, 2, size=(rows, width), dtype=np.uint8).astype(bool)
+        close[:, -1] = True
+
+        # Run start for every cell = one past the previous closing cell in the row
+        closing_at = np.where(close, columns, -1)
+        np.maximum.accumulate(closing_at, axis=1, out=closing_at)
+        run_start = np.empty_like(closing_at)
+        run_start[:, 0] = 0
+        run_start[:, 1:] = closing_at[:, :-1] + 1
+
+        # Carve east along each open run
+        east = ~close[:, :-1]
+        _clear(block[:, :-1], RIGHT, east)
+        _clear(block[:, 1:], LEFT, east)
+
+        # Close each run by carving north from a random cell in it
+        row_idx, end_x = np.nonzero(close)
+        start_x = run_start[row_idx, end_x]
+        offset = (rng.random(len(end_x), dtype=np.float32) * (end_x - start_x + 1)).astype(np.int32)
+        north = np.zeros((rows, width), dtype=bool)
+        north[row_idx, np.minimum(start_x + offset, end_x)] = True
+        _clear(block, TOP, north)
+        _clear(walls[first - 1:last - 1], BOTTOM, north)
+    return grid
@@ -0,0 +1,55 @@
+"""Wilson's algorithm maze generator (loop-erased random walks)."""
+
+import random
+from array import array
+
+
+def generate_wilson(grid, rng=random):
+    """Carves a uniform spanning-tree maze into `grid` with Wilson's algorithm.
+
+    Each walk only records the last exit taken from every cell it touches.
+    Retracing those exits from the walk start yields the loop-erased path
+    directly, so loops are never searched for or spliced out.
+    """
+    width, size = grid.width, grid.size
+    in_maze = grid.visited
+    in_maze.clear()
+    randrange = rng.randrange
+    next_cell = array('i', bytes(4 * size)) # Last exit taken from each cell during a walk
+
+    # 1. Seed the maze with one random cell
+    in_maze.add(randrange(size))
+
+    # Walks start from unvisited cells in random order
+    order = array('i', range(size))
+    rng.shuffle(order)
+
+    # 2. Perform random walks until all cells are in the maze
+    for start in order:
+        if start in in_maze:
+            continue
+
+        current = start
+        while current not in in_maze:
+            x = current % width
+            while True:
+                direction = randrange(4)
+                if direction == 0:
+                    if current >= width: step = current - width; break
+                elif direction == 1:
+                    if current + width < size: step = current + width; break
+                elif direction == 2:
+                    if x > 0: step = current - 1; break
+                elif x < width - 1:
+                    step = current + 1; break
+            next_cell[current] = step
+            current = step
+
+        # 3. Add the loop-erased path to the maze
+        current = start
+        while current not in in_maze:
+            step = next_cell[current]
+            grid.carve(current, step)
+            in_maze.add(current)
+            current = step
+    return grid
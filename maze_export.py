@@ -0,0 +1,171 @@
+"""Headless maze export to PNG and SVG (needs NumPy, not pygame).
+
+PNG: the wall masks are rasterized straight into a NumPy boolean buffer,
+one band of maze rows at a time, and written as a 1-bit greyscale PNG
+through zlib. Memory stays bounded by the band size whatever the maze size.
+
+SVG: consecutive collinear walls are merged into runs, so every straight
+wall is one `h n` / `v n` path segment whatever its length. Coordinates are
+whole cells, and each run after the first on a line is a short relative
+move from the end of the previous one, which keeps the file small.
+
+Usage: python maze_export.py maze.maze out.png [--cell 8] [--wall 2]
+       python maze_export.py maze.maze out.svg
+"""
+
+import argparse
+import struct
+import zlib
+
+import numpy as np
+
+from maze_file import PackedWalls, load_maze
+from maze_grid import TOP, RIGHT, BOTTOM, LEFT
+
+BAND_ROWS = 256 # Maze rows rasterized at a time
+
+
+def wall_array(grid):
+    """The grid's wall masks as a (height, width) uint8 array (zero-copy for bytearray walls)."""
+    walls = grid.walls
+    if isinstance(walls, PackedWalls):
+        walls = walls.unpack()
+    return np.frombuffer(walls, dtype=np.uint8).reshape(grid.height, grid.width)
+
+
+# --- Raster ---
+def rasterize_band(masks, y0, y1, cell=8, wall=2):
+    """Boolean wall pixels (True = wall) for maze rows [y0, y1).
+
+    Each cell is `cell` pixels square; walls are `wall` pixels thick and drawn
+    from the cell's top-left corner, so the full image is
+    (height * cell + wall) x (width * cell + wall). The band covers pixel rows
+    [y0 * cell, y1 * cell), plus the closing wall rows for the last band.
+    Walls are stamped with strided slice assignments, one per pixel offset
+    inside a wall, so the work is whole-array NumPy operations.
+    """
+    h, w = masks.shape
+    lo = max(y0 - 1, 0) # One row of context: its vertical walls reach into this band
+    rows = masks[lo:y1]
+    n = y1 - lo
+
+    horizontal = np.zeros((n + 1, w), dtype=bool) # Wall along the top of each row (and the bottom edge)
+    horizontal[:n] = rows & TOP
+    if y1 == h:
+        horizontal[n] = masks[h - 1] & BOTTOM
+    vertical = np.zeros((n, w + 1), dtype=bool) # Wall along the left of each column (and the right edge)
+    vertical[:, :w] = rows & LEFT
+    vertical[:, w] = rows[:, w - 1] & RIGHT
+
+    img = np.zeros((n * cell + wall, w * cell + wall), dtype=bool)
+    for dy in range(wall):
+        for dx in range(cell + wall):
+            img[dy:dy + n * cell + 1:cell, dx:dx + (w - 1) * cell + 1:cell] |= horizontal
+    for dy in range(cell + wall):
+        for dx in range(wall):
+            img[dy:dy + (n - 1) * cell + 1:cell, dx:dx + w * cell + 1:cell] |= vertical
+
+    first = (y0 - lo) * cell
+    return img[first:n * cell + (wall if y1 == h else 0)]
+
+
+def _png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def export_png(grid, path, cell=8, wall=2, band_rows=BAND_ROWS, compression=4):
+    """Writes the maze as a 1-bit PNG: black walls on white.
+
+    zlib level 4 compresses nearly as well as 6 at a fifth of the time, and
+    compression is most of the export time.
+    """
+    masks = wall_array(grid)
+    h, w = masks.shape
+    width_px, height_px = w * cell + wall, h * cell + wall
+    compressor = zlib.compressobj(compression)
+    idat = []
+    for y0 in range(0, h, band_rows):
+        band = np.packbits(~rasterize_band(masks, y0, min(h, y0 + band_rows), cell, wall), axis=1)
+        rows = np.empty((band.shape[0], band.shape[1] + 1), dtype=np.uint8)
+        rows[:, 0] = 0 # Filter type: none
+        rows[:, 1:] = band
+        idat.append(compressor.compress(rows.tobytes()))
+    idat.append(compressor.flush())
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width_px, height_px, 1, 0, 0, 0, 0)))
+        f.write(_png_chunk(b'IDAT', b''.join(idat)))
+        f.write(_png_chunk(b'IEND', b''))
+
+
+# --- SVG ---
+def wall_runs(lines):
+    """(line, start, end) of each run of consecutive True values along axis 1 of a boolean array."""
+    padded = np.zeros((lines.shape[0], lines.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = lines
+    edges = np.diff(padded, axis=1)
+    start_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return zip(start_rows.tolist(), starts.tolist(), ends.tolist())
+
+
+def _run_path(runs, vertical):
+    """Path data for wall runs: an absolute move to each line's first run, relative moves after that."""
+    parts = []
+    line_at = end = -1
+    for line, start, stop in runs:
+        if line != line_at:
+            parts.append(f"M{line} {start}v{stop - start}" if vertical else f"M{start} {line}h{stop - start}")
+            line_at = line
+        else:
+            parts.append(f"m0 {start - end}v{stop - start}" if vertical else f"m{start - end} 0h{stop - start}")
+        end = stop
+    return ''.join(parts)
+
+
+def export_svg(grid, path, cell=8, wall=2):
+    """Writes the maze as an SVG path with collinear walls merged. `cell`/`wall` set the pixel size."""
+    masks = wall_array(grid)
+    h, w = masks.shape
+    horizontal = np.zeros((h + 1, w), dtype=bool)
+    horizontal[:h] = masks & TOP
+    horizontal[h] = masks[h - 1] & BOTTOM
+    vertical = np.zeros((w + 1, h), dtype=bool) # Transposed: one line per column boundary
+    vertical[:w] = (masks & LEFT).T
+    vertical[w] = masks[:, w - 1] & RIGHT
+
+    stroke = wall / cell
+    with open(path, 'w') as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{w * cell + wall}" height="{h * cell + wall}" '
+                f'viewBox="{-stroke / 2:g} {-stroke / 2:g} {w + stroke:g} {h + stroke:g}">\n')
+        f.write(f'<rect x="{-stroke / 2:g}" y="{-stroke / 2:g}" width="{w + stroke:g}" height="{h + stroke:g}" fill="white"/>\n')
+        f.write(f'<path fill="none" stroke="black" stroke-width="{stroke:g}" stroke-linecap="square" d="')
+        f.write(_run_path(wall_runs(horizontal), False))
+        f.write(_run_path(wall_runs(vertical), True))
+        f.write('"/>\n</svg>\n')
+
+
+EXPORTERS = {
+    '.png': export_png,
+    '.svg': export_svg,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a .maze file as PNG or SVG.")
+    parser.add_argument('maze', help="input .maze file")
+    parser.add_argument('out', help="output path ending in .png or .svg")
+    parser.add_argument('--cell', type=int, default=8, help="cell size in pixels")
+    parser.add_argument('--wall', type=int, default=2, help="wall thickness in pixels")
+    args = parser.parse_args()
+
+    extension = args.out[args.out.rfind('.'):].lower()
+    if extension not in EXPORTERS:
+        parser.error(f"unsupported output type '{extension}' (choose from: {', '.join(EXPORTERS)})")
+    grid, _ = load_maze(args.maze)
+    EXPORTERS[extension](grid, args.out, args.cell, args.wall)
+
+
+if __name__ == '__main__':
+    main()
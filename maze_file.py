@@ -0,0 +1,192 @@
+"""Compact binary maze file format with memory-mapped loading.
+
+Layout (little-endian):
+    64-byte header: magic b'MAZE', version (u16), flags (u16), width, height,
+                    start_x, start_y, end_x, end_y (u32 each), seed (u64),
+                    algorithm name (16 bytes, NUL padded), 8 reserved bytes
+    payload:        wall masks packed two cells per byte; cell 2k in the low
+                    nibble and cell 2k+1 in the high nibble of byte k
+
+Because the payload needs no parsing, `open_maze` just maps the file and
+reads cells straight from the mapped buffer, so huge mazes open instantly.
+"""
+
+import mmap
+import struct
+from collections import namedtuple
+
+from maze_grid import MazeGrid
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; packing falls back to pure Python
+    np = None
+
+MAGIC = b'MAZE'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIIIIIQ16s8x')
+HEADER_SIZE = HEADER.size # 64 bytes
+
+FLAG_HAS_SEED = 1
+PACK_BLOCK = 1 << 16 # Output bytes packed per step without NumPy, to keep its integers small
+
+MazeHeader = namedtuple('MazeHeader', 'width height start end seed algorithm')
+
+_LOW_NIBBLES = bytes(i & 0x0F for i in range(256))
+_HIGH_NIBBLES = bytes(i >> 4 for i in range(256))
+
+
+class MazeFormatError(ValueError):
+    """Raised when a file is not a valid maze file."""
+
+
+# --- Nibble Packing ---
+def pack_walls(walls):
+    """Packs one-byte-per-cell wall masks into two cells per byte."""
+    if np is not None:
+        cells = np.frombuffer(bytes(walls) if len(walls) % 2 == 0 else bytes(walls) + b'\0', dtype=np.uint8)
+        return (cells[0::2] | cells[1::2] << 4).tobytes()
+    walls = bytes(walls)
+    lows, highs = walls[0::2], walls[1::2]
+    packed = bytearray(len(lows))
+    for i in range(0, len(lows), PACK_BLOCK):
+        low, high = lows[i:i + PACK_BLOCK], highs[i:i + PACK_BLOCK]
+        # Every mask is < 16, so shifting a whole block of the high stream left by 4 bits
+        # moves each value into the upper nibble of its own byte without carries.
+        block = int.from_bytes(low, 'little') | (int.from_bytes(high, 'little') << 4)
+        packed[i:i + len(low)] = block.to_bytes(len(low), 'little')
+    return bytes(packed)
+
+
+def unpack_walls(packed, size):
+    """Expands a packed payload back into a bytearray with one mask per cell."""
+    packed = bytes(packed[:(size + 1) // 2])
+    walls = bytearray(size)
+    walls[0::2] = packed.translate(_LOW_NIBBLES)[:(size + 1) // 2]
+    walls[1::2] = packed.translate(_HIGH_NIBBLES)[:size // 2]
+    return walls
+
+
+class PackedWalls:
+    """Indexable view of packed wall masks, e.g. directly over an mmap.
+
+    Supports the `walls[index]` reads (and writes, if the buffer is writable)
+    that MazeGrid and the generators use, so a MazeGrid can run on it as is.
+    """
+    __slots__ = ('buffer', 'size')
+
+    def __init__(self, buffer, size):
+        self.buffer = buffer
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        byte = self.buffer[index >> 1]
+        return byte >> 4 if index & 1 else byte & 0x0F
+
+    def __setitem__(self, index, mask):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        byte = self.buffer[index >> 1]
+        if index & 1:
+            self.buffer[index >> 1] = (byte & 0x0F) | (mask << 4)
+        else:
+            self.buffer[index >> 1] = (byte & 0xF0) | mask
+
+    def unpack(self):
+        """Copies every mask out into a regular one-byte-per-cell bytearray."""
+        return unpack_walls(self.buffer, self.size)
+
+
+# --- Saving ---
+def save_maze(path, grid, algorithm='', seed=None, start=(0, 0), end=None):
+    """Writes `grid` (any MazeGrid) to `path` in the binary maze format."""
+    if end is None:
+        end = (grid.width - 1, grid.height - 1)
+    flags = FLAG_HAS_SEED if seed is not None else 0
+    header = HEADER.pack(
+        MAGIC, VERSION, flags, grid.width, grid.height,
+        start[0], start[1], end[0], end[1],
+        seed or 0, algorithm.encode('ascii')[:16],
+    )
+    walls = grid.walls
+    if isinstance(walls, PackedWalls):
+        walls = walls.unpack()
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(pack_walls(walls))
+
+
+# --- Loading ---
+def parse_header(data):
+    """Decodes and validates the 64-byte header at the start of `data`."""
+    if len(data) < HEADER_SIZE:
+        raise MazeFormatError("file too short for a maze header")
+    magic, version, flags, width, height, sx, sy, ex, ey, seed, algorithm = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise MazeFormatError("not a maze file (bad magic)")
+    if version != VERSION:
+        raise MazeFormatError(f"unsupported maze file version {version}")
+    if len(data) < HEADER_SIZE + (width * height + 1) // 2:
+        raise MazeFormatError("maze payload is truncated")
+    if not (sx < width and sy < height and ex < width and ey < height):
+        raise MazeFormatError(f"start {(sx, sy)} or end {(ex, ey)} is outside the {width}x{height} maze")
+    try:
+        algorithm = algorithm.rstrip(b'\0').decode('ascii')
+    except UnicodeDecodeError:
+        raise MazeFormatError("algorithm name is not ASCII") from None
+    return MazeHeader(
+        width, height, (sx, sy), (ex, ey),
+        seed if flags & FLAG_HAS_SEED else None,
+        algorithm,
+    )
+
+
+class MazeFile:
+    """A memory-mapped maze file. `grid` reads cells straight from the mapping."""
+
+    def __init__(self, path, writable=False):
+        self._file = open(path, 'r+b' if writable else 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self.header = parse_header(self._mmap)
+        self._payload = memoryview(self._mmap)[HEADER_SIZE:]
+        size = self.header.width * self.header.height
+        self.grid = MazeGrid(self.header.width, self.header.height, walls=PackedWalls(self._payload, size))
+
+    def close(self):
+        self.grid = None
+        self._payload.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_maze(path, writable=False):
+    """Memory-maps a maze file without parsing its payload."""
+    return MazeFile(path, writable)
+
+
+def load_maze(path):
+    """Reads a maze file fully into memory. Returns (MazeGrid, MazeHeader)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    header = parse_header(data)
+    walls = unpack_walls(memoryview(data)[HEADER_SIZE:], header.width * header.height)
+    return MazeGrid(header.width, header.height, walls=walls), header
@@ -1,6 +1,25 @@
+import argparse
 import pygame
 import random
-import time
+from collections import deque
+from time import perf_counter
+
+from audio import SoundEffects, start_music
+from chunked_maze import ChunkedMaze, SparseMasks
+from generators import generate_dfs
+from frame_profiler import FrameProfiler
+from maze_file import open_maze
+from maze_pregen import MazePregenerator
+from maze_grid import MazeGrid, CellView, VisitedSet, TOP, RIGHT, BOTTOM, LEFT
+from replay import TICK_RATE, MOVE_TICKS, ReplayRecorder, compute_score
+from solver import distance_field, best_step, solve
+from text_cache import TextCache
+from trail import Trail
+
+try:
+    from synth import synthesize_effects
+except ImportError: # NumPy is optional; without it the WAV effects are used
+    synthesize_effects = None
 
 # --- Constants ---
 # Screen dimensions
@@ -16,6 +35,51 @@ CELL_SIZE = min(SCREEN_WIDTH // (MAZE_WIDTH + 1), SCREEN_HEIGHT // (MAZE_HEIGHT
 MARGIN_X = (SCREEN_WIDTH - MAZE_WIDTH * CELL_SIZE) // 2
 MARGIN_Y = (SCREEN_HEIGHT - MAZE_HEIGHT * CELL_SIZE) // 2
 
+# Camera mode: mazes that would need cells smaller than this scroll instead of shrinking
+MIN_CELL_SIZE = 16
+CAMERA_MODE = False
+CAMERA_EDGE = 0.25 # The view re-centres once the player is within this fraction of the screen from an edge
+
+def set_maze_size(width, height, camera=None):
+    """Changes the maze dimensions and recomputes the layout constants above.
+
+    Switches to camera mode (fixed MIN_CELL_SIZE, MARGIN_X/Y follow the player)
+    when the whole maze would not fit on screen at MIN_CELL_SIZE, or if forced.
+    """
+    global MAZE_WIDTH, MAZE_HEIGHT, CELL_SIZE, MARGIN_X, MARGIN_Y, CAMERA_MODE
+    MAZE_WIDTH, MAZE_HEIGHT = width, height
+    CELL_SIZE = max(1, min(SCREEN_WIDTH // (MAZE_WIDTH + 1), SCREEN_HEIGHT // (MAZE_HEIGHT + 1)))
+    CAMERA_MODE = CELL_SIZE < MIN_CELL_SIZE if camera is None else camera
+    if CAMERA_MODE:
+        CELL_SIZE = max(CELL_SIZE, MIN_CELL_SIZE)
+    MARGIN_X = (SCREEN_WIDTH - MAZE_WIDTH * CELL_SIZE) // 2
+    MARGIN_Y = (SCREEN_HEIGHT - MAZE_HEIGHT * CELL_SIZE) // 2
+
+def update_camera(player_px, player_py):
+    """Keeps the player's pixel position (relative to the current view) away from the screen edges.
+
+    While the player stays in the middle of the screen the view holds still;
+    once they come within CAMERA_EDGE of an edge, MARGIN_X/Y re-centre on
+    them, clamped to the maze edges. Each scroll redraws the whole screen, so
+    this happens every few cells instead of every frame. Returns True if the
+    view moved.
+    """
+    global MARGIN_X, MARGIN_Y
+    new_margins = []
+    for margin, pos, screen_size, maze_size in ((MARGIN_X, player_px, SCREEN_WIDTH, MAZE_WIDTH), (MARGIN_Y, player_py, SCREEN_HEIGHT, MAZE_HEIGHT)):
+        maze_pixels = maze_size * CELL_SIZE
+        edge = screen_size * CAMERA_EDGE
+        if maze_pixels <= screen_size:
+            new_margins.append((screen_size - maze_pixels) // 2)
+        elif edge <= pos <= screen_size - edge:
+            new_margins.append(margin)
+        else:
+            world_pos = pos - margin
+            new_margins.append(-min(max(int(world_pos) - screen_size // 2, 0), maze_pixels - screen_size))
+    moved = (MARGIN_X, MARGIN_Y) != tuple(new_margins)
+    MARGIN_X, MARGIN_Y = new_margins
+    return moved
+
 # Colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -25,202 +89,541 @@ BLUE = (0, 150, 255)
 GOLD = (255, 215, 0)
 TRAIL_RED = (200, 50, 50)
 
-# Movement Speed
-MOVE_SPEED = 0.12 # Seconds per cell
+# --- Timing ---
+# The simulation advances in fixed ticks; rendering interpolates between them.
+# TICK_RATE and MOVE_TICKS (the movement speed) come from `replay`, so
+# recorded games re-simulate identically.
+SIM_DT = 1.0 / TICK_RATE
+TARGET_FPS = 60 # Render rate cap (0 = uncapped)
+MAX_FRAME_TIME = 0.25 # Longest stretch simulated after a hitch, so a stall can't snowball
+INPUT_QUEUE_SIZE = 4 # Buffered taps; presses beyond these during a move are dropped
+
+# Arrow keys -> (dx, dy, wall bit)
+DIRECTIONS = {
+    pygame.K_LEFT: (-1, 0, LEFT),
+    pygame.K_RIGHT: (1, 0, RIGHT),
+    pygame.K_UP: (0, -1, TOP),
+    pygame.K_DOWN: (0, 1, BOTTOM),
+}
+
+def buffer_tap(input_queue, key):
+    """Queues an arrow tap for the coming moves, unless INPUT_QUEUE_SIZE are already waiting."""
+    if len(input_queue) < INPUT_QUEUE_SIZE:
+        input_queue.append(key)
 
 # --- Cell Class ---
-class Cell:
-    """Represents a single cell in the maze grid."""
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.walls = {'top': True, 'right': True, 'bottom': True, 'left': True}
-        self.visited = False
+class Cell(CellView):
+    """Represents a single cell in the maze grid (a view into a MazeGrid)."""
 
     def draw(self, screen):
         """Draws the walls of the cell."""
         x_pixel = MARGIN_X + self.x * CELL_SIZE
         y_pixel = MARGIN_Y + self.y * CELL_SIZE
-        
-        if self.walls['top']:
+        walls = self.grid.walls[self.index]
+
+        if walls & TOP:
             pygame.draw.line(screen, WHITE, (x_pixel, y_pixel), (x_pixel + CELL_SIZE, y_pixel), 2)
-        if self.walls['right']:
+        if walls & RIGHT:
             pygame.draw.line(screen, WHITE, (x_pixel + CELL_SIZE, y_pixel), (x_pixel + CELL_SIZE, y_pixel + CELL_SIZE), 2)
-        if self.walls['bottom']:
+        if walls & BOTTOM:
             pygame.draw.line(screen, WHITE, (x_pixel + CELL_SIZE, y_pixel + CELL_SIZE), (x_pixel, y_pixel + CELL_SIZE), 2)
-        if self.walls['left']:
+        if walls & LEFT:
             pygame.draw.line(screen, WHITE, (x_pixel, y_pixel + CELL_SIZE), (x_pixel, y_pixel), 2)
 
+# --- Goal Distance ---
+# Largest maze whose distance field (for hints) is computed in-game; the BFS is
+# pure Python (about 0.6 s here) and the field takes 4 bytes per cell
+MAX_FIELD_CELLS = 1_000_000
+
+class GoalDistance:
+    """The goal's distance field for hints, computed the first time it is asked for.
+
+    Mazes above MAX_FIELD_CELLS, memory-mapped ones (PackedWalls) and chunked
+    worlds get no field, so no hints. The optimal move count for the score
+    does not depend on the field: it is solved the same way verify_replays.py
+    does, so a recorded score always verifies.
+    """
+
+    def __init__(self, grid, goal_pos):
+        self.grid = grid
+        self.goal = grid.index(*goal_pos)
+        self._field = None
+        self.available = isinstance(grid.walls, bytearray) and grid.size <= MAX_FIELD_CELLS
+
+    @property
+    def computed(self):
+        return self._field is not None
+
+    def field(self):
+        """The distance field, computing it now if needed; None if unavailable."""
+        if self._field is None and self.available:
+            self._field = distance_field(self.grid, self.goal)
+        return self._field
+
+    def optimal_moves(self, start_pos):
+        """Shortest route length from start_pos to the goal: read off the field if it exists, else solved once."""
+        start = self.grid.index(*start_pos)
+        if self._field is not None:
+            return self._field[start]
+        path, _ = solve(self.grid, start, self.goal)
+        return len(path) - 1
+
 # --- Maze Generation (Depth-First Search) ---
-def generate_maze(grid):
+def generate_maze(grid, rng=random):
     """Generates a maze using the recursive backtracking algorithm."""
-    stack = []
-    current_cell = grid[0][0]
-    current_cell.visited = True
-    
-    while True:
-        x, y = current_cell.x, current_cell.y
-        neighbors = []
-        if y > 0 and not grid[x][y - 1].visited: neighbors.append(grid[x][y - 1])
-        if x < MAZE_WIDTH - 1 and not grid[x + 1][y].visited: neighbors.append(grid[x + 1][y])
-        if y < MAZE_HEIGHT - 1 and not grid[x][y + 1].visited: neighbors.append(grid[x][y + 1])
-        if x > 0 and not grid[x - 1][y].visited: neighbors.append(grid[x - 1][y])
-        
-        if neighbors:
-            next_cell = random.choice(neighbors)
-            dx = current_cell.x - next_cell.x
-            dy = current_cell.y - next_cell.y
-            if dx == 1: current_cell.walls['left'], next_cell.walls['right'] = False, False
-            elif dx == -1: current_cell.walls['right'], next_cell.walls['left'] = False, False
-            if dy == 1: current_cell.walls['top'], next_cell.walls['bottom'] = False, False
-            elif dy == -1: current_cell.walls['bottom'], next_cell.walls['top'] = False, False
-            stack.append(current_cell)
-            current_cell = next_cell
-            current_cell.visited = True
-        elif stack:
-            current_cell = stack.pop()
-        else: break
+    generate_dfs(grid, rng)
 
-# --- Main Game Function ---
-def main():
-    pygame.init()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Random Maze Navigator")
-    clock = pygame.time.Clock()
-    font = pygame.font.Font(None, 36)
+# --- Static Maze Rendering ---
+def cell_center(x, y):
+    """Pixel centre of the cell at grid position (x, y)."""
+    return (MARGIN_X + x * CELL_SIZE + CELL_SIZE // 2, MARGIN_Y + y * CELL_SIZE + CELL_SIZE // 2)
+
+def between_cells(from_pos, to_pos, progress):
+    """Pixel position `progress` (0..1) of the way from one cell's centre to another's."""
+    from_px, to_px = cell_center(*from_pos), cell_center(*to_pos)
+    return (from_px[0] + (to_px[0] - from_px[0]) * progress, from_px[1] + (to_px[1] - from_px[1]) * progress)
+
+def visible_cells():
+    """Ranges of cell columns and rows that intersect the screen (one cell of slack each side)."""
+    x0 = max(0, -MARGIN_X // CELL_SIZE - 1)
+    y0 = max(0, -MARGIN_Y // CELL_SIZE - 1)
+    x1 = min(MAZE_WIDTH, (SCREEN_WIDTH - MARGIN_X) // CELL_SIZE + 1)
+    y1 = min(MAZE_HEIGHT, (SCREEN_HEIGHT - MARGIN_Y) // CELL_SIZE + 1)
+    return range(x0, x1), range(y0, y1)
+
+def render_maze_layers(grid, start_pos, end_pos, trail_edges, walls_layer=None, scene=None):
+    """Draws the static parts of the maze that are on screen.
+
+    Returns (walls_layer, scene): the walls on a colour-keyed surface, and the
+    background (start/end squares, trail, walls) that new trail segments are
+    painted onto and dirty rects are restored from. Only visible cells are
+    visited, and each shared wall is drawn once (top/left per cell), so the
+    cost follows the viewport size rather than the maze size. Pass the
+    previous surfaces back in to reuse them when the camera moves.
+    """
+    if walls_layer is None:
+        walls_layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        walls_layer.set_colorkey(BLACK)
+        scene = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    walls_layer.fill(BLACK)
+    scene.fill(BLACK)
+    columns, rows = visible_cells()
+    walls, width = grid.walls, grid.width
+    line = pygame.draw.line
 
-    grid = [[Cell(x, y) for y in range(MAZE_HEIGHT)] for x in range(MAZE_WIDTH)]
-    generate_maze(grid)
+    for y in rows:
+        y_pixel = MARGIN_Y + y * CELL_SIZE
+        row = y * width
+        for x in columns:
+            x_pixel = MARGIN_X + x * CELL_SIZE
+            mask = walls[row + x]
+            if mask & TOP:
+                line(walls_layer, WHITE, (x_pixel, y_pixel), (x_pixel + CELL_SIZE, y_pixel), 2)
+            if mask & LEFT:
+                line(walls_layer, WHITE, (x_pixel, y_pixel + CELL_SIZE), (x_pixel, y_pixel), 2)
+            if mask & RIGHT and x == MAZE_WIDTH - 1:
+                line(walls_layer, WHITE, (x_pixel + CELL_SIZE, y_pixel), (x_pixel + CELL_SIZE, y_pixel + CELL_SIZE), 2)
+            if mask & BOTTOM and y == MAZE_HEIGHT - 1:
+                line(walls_layer, WHITE, (x_pixel + CELL_SIZE, y_pixel + CELL_SIZE), (x_pixel, y_pixel + CELL_SIZE), 2)
 
+    draw_endpoints(scene, start_pos, end_pos)
+    draw_trail(scene, trail_edges, width, columns, rows)
+    scene.blit(walls_layer, (0, 0))
+    return walls_layer, scene
+
+def draw_endpoints(surface, start_pos, end_pos):
+    pygame.draw.rect(surface, GREEN, (MARGIN_X + start_pos[0] * CELL_SIZE, MARGIN_Y + start_pos[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+    pygame.draw.rect(surface, RED, (MARGIN_X + end_pos[0] * CELL_SIZE, MARGIN_Y + end_pos[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+
+def draw_trail(surface, trail_edges, width, columns, rows):
+    """Draws the trail segments of the given cells from the per-cell trail edge masks 👣"""
+    line = pygame.draw.line
+    for y in rows:
+        row = y * width
+        for x in columns:
+            edges = trail_edges[row + x]
+            if edges & (RIGHT | BOTTOM):
+                center = cell_center(x, y)
+                if edges & RIGHT:
+                    line(surface, TRAIL_RED, center, cell_center(x + 1, y), CELL_SIZE // 5)
+                if edges & BOTTOM:
+                    line(surface, TRAIL_RED, center, cell_center(x, y + 1), CELL_SIZE // 5)
+
+def repaint_region(scene, walls_layer, trail_edges, width, start_pos, end_pos, rect):
+    """Rebuilds one small area of the scene, e.g. after a trail segment decays.
+
+    Only the cells around `rect` are redrawn, clipped to it, so erasing a
+    segment costs the same however long the trail is.
+    """
+    scene.set_clip(rect)
+    scene.fill(BLACK)
+    draw_endpoints(scene, start_pos, end_pos)
+    columns, rows = visible_cells()
+    x0 = max(columns.start, (rect.left - MARGIN_X) // CELL_SIZE - 1)
+    x1 = min(columns.stop, (rect.right - MARGIN_X) // CELL_SIZE + 1)
+    y0 = max(rows.start, (rect.top - MARGIN_Y) // CELL_SIZE - 1)
+    y1 = min(rows.stop, (rect.bottom - MARGIN_Y) // CELL_SIZE + 1)
+    draw_trail(scene, trail_edges, width, range(x0, x1), range(y0, y1))
+    scene.blit(walls_layer, rect, rect)
+    scene.set_clip(None)
+
+def draw_hint_arrow(screen, grid, goal_dist, player_pos):
+    """Draws an arrow in the player's cell pointing one step along the shortest route."""
+    cell = grid.index(*player_pos)
+    step = best_step(grid, goal_dist, cell)
+    if step < 0:
+        return None
+    dx, dy = step % grid.width - player_pos[0], step // grid.width - player_pos[1]
+    cx, cy = cell_center(*player_pos)
+    tip = (cx + dx * CELL_SIZE * 0.45, cy + dy * CELL_SIZE * 0.45)
+    base = (cx + dx * CELL_SIZE * 0.15, cy + dy * CELL_SIZE * 0.15)
+    half = CELL_SIZE * 0.2
+    return pygame.draw.polygon(screen, GOLD, [tip, (base[0] - dy * half, base[1] - dx * half), (base[0] + dy * half, base[1] + dx * half)])
+
+# --- Level Loop ---
+def play_level(screen, clock, text_cache, profiler, profiler_font, grid, start_pos, end_pos, goal, recorder,
+               trail_length=None, fps=TARGET_FPS, record_path=None, next_maze=None, sfx=None):
+    """Plays one maze until the window is closed or the player asks for the next one.
+
+    `goal` is the level's GoalDistance; its field is only computed once the
+    hint asks for it. `next_maze` is the MazePregenerator the
+    next maze comes from, if any. Returns True if the player pressed N for the
+    next maze; if it is still generating, the level keeps running (showing
+    so) until it is ready, instead of blocking the window.
+    """
     # --- Player and Goal Setup ---
-    player_pos = [0, 0] # Logical grid position
-    start_pos = (0, 0)
-    end_pos = (MAZE_WIDTH - 1, MAZE_HEIGHT - 1)
+    player_pos = list(start_pos) # Logical grid position
+    show_hint = False
     
     # --- New Tracking Variables ---
-    player_path = [tuple(player_pos)] # For drawing the trail
-    visited_cells = {tuple(player_pos)} # For tracking backtracking
+    # Cell indices plus per-cell edge bits for drawing; chunked worlds keep only the bits that are set
+    world = isinstance(grid, ChunkedMaze)
+    trail = Trail(grid, grid.index(*player_pos), trail_length, SparseMasks() if world else None)
+    visited_cells = set() if world else VisitedSet(grid.size) # For tracking backtracking
+    visited_cells.add(grid.index(*player_pos))
     move_count = 0
     backtrack_count = 0
-    start_game_time = time.time()
+    sim_ticks = 0 # Ticks played so far; the game clock, so timing is the same on every machine
     final_time = 0
     final_score = 0
     
     # --- Animation Variables ---
     is_moving = False
-    anim_start_time = 0
-    start_pixel_pos, target_pixel_pos = [0, 0], [0, 0]
+    move_tick = 0 # Ticks into the current move
+    anim_from_pos = tuple(player_pos) # Cell the current move started from
 
     # --- Game State ---
     game_won = False
+
+    # --- Static Layers & Dirty Rects ---
+    if CAMERA_MODE:
+        update_camera(*cell_center(*player_pos))
+    walls_layer, scene = render_maze_layers(grid, start_pos, end_pos, trail.edges)
+    screen.blit(scene, (0, 0))
+    pygame.display.flip()
+    prev_rects = [] # Screen areas drawn over last frame
+
+    input_queue = deque() # Arrow taps not yet turned into moves
+    accumulator = 0.0 # Real time not yet simulated
+    previous_time = perf_counter()
     
     running = True
+    next_level = False
+    want_next = False # N pressed, waiting for the next maze to finish generating
     while running:
+        profiling = profiler.enabled
+        if profiling: profiler.start_frame()
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-        
-        # --- Continuous Movement Logic ---
-        if not is_moving and not game_won:
-            keys = pygame.key.get_pressed()
-            current_cell = grid[player_pos[0]][player_pos[1]]
-            next_pos = list(player_pos)
-            
-            moved = False
-            if keys[pygame.K_LEFT] and not current_cell.walls['left']:
-                next_pos[0] -= 1; moved = True
-            elif keys[pygame.K_RIGHT] and not current_cell.walls['right']:
-                next_pos[0] += 1; moved = True
-            elif keys[pygame.K_UP] and not current_cell.walls['top']:
-                next_pos[1] -= 1; moved = True
-            elif keys[pygame.K_DOWN] and not current_cell.walls['bottom']:
-                next_pos[1] += 1; moved = True
-
-            if moved:
-                move_count += 1
-                if tuple(next_pos) in visited_cells:
-                    backtrack_count += 1
-                visited_cells.add(tuple(next_pos))
-                
-                is_moving = True
-                anim_start_time = time.time()
-                start_pixel_pos = [MARGIN_X + player_pos[0] * CELL_SIZE + CELL_SIZE // 2, MARGIN_Y + player_pos[1] * CELL_SIZE + CELL_SIZE // 2]
-                target_pixel_pos = [MARGIN_X + next_pos[0] * CELL_SIZE + CELL_SIZE // 2, MARGIN_Y + next_pos[1] * CELL_SIZE + CELL_SIZE // 2]
-                player_pos = next_pos
-                player_path.append(tuple(player_pos))
-
-        # --- Animation Update ---
-        current_pixel_pos = [MARGIN_X + player_pos[0] * CELL_SIZE + CELL_SIZE // 2, MARGIN_Y + player_pos[1] * CELL_SIZE + CELL_SIZE // 2]
-        if is_moving:
-            elapsed_time = time.time() - anim_start_time
-            anim_progress = min(elapsed_time / MOVE_SPEED, 1.0)
-            current_pixel_pos[0] = start_pixel_pos[0] + (target_pixel_pos[0] - start_pixel_pos[0]) * anim_progress
-            current_pixel_pos[1] = start_pixel_pos[1] + (target_pixel_pos[1] - start_pixel_pos[1]) * anim_progress
-            if anim_progress >= 1.0:
-                is_moving = False
-                
-        # --- Game Win Logic ---
-        if tuple(player_pos) == end_pos and not game_won:
-            game_won = True
-            final_time = time.time() - start_game_time
-            # --- Scoring Formula ---
-            # Start with 10,000 points. Penalize for time, moves, and backtracking.
-            score = 10000
-            score -= int(final_time) * 10 # 10 points per second
-            score -= move_count * 5 # 5 points per move
-            score -= backtrack_count * 50 # 50 points per backtrack (heavy penalty)
-            final_score = max(0, int(score)) # Score cannot be negative
-        
-        # --- Drawing ---
-        screen.fill(BLACK)
+            elif event.type == pygame.KEYDOWN and event.key in DIRECTIONS:
+                buffer_tap(input_queue, event.key) # Buffered, so taps during a move aren't lost
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                show_hint = not show_hint and goal.available # Toggle the hint arrow (computes the field on first use)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.enabled = not profiler.enabled
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_n and next_maze:
+                want_next = True
+        if want_next and next_maze.ready():
+            running = False
+            next_level = True # Straight on to the next, already generated maze
+        keys = pygame.key.get_pressed()
+        if profiling: profiler.mark('input')
+
+        now = perf_counter()
+        accumulator += min(now - previous_time, MAX_FRAME_TIME)
+        previous_time = now
+
+        # --- Fixed-Step Simulation ---
+        while accumulator >= SIM_DT:
+            accumulator -= SIM_DT
+            if is_moving:
+                move_tick += 1
+                if move_tick >= MOVE_TICKS:
+                    is_moving = False
+            if game_won:
+                input_queue.clear()
+                continue
+            sim_ticks += 1
 
-        # Draw start and end points
-        pygame.draw.rect(screen, GREEN, (MARGIN_X, MARGIN_Y, CELL_SIZE, CELL_SIZE))
-        pygame.draw.rect(screen, RED, (MARGIN_X + end_pos[0] * CELL_SIZE, MARGIN_Y + end_pos[1] * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+            # --- Movement Logic ---
+            # Buffered taps first, then held keys for continuous movement
+            if not is_moving:
+                current_walls = grid.mask(grid.index(*player_pos))
+                direction = None
+                while input_queue and direction is None:
+                    key = input_queue.popleft()
+                    if not current_walls & DIRECTIONS[key][2]:
+                        direction = DIRECTIONS[key]
+                if direction is None:
+                    for key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):
+                        if keys[key] and not current_walls & DIRECTIONS[key][2]:
+                            direction = DIRECTIONS[key]
+                            break
 
-        # Draw the player's trail 👣
-        if len(player_path) > 1:
-            pixel_path = [(MARGIN_X + x * CELL_SIZE + CELL_SIZE // 2, MARGIN_Y + y * CELL_SIZE + CELL_SIZE // 2) for x, y in player_path]
-            pygame.draw.lines(screen, TRAIL_RED, False, pixel_path, CELL_SIZE // 5)
+                if direction:
+                    next_pos = [player_pos[0] + direction[0], player_pos[1] + direction[1]]
+                    move_count += 1
+                    recorder.record(sim_ticks, direction[2])
+                    to_index = grid.index(*next_pos)
+                    backtracked = to_index in visited_cells
+                    if backtracked:
+                        backtrack_count += 1
+                    visited_cells.add(to_index)
+                    if sfx: sfx.play('backtrack' if backtracked else 'move')
 
-        # Draw the maze cells
-        for row in grid:
-            for cell in row:
-                cell.draw(screen)
+                    is_moving = True
+                    move_tick = 0
+                    anim_from_pos = tuple(player_pos)
+                    player_pos = next_pos
+                    decayed = trail.add(to_index) # Segments past the trail length, if capped
+                    if profiling: profiler.mark('update')
+
+                    # Paint the new trail segment onto the scene once, under the walls 👣
+                    segment_rect = pygame.draw.line(scene, TRAIL_RED, cell_center(*anim_from_pos), cell_center(*player_pos), CELL_SIZE // 5)
+                    scene.blit(walls_layer, segment_rect, segment_rect)
+                    prev_rects.append(segment_rect)
+
+                    # Erase decayed segments by rebuilding just the area they covered
+                    for a, b in decayed:
+                        a_center, b_center = cell_center(*grid.coords(a)), cell_center(*grid.coords(b))
+                        half = CELL_SIZE // 10 + 1
+                        rect = pygame.Rect(min(a_center[0], b_center[0]) - half, min(a_center[1], b_center[1]) - half,
+                                           abs(a_center[0] - b_center[0]) + 2 * half, abs(a_center[1] - b_center[1]) + 2 * half)
+                        repaint_region(scene, walls_layer, trail.edges, grid.width, start_pos, end_pos, rect)
+                        prev_rects.append(rect)
+                    if profiling: profiler.mark('trail')
+
+            # --- Game Win Logic ---
+            if tuple(player_pos) == end_pos:
+                game_won = True
+                final_time = sim_ticks * SIM_DT
+                # --- Scoring Formula ---
+                # Start with 10,000 points. Penalize for time, wasted moves, and backtracking.
+                # A chunked world's shortest route is unknown, so its score leaves wasted moves out.
+                optimal_moves = None if world else goal.optimal_moves(start_pos)
+                final_score = compute_score(sim_ticks, TICK_RATE, move_count, optimal_moves, backtrack_count)
+                if sfx: sfx.play('victory')
+                if record_path:
+                    recorder.save(record_path, final_score)
+
+        # --- Animation Interpolation ---
+        # Progress through the current move, including the fraction of a tick not yet simulated
+        anim_progress = 1.0
+        if is_moving:
+            anim_progress = min((move_tick + accumulator / SIM_DT) / MOVE_TICKS, 1.0)
+
+        current_pixel_pos = between_cells(anim_from_pos, player_pos, anim_progress)
+        if profiling: profiler.mark('update')
+
+        # --- Camera Follow ---
+        # When the view scrolls (near a screen edge), re-render only the cells now on screen
+        full_redraw = False
+        if CAMERA_MODE and update_camera(*current_pixel_pos):
+            render_maze_layers(grid, start_pos, end_pos, trail.edges, walls_layer, scene)
+            screen.blit(scene, (0, 0))
+            current_pixel_pos = between_cells(anim_from_pos, player_pos, anim_progress)
+            prev_rects = []
+            full_redraw = True
+        if profiling: profiler.mark('maze')
+                
+        # --- Drawing ---
+        # Restore last frame's dynamic areas (and any new trail segment) from the scene
+        for rect in prev_rects:
+            screen.blit(scene, rect, rect)
+        dirty_rects = []
 
         # Draw the player dot
-        pygame.draw.circle(screen, BLUE, (int(current_pixel_pos[0]), int(current_pixel_pos[1])), CELL_SIZE // 3)
+        dirty_rects.append(pygame.draw.circle(screen, BLUE, (int(current_pixel_pos[0]), int(current_pixel_pos[1])), CELL_SIZE // 3))
+
+        # Hint arrow towards the exit 🧭
+        if show_hint and not game_won and not is_moving:
+            hint_rect = draw_hint_arrow(screen, grid, goal.field(), player_pos)
+            if hint_rect:
+                dirty_rects.append(hint_rect)
+        if profiling: profiler.mark('sprites')
         
         # --- Draw UI Text ---
         # Timer ⏱️
-        elapsed_time = final_time if game_won else time.time() - start_game_time
-        time_text = font.render(f"Time: {int(elapsed_time)}s", True, WHITE)
-        screen.blit(time_text, (10, 10))
+        elapsed_time = final_time if game_won else sim_ticks * SIM_DT
+        time_text = text_cache.render('hud', f"Time: {int(elapsed_time)}s", WHITE)
+        dirty_rects.append(screen.blit(time_text, (10, 10)))
 
         # Move Count
-        move_text = font.render(f"Moves: {move_count}", True, WHITE)
-        screen.blit(move_text, (10, 40))
+        move_text = text_cache.render('hud', f"Moves: {move_count}", WHITE)
+        dirty_rects.append(screen.blit(move_text, (10, 40)))
 
         # Backtrack Count
-        backtrack_text = font.render(f"Backtracks: {backtrack_count}", True, WHITE)
-        screen.blit(backtrack_text, (10, 70))
+        backtrack_text = text_cache.render('hud', f"Backtracks: {backtrack_count}", WHITE)
+        dirty_rects.append(screen.blit(backtrack_text, (10, 70)))
+
+        # Moves over optimal: moves made minus progress made towards the exit (once the field exists)
+        if goal.computed:
+            goal_dist = goal.field()
+            over_optimal = move_count - (goal_dist[grid.index(*start_pos)] - goal_dist[grid.index(*player_pos)])
+            over_text = text_cache.render('hud', f"Over optimal: {over_optimal}", WHITE)
+            dirty_rects.append(screen.blit(over_text, (10, 100)))
         
         # --- Display Win Message and Score 💯 ---
         if game_won:
-            win_font = pygame.font.Font(None, 100)
-            win_text = win_font.render("You Win!", True, GOLD)
+            win_text = text_cache.render('win', "You Win!", GOLD)
             win_rect = win_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 50))
             
-            score_font = pygame.font.Font(None, 74)
-            score_text = score_font.render(f"Score: {final_score}", True, GOLD)
+            score_label = "World score" if world else "Score" # Not comparable: no wasted-move penalty
+            score_text = text_cache.render('score', f"{score_label}: {final_score}", GOLD)
             score_rect = score_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 50))
             
-            screen.blit(win_text, win_rect)
-            screen.blit(score_text, score_rect)
+            dirty_rects.append(screen.blit(win_text, win_rect))
+            dirty_rects.append(screen.blit(score_text, score_rect))
+
+        if next_maze and (game_won or want_next):
+            next_label = "Generating the next maze..." if want_next else "Press N for the next maze"
+            next_text = text_cache.render('hud', next_label, GOLD)
+            dirty_rects.append(screen.blit(next_text, next_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 120))))
+        if profiling: profiler.mark('hud')
+
+        # --- Profiler Overlay 📊 ---
+        if profiling:
+            dirty_rects.append(profiler.draw_overlay(screen, profiler_font, (SCREEN_WIDTH - 10, 10)))
+            profiler.mark('overlay')
         
-        pygame.display.flip()
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(prev_rects + dirty_rects)
+        prev_rects = dirty_rects
+        if profiling:
+            profiler.mark('present')
+            profiler.end_frame()
+
+        # Sleep off the rest of the frame instead of spinning a core
+        clock.tick(fps)
+
+    return next_level
+
+# --- Main Game Function ---
+def main(load_path=None, width=MAZE_WIDTH, height=MAZE_HEIGHT, camera=None, profile=False, trace_path=None, trail_length=None, fps=TARGET_FPS, seed=None, record_path=None,
+         world=False, chunk_size=32, sound=True, synth=False, music=None):
+    # The next random mazes are carved in a background process while the current one is played,
+    # seeded from the first maze's seed; nothing runs until the player first presses N
+    if seed is None and not load_path:
+        seed = random.randrange(2 ** 63)
+    pregen = None if load_path or world else MazePregenerator(width, height, seed=seed)
+
+    pygame.mixer.pre_init(44100, -16, 2, 512) # Small buffer: effects start within ~12 ms
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Random Maze Navigator")
+    clock = pygame.time.Clock()
+
+    # Fonts are loaded once; HUD labels are re-rendered only when their text changes
+    text_cache = TextCache({
+        'hud': pygame.font.Font(None, 36),
+        'win': pygame.font.Font(None, 100),
+        'score': pygame.font.Font(None, 74),
+    })
+
+    # Sound effects are decoded once here; playing one never touches the disk 🔊
+    sfx = SoundEffects() if sound else None
+    if sfx and sfx.enabled and synth and synthesize_effects:
+        synthesize_effects(sfx) # Procedural effects, rendered into the mixer's buffers up front
+    if music:
+        try:
+            start_music(music) # Pre-rendered with midi_render.py, so no MIDI synth runs during play
+        except pygame.error as e: # Missing or unreadable file: play on without music
+            print(f"Music disabled: {e}")
+
+    # --- Frame Profiler (F3 toggles) ---
+    profiler = FrameProfiler(enabled=profile or trace_path is not None)
+    profiler_font = pygame.font.SysFont('monospace', 14)
+
+    maze_file = None
+    if load_path:
+        # Cells are read straight from the memory-mapped file
+        maze_file = open_maze(load_path)
+        grid = maze_file.grid
+        grid.cell_class = Cell
+        set_maze_size(grid.width, grid.height, camera)
+        start_pos, end_pos = maze_file.header.start, maze_file.header.end
+        algorithm, seed = maze_file.header.algorithm, maze_file.header.seed
+    elif world:
+        # Chunked world: chunks are carved on demand around the camera, so startup is instant
+        grid = ChunkedMaze(seed, -(-width // chunk_size), -(-height // chunk_size), chunk_size)
+        if (grid.width, grid.height) != (width, height):
+            print(f"World size {width}x{height} rounded up to {grid.width}x{grid.height} (whole {chunk_size}-cell chunks)")
+        algorithm = 'chunked-' + grid.algorithm
+        set_maze_size(grid.width, grid.height, True)
+        start_pos = (0, 0)
+        end_pos = (MAZE_WIDTH - 1, MAZE_HEIGHT - 1)
+    else:
+        set_maze_size(width, height, camera)
+        grid = MazeGrid(MAZE_WIDTH, MAZE_HEIGHT, cell_class=Cell)
+        # A seeded maze can be regenerated from its replay
+        algorithm = 'dfs'
+        generate_maze(grid, random.Random(seed))
+        start_pos = (0, 0)
+        end_pos = (MAZE_WIDTH - 1, MAZE_HEIGHT - 1)
+
+    while True:
+        # Distance to the goal from every cell, for O(1) hints: computed on first use
+        # (never for chunked worlds, mmap'd or huge mazes)
+        goal = GoalDistance(grid, end_pos)
+        # --- Replay Recording ---
+        recorder = ReplayRecorder(algorithm, seed, grid.width, grid.height, start_pos, end_pos)
+        if not play_level(screen, clock, text_cache, profiler, profiler_font, grid, start_pos, end_pos, goal, recorder,
+                          trail_length, fps, record_path, next_maze=pregen, sfx=sfx):
+            break
+        grid, seed = pregen.next(Cell)
 
+    if trace_path:
+        profiler.dump(trace_path)
+    if maze_file:
+        maze_file.close()
+    if pregen:
+        pregen.close()
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Random Maze Navigator")
+    parser.add_argument('--load', metavar='PATH', help="play a saved .maze file instead of a new random maze")
+    parser.add_argument('--width', type=int, default=MAZE_WIDTH, help="maze width in cells")
+    parser.add_argument('--height', type=int, default=MAZE_HEIGHT, help="maze height in cells")
+    parser.add_argument('--camera', action='store_true', default=None, help="scrolling camera even if the maze fits on screen")
+    parser.add_argument('--profile', action='store_true', help="start with the frame-time overlay on (F3 toggles)")
+    parser.add_argument('--trace', metavar='PATH', help="record frame timings and write them to PATH (.csv or .json) on exit")
+    parser.add_argument('--fps', type=int, default=TARGET_FPS, help="render rate cap (0 = uncapped); the simulation always runs at %d ticks/s" % TICK_RATE)
+    parser.add_argument('--world', action='store_true', help="chunked world mode: generate the maze lazily around the player (any size)")
+    parser.add_argument('--chunk-size', type=int, default=32, help="cells per chunk side in world mode (the world size is rounded up to whole chunks)")
+    parser.add_argument('--seed', type=int, default=None, help="seed for the random maze (random if omitted)")
+    parser.add_argument('--record', metavar='PATH', help="save a replay of a won game to PATH for verify_replays.py")
+    parser.add_argument('--synth', action='store_true', help="use synthesized sound effects instead of the WAV files (needs NumPy)")
+    parser.add_argument('--mute', action='store_true', help="no sound effects")
+    parser.add_argument('--music', metavar='PATH', help="loop a music WAV pre-rendered with midi_render.py")
+    parser.add_argument('--trail-length', type=int, default=None, metavar='N', help="keep only the last N trail segments")
+    args = parser.parse_args()
+    if args.world and args.record:
+        parser.error("--record is not supported with --world (chunked worlds cannot be rebuilt by verify_replays.py)")
+    main(load_path=args.load, width=args.width, height=args.height, camera=args.camera, profile=args.profile, trace_path=args.trace, trail_length=args.trail_length, fps=args.fps,
+         seed=args.seed, record_path=args.record, world=args.world, chunk_size=args.chunk_size,
+         sound=not args.mute, synth=args.synth, music=args.music)
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""Compact maze grid storing one 4-bit wall mask per cell in a flat array."""
+
+from collections.abc import MutableMapping
+
+# --- Wall Bits ---
+TOP = 1
+RIGHT = 2
+BOTTOM = 4
+LEFT = 8
+ALL_WALLS = TOP | RIGHT | BOTTOM | LEFT
+
+# Masks that clear a single wall (kept in 0..15 so they also work on uint8 arrays)
+NO_TOP = ALL_WALLS ^ TOP
+NO_RIGHT = ALL_WALLS ^ RIGHT
+NO_BOTTOM = ALL_WALLS ^ BOTTOM
+NO_LEFT = ALL_WALLS ^ LEFT
+
+WALL_BITS = {'top': TOP, 'right': RIGHT, 'bottom': BOTTOM, 'left': LEFT}
+OPPOSITE = {TOP: BOTTOM, RIGHT: LEFT, BOTTOM: TOP, LEFT: RIGHT}
+
+
+# --- Visited Bitset ---
+class VisitedSet:
+    """One bit per cell, used to track visited cells during generation."""
+    __slots__ = ('bits',)
+
+    def __init__(self, size):
+        self.bits = bytearray((size + 7) >> 3)
+
+    def __contains__(self, index):
+        return (self.bits[index >> 3] >> (index & 7)) & 1 == 1
+
+    def add(self, index):
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def discard(self, index):
+        self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def clear(self):
+        self.bits[:] = bytes(len(self.bits))
+
+
+# --- Cell-Compatible Views ---
+class WallsView(MutableMapping):
+    """Dict-like view of one cell's wall mask ('top', 'right', 'bottom', 'left')."""
+    __slots__ = ('grid', 'index')
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    def __getitem__(self, name):
+        return self.grid.mask(self.index) & WALL_BITS[name] != 0
+
+    def __setitem__(self, name, value):
+        bit = WALL_BITS[name]
+        mask = self.grid.mask(self.index)
+        self.grid.set_mask(self.index, mask | bit if value else mask & (ALL_WALLS ^ bit))
+
+    def __delitem__(self, name):
+        raise TypeError("cell walls cannot be deleted")
+
+    def __iter__(self):
+        return iter(WALL_BITS)
+
+    def __len__(self):
+        return len(WALL_BITS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class CellView:
+    """Lightweight stand-in for a per-cell object, backed by the grid arrays."""
+    __slots__ = ('grid', 'x', 'y', 'index')
+
+    def __init__(self, grid, x, y):
+        self.grid = grid
+        self.x = x
+        self.y = y
+        self.index = y * grid.width + x
+
+    @property
+    def walls(self):
+        return WallsView(self.grid, self.index)
+
+    @property
+    def visited(self):
+        return self.index in self.grid.visited
+
+    @visited.setter
+    def visited(self, value):
+        if value:
+            self.grid.visited.add(self.index)
+        else:
+            self.grid.visited.discard(self.index)
+
+    def __eq__(self, other):
+        return isinstance(other, CellView) and other.grid is self.grid and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.grid), self.index))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.x}, {self.y})"
+
+
+class _Column:
+    """Result of grid[x], so that grid[x][y] keeps working."""
+    __slots__ = ('grid', 'x')
+
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.x = x
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.grid.height:
+            raise IndexError(y)
+        return self.grid.cell_class(self.grid, self.x, y)
+
+    def __iter__(self):
+        for y in range(self.grid.height):
+            yield self.grid.cell_class(self.grid, self.x, y)
+
+    def __len__(self):
+        return self.grid.height
+
+
+# --- Maze Grid ---
+class MazeGrid:
+    """Row-major grid of wall masks. Cell (x, y) lives at index y * width + x.
+
+    `walls` holds one byte per cell with the TOP/RIGHT/BOTTOM/LEFT bits set
+    for walls that are present. Any writable byte buffer works (a bytearray
+    by default, or a NumPy uint8 array). Indexing as grid[x][y] returns a
+    `cell_class` view for code written against per-cell objects.
+    """
+
+    def __init__(self, width, height, walls=None, cell_class=CellView):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        if walls is None:
+            walls = bytearray([ALL_WALLS]) * self.size
+        elif len(walls) != self.size:
+            raise ValueError(f"expected {self.size} wall masks, got {len(walls)}")
+        self.walls = walls
+        self.visited = VisitedSet(self.size)
+        self.cell_class = cell_class
+
+    # --- Index Helpers ---
+    def index(self, x, y):
+        return y * self.width + x
+
+    def coords(self, index):
+        return index % self.width, index // self.width
+
+    def mask(self, index):
+        return self.walls[index]
+
+    def set_mask(self, index, mask):
+        self.walls[index] = mask
+
+    def has_wall(self, index, bit):
+        return self.walls[index] & bit != 0
+
+    def neighbors(self, index):
+        """All in-bounds neighbours as (neighbor_index, wall_bit) pairs."""
+        w = self.width
+        x = index % w
+        result = []
+        if index >= w: result.append((index - w, TOP))
+        if x < w - 1: result.append((index + 1, RIGHT))
+        if index + w < self.size: result.append((index + w, BOTTOM))
+        if x > 0: result.append((index - 1, LEFT))
+        return result
+
+    def open_neighbors(self, index):
+        """Neighbours reachable from `index` without crossing a wall."""
+        mask = self.walls[index]
+        return [n for n, bit in self.neighbors(index) if not mask & bit]
+
+    def carve(self, a, b):
+        """Removes the wall between adjacent cells a and b."""
+        walls = self.walls
+        if b == a - self.width:
+            walls[a] &= NO_TOP; walls[b] &= NO_BOTTOM
+        elif b == a + self.width:
+            walls[a] &= NO_BOTTOM; walls[b] &= NO_TOP
+        elif b == a + 1:
+            walls[a] &= NO_RIGHT; walls[b] &= NO_LEFT
+        elif b == a - 1:
+            walls[a] &= NO_LEFT; walls[b] &= NO_RIGHT
+        else:
+            raise ValueError(f"cells {a} and {b} are not adjacent")
+
+    def reset(self):
+        """Puts every wall back up and clears the visited bitset."""
+        self.walls[:] = bytearray([ALL_WALLS]) * self.size
+        self.visited.clear()
+
+    # --- Cell-Compatible Access ---
+    def cell(self, x, y):
+        return self.cell_class(self, x, y)
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.width:
+            raise IndexError(x)
+        return _Column(self, x)
+
+    def __iter__(self):
+        for x in range(self.width):
+            yield _Column(self, x)
+
+    def __len__(self):
+        return self.width
@@ -0,0 +1,100 @@
+"""Background pre-generation of upcoming mazes (no pygame needed).
+
+A worker process carves the next mazes while the current one is played. At
+most `depth` mazes are generated ahead, so the work and memory stay bounded.
+Each maze comes back nibble-packed (the .maze payload format), half a byte
+per cell through the pipe, and the main process only unpacks it before play
+starts. The game computes the hint field itself, by the same rule as for any
+other level (see maze_game.GoalDistance).
+
+Nothing is started until the first maze is asked for (`ready()` or `next()`),
+so a player who never moves on costs no CPU. The worker is spawned rather
+than forked, as by then the game has opened its window.
+
+Maze n (counting from 1, the first pre-generated one) is seeded with
+batch_generate.derive_seed(seed, n), so a seeded game plays the same
+sequence of mazes every time.
+"""
+
+import multiprocessing
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_generate import derive_seed
+from generators import generate
+from maze_file import pack_walls, unpack_walls
+from maze_grid import MazeGrid
+
+
+# --- Worker ---
+def generate_packed(algorithm, width, height, seed):
+    """Generates one maze and returns its packed walls."""
+    grid = generate(algorithm, width, height, rng=random.Random(seed))
+    return pack_walls(grid.walls)
+
+
+# --- Producer ---
+class MazePregenerator:
+    """Keeps up to `depth` width x height mazes generating in the background.
+
+    `seed` is the master seed the mazes' seeds are derived from (random if None).
+    """
+
+    def __init__(self, width, height, algorithm='dfs', depth=2, workers=1, seed=None):
+        self.width, self.height = width, height
+        self.algorithm = algorithm
+        self.depth = depth
+        self.seed = random.randrange(2 ** 63) if seed is None else seed
+        self.workers = workers
+        self._count = 0 # Mazes submitted so far
+        self._pool = None # Started on first use
+        self._pending = deque() # (seed, future), oldest first
+
+    def _fill(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        while len(self._pending) < self.depth:
+            self._count += 1
+            seed = derive_seed(self.seed, self._count)
+            future = self._pool.submit(generate_packed, self.algorithm, self.width, self.height, seed)
+            self._pending.append((seed, future))
+
+    def ready(self):
+        """Whether the next maze is already finished, so `next()` won't block.
+
+        The first call starts the background generation.
+        """
+        self._fill()
+        return self._pending[0][1].done()
+
+    def next(self, cell_class=None):
+        """The next maze as (MazeGrid, seed), waiting for it if needed."""
+        self._fill()
+        seed, future = self._pending.popleft()
+        self._fill()
+        packed = future.result()
+        walls = unpack_walls(packed, self.width * self.height)
+        grid = MazeGrid(self.width, self.height, walls=walls)
+        if cell_class is not None:
+            grid.cell_class = cell_class
+        return grid, seed
+
+    def close(self):
+        """Stops the workers, including one still carving a maze."""
+        if self._pool is None:
+            return
+        # shutdown() alone lets a running task finish, which for a big maze takes seconds
+        processes = list(self._pool._processes.values())
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
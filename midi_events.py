@@ -0,0 +1,260 @@
+"""Columnar MIDI event storage, serialized straight to Standard MIDI File bytes.
+
+A track's events are kept in parallel columns (tick, channel, type, note,
+velocity) with absolute ticks, instead of one `mido.Message` per event. At
+save time each track is ordered with one stable sort, its delta times are
+VLQ-encoded for all events at once, and the bytes are assembled from a
+fixed-width byte matrix, so no per-event object is ever built. Without
+NumPy the same bytes are produced by a plain Python loop, only slower.
+
+Meta events (tempo, time signature) are rare and carry variable-length
+data, so they go in the same columns with their payload kept aside, and are
+spliced into the track bytes afterwards.
+
+On top of that, `Schedule` lets music be written in beats: each part places
+notes at absolute beat positions, in any order and overlapping freely, and
+the sort at save time does all the ordering. No part has to track delta
+times or pad with silent events to stay aligned.
+"""
+
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; track_bytes falls back to a per-event loop
+    np = None
+
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+PROGRAM_CHANGE = 0xC0
+META = 0xFF
+
+# Meta types
+SET_TEMPO = 0x51
+TIME_SIGNATURE = 0x58
+END_OF_TRACK = 0x2F
+
+# Order of events that share a tick: meta and program changes first, then
+# note-offs before note-ons, so a note that ends where the same note starts
+# again is released before it is retriggered
+_ORDER = bytearray(256)
+_ORDER[NOTE_OFF] = 1
+_ORDER[NOTE_ON] = 2
+
+_DATA_BYTES = bytearray([2]) * 256 # Data bytes after the status byte
+_DATA_BYTES[PROGRAM_CHANGE] = 1
+_DATA_BYTES[META] = 1 # The meta type; the length and payload are spliced in
+
+if np is not None:
+    _ORDER = np.frombuffer(bytes(_ORDER), dtype=np.uint8)
+    _DATA_BYTES = np.frombuffer(bytes(_DATA_BYTES), dtype=np.uint8)
+
+
+def bpm2tempo(bpm):
+    """Microseconds per beat at `bpm` beats per minute."""
+    return int(round(60_000_000 / bpm))
+
+
+def _vlq(value):
+    """MIDI variable-length quantity, for the odd single value."""
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    return bytes(reversed(out))
+
+
+class EventBuffer:
+    """One MIDI track as parallel columns of absolute-tick events."""
+
+    def __init__(self):
+        self.ticks = array('q')
+        self.channels = array('B')
+        self.types = array('B')
+        self.notes = array('B') # Note number, program, or meta type
+        self.velocities = array('H') # Velocity, or index into self.meta_data for meta events
+        self.meta_data = []
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def _add(self, tick, channel, kind, note, velocity):
+        if tick < 0:
+            raise ValueError(f"negative tick {tick}")
+        self.ticks.append(tick)
+        self.channels.append(channel)
+        self.types.append(kind)
+        self.notes.append(note)
+        self.velocities.append(velocity)
+
+    # --- Channel Events ---
+    def note_on(self, tick, channel, note, velocity):
+        self._add(tick, channel, NOTE_ON, note, velocity)
+
+    def note_off(self, tick, channel, note, velocity=0):
+        self._add(tick, channel, NOTE_OFF, note, velocity)
+
+    def add_note(self, tick, channel, note, velocity, duration):
+        """A note_on at `tick` and its note_off `duration` ticks later."""
+        self._add(tick, channel, NOTE_ON, note, velocity)
+        self._add(tick + duration, channel, NOTE_OFF, note, 0)
+
+    def program_change(self, tick, channel, program):
+        self._add(tick, channel, PROGRAM_CHANGE, program, 0)
+
+    # --- Meta Events ---
+    def meta(self, tick, kind, data):
+        """A meta event of type `kind` with payload bytes `data`."""
+        self._add(tick, 0, META, kind, len(self.meta_data))
+        self.meta_data.append(bytes(data))
+
+    def set_tempo(self, tick, tempo):
+        """Tempo in microseconds per beat (see bpm2tempo)."""
+        self.meta(tick, SET_TEMPO, tempo.to_bytes(3, 'big'))
+
+    def time_signature(self, tick, numerator, denominator):
+        self.meta(tick, TIME_SIGNATURE, bytes((numerator, denominator.bit_length() - 1, 24, 8)))
+
+    # --- Serialization ---
+    def track_bytes(self):
+        """The MTrk chunk payload: all events in time order, delta-encoded, plus end of track."""
+        if np is None:
+            return self._track_bytes_python()
+        ticks = np.frombuffer(self.ticks, dtype=np.int64)
+        types = np.frombuffer(self.types, dtype=np.uint8)
+        order = np.lexsort((_ORDER[types], ticks)) # Stable: ties keep insertion order
+        ticks = ticks[order]
+        types = types[order]
+        notes = np.frombuffer(self.notes, dtype=np.uint8)[order]
+        velocities = np.frombuffer(self.velocities, dtype=np.uint16)[order]
+        status = types | np.frombuffer(self.channels, dtype=np.uint8)[order]
+        status[types == META] = META
+
+        # Each event as one row: 4 VLQ delta columns (right-aligned), status, 2 data bytes
+        deltas = np.diff(ticks, prepend=0)
+        n = len(ticks)
+        rows = np.empty((n, 7), dtype=np.uint8)
+        for i in range(4):
+            rows[:, 3 - i] = (deltas >> (7 * i)) & 0x7F | (0x80 if i else 0)
+        rows[:, 4] = status
+        rows[:, 5] = notes
+        rows[:, 6] = velocities
+        vlq_len = 1 + (deltas >= 1 << 7) + (deltas >= 1 << 14) + (deltas >= 1 << 21)
+        if n and deltas.max() >= 1 << 28:
+            raise ValueError("delta time too large for MIDI")
+        data_len = _DATA_BYTES[types]
+        columns = np.arange(7)
+        keep = (columns >= 4 - vlq_len[:, None]) & (columns < 5 + data_len[:, None])
+        body = rows[keep].tobytes() # Row-major, so events stay in order
+
+        meta_rows = np.flatnonzero(types == META)
+        if len(meta_rows):
+            ends = np.cumsum(vlq_len + 1 + data_len)
+            parts = []
+            start = 0
+            for row in meta_rows.tolist():
+                data = self.meta_data[velocities[row]]
+                parts.append(body[start:ends[row]])
+                parts.append(_vlq(len(data)) + data)
+                start = ends[row]
+            parts.append(body[start:])
+            body = b''.join(parts)
+        return body + bytes((0, META, END_OF_TRACK, 0))
+
+    def _track_bytes_python(self):
+        """track_bytes without NumPy: the same sort order and bytes, one event at a time."""
+        ticks, types = self.ticks, self.types
+        order = sorted(range(len(ticks)), key=lambda i: (ticks[i], _ORDER[types[i]])) # Stable, like lexsort
+        out = bytearray()
+        previous = 0
+        for i in order:
+            delta = ticks[i] - previous
+            if delta >= 1 << 28:
+                raise ValueError("delta time too large for MIDI")
+            previous = ticks[i]
+            kind = types[i]
+            out += _vlq(delta)
+            if kind == META:
+                data = self.meta_data[self.velocities[i]]
+                out += bytes((META, self.notes[i])) + _vlq(len(data)) + data
+            elif _DATA_BYTES[kind] == 1:
+                out += bytes((kind | self.channels[i], self.notes[i]))
+            else:
+                out += bytes((kind | self.channels[i], self.notes[i], self.velocities[i]))
+        return bytes(out) + bytes((0, META, END_OF_TRACK, 0))
+
+
+# --- Scheduling ---
+class Part:
+    """One instrument of a Schedule: notes placed at absolute beat positions on one channel."""
+
+    def __init__(self, name, channel, ticks_per_beat, program=None):
+        self.name = name
+        self.channel = channel
+        self.ticks_per_beat = ticks_per_beat
+        self.events = EventBuffer()
+        if program is not None:
+            self.events.program_change(0, channel, program)
+
+    def ticks(self, beats):
+        return int(round(beats * self.ticks_per_beat))
+
+    def note(self, beat, length, note, velocity):
+        """A note from `beat` lasting `length` beats (both may be fractional)."""
+        start = self.ticks(beat)
+        self.events.add_note(start, self.channel, note, velocity, self.ticks(beat + length) - start)
+
+    def chord(self, beat, length, notes, velocity):
+        for note in notes:
+            self.note(beat, length, note, velocity)
+
+
+class Schedule:
+    """A multi-part piece written in beats; saved as a format 1 MIDI file.
+
+    The first track is a conductor track with the tempo and time signature,
+    followed by one track per part in the order the parts were added.
+    """
+
+    def __init__(self, bpm=120, ticks_per_beat=480, time_signature=(4, 4)):
+        self.ticks_per_beat = ticks_per_beat
+        self.conductor = EventBuffer()
+        self.conductor.set_tempo(0, bpm2tempo(bpm))
+        self.conductor.time_signature(0, *time_signature)
+        self.parts = {}
+
+    def part(self, name, channel, program=None):
+        """Adds (or returns the existing) part `name`, with an optional GM program."""
+        if name not in self.parts:
+            self.parts[name] = Part(name, channel, self.ticks_per_beat, program)
+        return self.parts[name]
+
+    def tracks(self):
+        return [self.conductor] + [part.events for part in self.parts.values()]
+
+    def smf_bytes(self):
+        return smf_bytes(self.tracks(), self.ticks_per_beat)
+
+    def save(self, path):
+        save_smf(path, self.tracks(), self.ticks_per_beat)
+
+
+def assemble_smf(payloads, ticks_per_beat=480):
+    """A format 1 Standard MIDI File from already serialized track payloads (see track_bytes)."""
+    out = [b'MThd', struct.pack('>IHHH', 6, 1, len(payloads), ticks_per_beat)]
+    for data in payloads:
+        out.append(b'MTrk' + struct.pack('>I', len(data)))
+        out.append(data)
+    return b''.join(out)
+
+
+def smf_bytes(tracks, ticks_per_beat=480):
+    """A format 1 Standard MIDI File holding the EventBuffers in `tracks`."""
+    return assemble_smf([track.track_bytes() for track in tracks], ticks_per_beat)
+
+
+def save_smf(path, tracks, ticks_per_beat=480):
+    with open(path, 'wb') as f:
+        f.write(smf_bytes(tracks, ticks_per_beat))
@@ -0,0 +1,245 @@
+"""Offline MIDI-to-PCM rendering, so music ships as a pre-rendered WAV (needs NumPy).
+
+Reads a Standard MIDI File (as written by midi_events, moving_sound.py or
+create_midi.py) into columns of notes with start and end times in seconds,
+following the file's tempo map. Each note is voiced with the synth.py
+oscillators and ADSR envelopes, using a simple voice per GM program (the
+programs of moving_sound.PARTS and create_midi.PARTS, checked at import)
+and one-shot drum sounds on channel 10.
+
+Identical notes (same voice, pitch and length in samples) are synthesized
+once. All copies of a sound are then mixed in one vectorized `np.add.at`
+over their start offsets, in blocks of bounded size, so the cost grows with
+the number of distinct sounds rather than the number of notes. The game
+can then stream the WAV through pygame.mixer.music at almost no runtime
+cost, and sounds the same whatever MIDI synth the platform has.
+
+Usage: python midi_render.py retro_maze_music.mid retro_maze_music.wav [--rate 44100]
+"""
+
+import argparse
+import struct
+import wave
+from collections import namedtuple
+
+import numpy as np
+
+import create_midi
+import moving_sound
+from midi_events import NOTE_OFF, NOTE_ON, PROGRAM_CHANGE, META, SET_TEMPO
+from synth import SAMPLE_RATE, Tone, note_freq, render_tone
+
+DRUM_CHANNEL = 9
+DEFAULT_TEMPO = 500000 # Microseconds per beat (120 BPM) until the first set_tempo
+MIX_BLOCK = 1 << 20 # Samples added per np.add.at call
+PEAK = 0.89 # About -1 dBFS after normalization
+
+# Sustained voice for a GM program; the note's own length sets the duration
+Voice = namedtuple('Voice', 'wave attack decay sustain release cutoff gain')
+VOICES = {
+    11: Voice('sine', 0.002, 0.25, 0.0, 0.2, None, 0.5),          # Music Box: plucked, decays away
+    38: Voice('saw', 0.005, 0.1, 0.7, 0.05, 900, 0.7),            # Synth Bass 1
+    39: Voice('square', 0.005, 0.15, 0.6, 0.05, 700, 0.6),        # Synth Bass 2
+    73: Voice('triangle', 0.06, 0.1, 0.8, 0.15, 3000, 0.45),      # Flute
+    80: Voice('square', 0.002, 0.05, 0.5, 0.03, 3500, 0.25),      # Lead 1 (square)
+    81: Voice('saw', 0.01, 0.1, 0.7, 0.08, 4000, 0.3),            # Lead 2 (sawtooth)
+    87: Voice('square', 0.01, 0.08, 0.6, 0.06, 2000, 0.3),        # Lead 8 (bass + lead)
+    88: Voice('triangle', 0.4, 0.5, 0.8, 0.4, 2500, 0.25),        # Pad 1 (new age)
+    90: Voice('saw', 0.5, 0.5, 0.8, 0.5, 1200, 0.2),              # Pad 2 (warm)
+    98: Voice('sine', 0.005, 1.0, 0.3, 0.8, None, 0.35),          # FX 3 (crystal)
+    99: Voice('triangle', 0.005, 0.08, 0.3, 0.05, 5000, 0.3),     # Pad 6 (metallic)
+}
+DEFAULT_VOICE = Voice('triangle', 0.01, 0.1, 0.7, 0.08, None, 0.35)
+
+# Every program the game's soundtracks use must have its own voice, not the default
+_missing = {spec.program for spec in moving_sound.PARTS + create_midi.PARTS if spec.program is not None} - VOICES.keys()
+if _missing:
+    raise RuntimeError(f"midi_render.VOICES has no voice for GM programs {sorted(_missing)}")
+
+# One-shot drum sounds by GM percussion note; the note length is ignored
+DRUMS = {
+    36: Tone('sine', 120.0, 0.25, attack=0.001, decay=0.12, sustain=0.2, release=0.1, gain=0.9, end_freq=45.0), # Kick
+    38: Tone('noise', 0.0, 0.18, attack=0.001, decay=0.06, sustain=0.2, release=0.1, cutoff=6000, gain=0.45), # Snare
+    42: Tone('noise', 0.0, 0.05, attack=0.001, decay=0.02, sustain=0.2, release=0.02, gain=0.2), # Closed hi-hat
+    45: Tone('sine', 160.0, 0.3, attack=0.001, decay=0.15, sustain=0.2, release=0.1, gain=0.7, end_freq=90.0), # Low tom
+}
+DEFAULT_DRUM = Tone('noise', 0.0, 0.1, attack=0.001, decay=0.04, sustain=0.2, release=0.05, cutoff=8000, gain=0.3)
+
+# Notes as columns: times in seconds, plus channel, pitch, velocity and the channel's program
+Notes = namedtuple('Notes', 'start end channel note velocity program')
+
+
+# --- Reading ---
+def _read_vlq(data, pos):
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = value << 7 | byte & 0x7F
+        if byte < 0x80:
+            return value, pos
+
+
+def _read_track(data, pos, end, notes, tempos, programs):
+    """Appends a track's notes as (start tick, end tick, channel, note, velocity) and its tempo/program changes."""
+    tick = 0
+    running = 0 # Last channel status, reused when an event omits its status byte
+    held = {} # (channel, note) -> list of (start tick, velocity), for overlapping repeats
+    while pos < end:
+        delta, pos = _read_vlq(data, pos)
+        tick += delta
+        status = running
+        if data[pos] >= 0x80:
+            status = data[pos]
+            pos += 1
+        if status == META:
+            kind = data[pos]
+            length, pos = _read_vlq(data, pos + 1)
+            if kind == SET_TEMPO:
+                tempos.append((tick, int.from_bytes(data[pos:pos + length], 'big')))
+            pos += length
+            continue
+        if status in (0xF0, 0xF7): # SysEx: skipped
+            length, pos = _read_vlq(data, pos)
+            pos += length
+            continue
+        running = status
+        kind, channel = status & 0xF0, status & 0x0F
+        if kind in (PROGRAM_CHANGE, 0xD0): # One data byte
+            if kind == PROGRAM_CHANGE:
+                programs.append((tick, channel, data[pos]))
+            pos += 1
+            continue
+        note, velocity = data[pos], data[pos + 1]
+        pos += 2
+        if kind == NOTE_ON and velocity:
+            held.setdefault((channel, note), []).append((tick, velocity))
+        elif kind in (NOTE_ON, NOTE_OFF):
+            starts = held.get((channel, note))
+            if starts:
+                start, start_velocity = starts.pop(0)
+                notes.append((start, tick, channel, note, start_velocity))
+    for (channel, note), starts in held.items(): # Never released: end with the track
+        notes.extend((start, tick, channel, note, velocity) for start, velocity in starts)
+
+
+def read_notes(data):
+    """Every note of a Standard MIDI File, with start/end in seconds, as a Notes of NumPy arrays."""
+    if data[:4] != b'MThd':
+        raise ValueError("not a Standard MIDI File")
+    header_len, _, track_count, division = struct.unpack('>IHHH', data[4:14])
+    if division & 0x8000:
+        raise ValueError("SMPTE time division is not supported")
+    pos = 8 + header_len
+    notes, tempos, programs = [], [], []
+    for _ in range(track_count):
+        kind, length = data[pos:pos + 4], struct.unpack('>I', data[pos + 4:pos + 8])[0]
+        pos += 8
+        if kind == b'MTrk':
+            _read_track(data, pos, pos + length, notes, tempos, programs)
+        pos += length
+
+    columns = np.array(notes, dtype=np.int64).reshape(-1, 5)
+    start_ticks, end_ticks = columns[:, 0], columns[:, 1]
+    channel = columns[:, 2]
+    to_seconds = _tempo_map(sorted(tempos), division)
+
+    program = np.zeros(len(columns), dtype=np.int64)
+    for ch in np.unique(channel).tolist():
+        changes = sorted((tick, prog) for tick, c, prog in programs if c == ch)
+        if changes:
+            ticks = np.array([t for t, _ in changes])
+            values = np.array([p for _, p in changes])
+            mask = channel == ch
+            index = np.searchsorted(ticks, start_ticks[mask], side='right') - 1
+            program[mask] = values[np.maximum(index, 0)] # Notes before the first change get its program
+    return Notes(to_seconds(start_ticks), to_seconds(end_ticks), channel, columns[:, 3], columns[:, 4], program)
+
+
+def _tempo_map(tempos, ticks_per_beat):
+    """Function from tick arrays to seconds, following the tempo changes [(tick, us per beat)]."""
+    if not tempos or tempos[0][0] > 0:
+        tempos = [(0, DEFAULT_TEMPO)] + tempos
+    ticks = np.array([t for t, _ in tempos], dtype=np.int64)
+    seconds_per_tick = np.array([tempo for _, tempo in tempos], dtype=np.float64) / 1e6 / ticks_per_beat
+    offsets = np.concatenate(([0.0], np.cumsum(np.diff(ticks) * seconds_per_tick[:-1]))) # Seconds at each change
+
+    def to_seconds(tick_array):
+        i = np.searchsorted(ticks, tick_array, side='right') - 1
+        return offsets[i] + (tick_array - ticks[i]) * seconds_per_tick[i]
+    return to_seconds
+
+
+# --- Voicing ---
+def _note_tone(program, channel, note, length):
+    """The synth.Tone for one note of `length` seconds."""
+    if channel == DRUM_CHANNEL:
+        return DRUMS.get(note, DEFAULT_DRUM)
+    voice = VOICES.get(program, DEFAULT_VOICE)
+    return Tone(voice.wave, note_freq(note), length + voice.release, voice.attack, voice.decay,
+                voice.sustain, voice.release, voice.cutoff, voice.gain)
+
+
+# --- Mixing ---
+def render_notes(notes, rate=SAMPLE_RATE):
+    """Mono float32 mix of all notes, peak-normalized."""
+    starts = np.round(notes.start * rate).astype(np.int64)
+    lengths = np.maximum(np.round((notes.end - notes.start) * rate).astype(np.int64), 1)
+    gains = (notes.velocity / 127.0).astype(np.float32)
+
+    # Group identical notes: one synthesized sound each, mixed at all of its offsets at once
+    keys = np.stack((notes.program, notes.channel, notes.note, np.where(notes.channel == DRUM_CHANNEL, 0, lengths)), axis=1)
+    unique, group = np.unique(keys, axis=0, return_inverse=True)
+    group = group.ravel()
+    sounds = [render_tone(_note_tone(program, channel, note, length / rate), rate)
+              for program, channel, note, length in unique.tolist()]
+
+    last_start = np.zeros(len(sounds), dtype=np.int64)
+    np.maximum.at(last_start, group, starts)
+    total = max((int(last_start[g]) + len(s) for g, s in enumerate(sounds)), default=0)
+    mix = np.zeros(total, dtype=np.float32)
+    order = np.argsort(group, kind='stable')
+    bounds = np.searchsorted(group[order], np.arange(len(sounds) + 1))
+    for g, sound in enumerate(sounds):
+        members = order[bounds[g]:bounds[g + 1]]
+        per_block = max(1, MIX_BLOCK // len(sound))
+        offsets = np.arange(len(sound))
+        for i in range(0, len(members), per_block):
+            block = members[i:i + per_block]
+            index = (starts[block, None] + offsets).ravel()
+            np.add.at(mix, index, (gains[block, None] * sound).ravel()) # Overlapping copies add up
+    peak = float(np.abs(mix).max()) if total else 0.0
+    if peak > 0:
+        mix *= PEAK / peak
+    return mix
+
+
+def render_midi(data, rate=SAMPLE_RATE):
+    """Signed 16-bit mono PCM of a MIDI file's bytes."""
+    mix = render_notes(read_notes(data), rate)
+    return (mix * 32767.0).astype(np.int16)
+
+
+def save_wav(path, pcm, rate=SAMPLE_RATE):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(pcm.astype('<i2').tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a MIDI file to a 16-bit WAV with the built-in synth voices.")
+    parser.add_argument('midi', help="input .mid file")
+    parser.add_argument('out', help="output .wav file")
+    parser.add_argument('--rate', type=int, default=SAMPLE_RATE, help="sample rate in Hz")
+    args = parser.parse_args()
+
+    with open(args.midi, 'rb') as f:
+        pcm = render_midi(f.read(), args.rate)
+    save_wav(args.out, pcm, args.rate)
+    print(f"Rendered {args.midi} -> {args.out} ({len(pcm) / args.rate:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
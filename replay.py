@@ -0,0 +1,194 @@
+"""Replay recording, storage and headless re-simulation (no pygame needed).
+
+A replay is everything needed to replay a game exactly: the maze's
+generator, seed, size and endpoints, plus the stream of moves, each
+stamped with the simulation tick it started on. Because the game runs on a
+fixed timestep, re-applying the moves to the regenerated maze reproduces the
+final time, move count, backtracks and score with no rounding.
+
+Layout (little-endian):
+    68-byte header: magic b'MZRP', version (u16), flags (u16), width, height,
+                    start_x, start_y, end_x, end_y (u32 each), seed (u64),
+                    algorithm name (16 bytes, NUL padded), tick rate (u16),
+                    ticks per move (u16), move count (u32), claimed score (i32)
+    moves:          one unsigned LEB128 varint per move, holding
+                    (ticks since the previous move << 2) | direction, where
+                    direction indexes TOP, RIGHT, BOTTOM, LEFT. At normal
+                    play speed that is one byte per move.
+"""
+
+import struct
+from array import array
+from collections import namedtuple
+
+from maze_grid import TOP, RIGHT, BOTTOM, LEFT, VisitedSet
+
+MAGIC = b'MZRP'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIIIIIQ16sHHIi')
+HEADER_SIZE = HEADER.size # 68 bytes
+
+FLAG_HAS_SEED = 1
+
+# --- Game Rules ---
+# Shared by the game and the verifier, so both time moves identically
+TICK_RATE = 100 # Simulation ticks per second
+MOVE_SPEED = 0.12 # Seconds per cell
+MOVE_TICKS = round(MOVE_SPEED * TICK_RATE) # Ticks per one-cell move (12; TICK_RATE is chosen to divide MOVE_SPEED)
+
+DIRECTION_BITS = (TOP, RIGHT, BOTTOM, LEFT) # Direction code -> wall bit
+
+Replay = namedtuple('Replay', 'algorithm seed width height start end tick_rate move_ticks moves claimed_score')
+ReplayResult = namedtuple('ReplayResult', 'valid reason score final_ticks move_count backtrack_count')
+
+
+class ReplayError(ValueError):
+    """Raised when data is not a valid replay."""
+
+
+def compute_score(final_ticks, tick_rate, move_count, optimal_moves, backtrack_count):
+    """The game's score for a finished run. Time counts in whole seconds of simulated play.
+
+    With optimal_moves=None (the shortest route is unknown) wasted moves are not scored.
+    """
+    score = 10000
+    score -= (final_ticks // tick_rate) * 10 # 10 points per second
+    if optimal_moves is not None:
+        score -= (move_count - optimal_moves) * 5 # 5 points per move beyond the shortest route
+    score -= backtrack_count * 50 # 50 points per backtrack (heavy penalty)
+    return max(0, score) # Score cannot be negative
+
+
+# --- Recording ---
+class ReplayRecorder:
+    """Collects moves during play as packed (tick << 2 | direction) ints."""
+
+    def __init__(self, algorithm, seed, width, height, start, end, tick_rate=TICK_RATE, move_ticks=MOVE_TICKS):
+        self.algorithm = algorithm
+        self.seed = seed
+        self.width, self.height = width, height
+        self.start, self.end = tuple(start), tuple(end)
+        self.tick_rate, self.move_ticks = tick_rate, move_ticks
+        self.moves = array('Q')
+
+    def record(self, tick, bit):
+        """Records a move in direction `bit` (a wall bit) starting on `tick`."""
+        self.moves.append((tick << 2) | DIRECTION_BITS.index(bit))
+
+    def replay(self, claimed_score=0):
+        return Replay(self.algorithm, self.seed, self.width, self.height, self.start, self.end,
+                      self.tick_rate, self.move_ticks, self.moves, claimed_score)
+
+    def save(self, path, claimed_score=0):
+        save_replay(path, self.replay(claimed_score))
+
+
+# --- Encoding ---
+def encode_replay(replay):
+    """Serializes a Replay to bytes."""
+    flags = FLAG_HAS_SEED if replay.seed is not None else 0
+    out = bytearray(HEADER.pack(
+        MAGIC, VERSION, flags, replay.width, replay.height,
+        replay.start[0], replay.start[1], replay.end[0], replay.end[1],
+        replay.seed or 0, replay.algorithm.encode('ascii')[:16],
+        replay.tick_rate, replay.move_ticks, len(replay.moves), replay.claimed_score,
+    ))
+    previous = 0
+    for move in replay.moves:
+        tick = move >> 2
+        value = ((tick - previous) << 2) | (move & 3)
+        previous = tick
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_replay(data):
+    """Parses bytes written by `encode_replay` back into a Replay."""
+    if len(data) < HEADER_SIZE:
+        raise ReplayError("data too short for a replay header")
+    (magic, version, flags, width, height, sx, sy, ex, ey, seed, algorithm,
+     tick_rate, move_ticks, count, claimed_score) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ReplayError("not a replay (bad magic)")
+    if version != VERSION:
+        raise ReplayError(f"unsupported replay version {version}")
+
+    moves = array('Q')
+    append = moves.append
+    tick = value = shift = 0
+    for byte in memoryview(data)[HEADER_SIZE:]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            if shift > 63:
+                raise ReplayError("move varint is too long")
+            continue
+        tick += value >> 2
+        try:
+            append((tick << 2) | (value & 3))
+        except OverflowError:
+            raise ReplayError("move tick is out of range") from None
+        value = shift = 0
+    if shift or len(moves) != count:
+        raise ReplayError("move stream is truncated")
+    try:
+        algorithm = algorithm.rstrip(b'\0').decode('ascii')
+    except UnicodeDecodeError:
+        raise ReplayError("algorithm name is not ASCII") from None
+
+    return Replay(
+        algorithm, seed if flags & FLAG_HAS_SEED else None,
+        width, height, (sx, sy), (ex, ey), tick_rate, move_ticks, moves, claimed_score,
+    )
+
+
+def save_replay(path, replay):
+    with open(path, 'wb') as f:
+        f.write(encode_replay(replay))
+
+
+def load_replay(path):
+    with open(path, 'rb') as f:
+        return decode_replay(f.read())
+
+
+# --- Re-simulation ---
+def simulate(grid, replay, optimal_moves):
+    """Re-plays the moves of `replay` on `grid` under the game's rules. Returns a ReplayResult.
+
+    A move is rejected if it starts before the previous one has finished,
+    walks into a wall, or comes after the goal was reached.
+    """
+    width, walls = grid.width, grid.walls
+    steps = {TOP: -width, RIGHT: 1, BOTTOM: width, LEFT: -1}
+    position = grid.index(*replay.start)
+    goal = grid.index(*replay.end)
+    visited = VisitedSet(grid.size)
+    visited.add(position)
+    backtracks = 0
+    ready_tick = 1 # First tick a move may start on
+    final_ticks = None
+
+    for number, move in enumerate(replay.moves, 1):
+        tick, bit = move >> 2, DIRECTION_BITS[move & 3]
+        if final_ticks is not None:
+            return ReplayResult(False, f"move {number} comes after the goal was reached", 0, final_ticks, number, backtracks)
+        if tick < ready_tick:
+            return ReplayResult(False, f"move {number} starts before the previous move finished", 0, tick, number, backtracks)
+        if walls[position] & bit:
+            return ReplayResult(False, f"move {number} walks into a wall", 0, tick, number, backtracks)
+        position += steps[bit]
+        if position in visited:
+            backtracks += 1
+        visited.add(position)
+        ready_tick = tick + replay.move_ticks
+        if position == goal:
+            final_ticks = tick
+
+    if final_ticks is None:
+        return ReplayResult(False, "the goal is never reached", 0, 0, len(replay.moves), backtracks)
+    score = compute_score(final_ticks, replay.tick_rate, len(replay.moves), optimal_moves, backtracks)
+    return ReplayResult(True, '', score, final_ticks, len(replay.moves), backtracks)
@@ -0,0 +1,85 @@
+"""Soundtrack rendering with every part composed independently.
+
+A soundtrack is a list of parts plus a shared Structure (bars, pitch pool,
+chord progression) and a seed. Each part is composed by a plain function of
+(part, structure, rng), with its own RNG seeded from the soundtrack seed and
+the part name, so a part comes out the same whichever process composes it,
+in whatever order. That makes the parts independent jobs. `render_many`
+spreads the parts of many soundtracks over one process pool. Each worker
+composes and serializes its part to track bytes, and the main process only
+concatenates the tracks into MIDI files.
+
+Compose functions must be module-level functions so they can be sent to the
+worker processes.
+"""
+
+import hashlib
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from midi_events import EventBuffer, Part, assemble_smf, bpm2tempo
+
+# The piece's shape, shared by all parts: its length in bars, the pool of
+# pitches the style draws from (a scale, a motif...) and its chord progression,
+# in whatever form the style's compose functions read
+Structure = namedtuple('Structure', 'bars pitches progression')
+# One part: its name, channel, GM program (None for none, e.g. drums) and compose(part, structure, rng)
+PartSpec = namedtuple('PartSpec', 'name channel program compose')
+Soundtrack = namedtuple('Soundtrack', 'parts structure seed bpm ticks_per_beat time_signature',
+                        defaults=(480, (4, 4)))
+
+
+def part_seed(seed, name):
+    """Stable 64-bit seed for one part of a soundtrack."""
+    key = f"{seed}:{name}".encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+# --- Worker ---
+def render_part(spec, structure, seed, ticks_per_beat=480):
+    """Composes one part and returns its serialized track payload."""
+    part = Part(spec.name, spec.channel, ticks_per_beat, spec.program)
+    spec.compose(part, structure, random.Random(part_seed(seed, spec.name)))
+    return part.events.track_bytes()
+
+
+def _render_job(job):
+    soundtrack, spec = job
+    return render_part(spec, soundtrack.structure, soundtrack.seed, soundtrack.ticks_per_beat)
+
+
+# --- Assembly ---
+def conductor_track(soundtrack):
+    conductor = EventBuffer()
+    conductor.set_tempo(0, bpm2tempo(soundtrack.bpm))
+    conductor.time_signature(0, *soundtrack.time_signature)
+    return conductor.track_bytes()
+
+
+def render(soundtrack):
+    """The soundtrack's MIDI file bytes, composed in this process."""
+    payloads = [render_part(spec, soundtrack.structure, soundtrack.seed, soundtrack.ticks_per_beat)
+                for spec in soundtrack.parts]
+    return assemble_smf([conductor_track(soundtrack)] + payloads, soundtrack.ticks_per_beat)
+
+
+def render_many(soundtracks, workers=None, chunksize=4):
+    """MIDI file bytes for each soundtrack, in order, with all their parts spread over a process pool.
+
+    With workers=1 everything is composed in this process, which is faster
+    for a single short piece than starting a pool.
+    """
+    soundtracks = list(soundtracks)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from (render(soundtrack) for soundtrack in soundtracks)
+        return
+    jobs = [(soundtrack, spec) for soundtrack in soundtracks for spec in soundtrack.parts]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        payloads = pool.map(_render_job, jobs, chunksize=chunksize)
+        for soundtrack in soundtracks:
+            tracks = [conductor_track(soundtrack)]
+            tracks.extend(next(payloads) for _ in soundtrack.parts)
+            yield assemble_smf(tracks, soundtrack.ticks_per_beat)
@@ -0,0 +1,225 @@
+"""Batch soundtrack variants in a content-addressed cache.
+
+Generates K variants of each style, each from an explicit seed plus the
+musical parameters (tempo, bars, pitch pool, chord progression). A variant is
+stored as <key>.mid, where the key is a hash of its style, all of its
+parameters and the source code that composes and writes it, so a parameter
+set that was generated before is never generated again, and editing a
+style's compose functions does not reuse its old variants. manifest.jsonl in the cache directory indexes every file,
+one line per variant with its parameters. The variants still missing are
+rendered together across a process pool (see soundtrack.render_many).
+
+Usage: python soundtrack_variants.py --styles retro dark_fantasy --count 20 --seed 7 --out music_cache/
+       python soundtrack_variants.py --styles retro --seeds 1 2 3 --tempo 140 --bars 32
+
+--pitches and --progression are in one style's own format, so they need
+exactly one --styles, and their notes must leave room for the octaves the
+style transposes them by (see Style.pitch_range and progression_range).
+"""
+
+import argparse
+import functools
+import hashlib
+import inspect
+import json
+import os
+import random
+import time
+from collections import namedtuple
+
+import create_midi
+import midi_events
+import moving_sound
+import soundtrack
+from batch_generate import derive_seed
+from soundtrack import Soundtrack, render_many
+
+CACHE_VERSION = 2 # Bump when the cache layout or manifest format changes
+
+# module: the style's source module; its code is part of every cache key.
+# pitch_range, progression_range: the notes the style accepts, leaving room for the
+# octave transposes its parts apply (per chord key where chords are dicts)
+Style = namedtuple('Style', 'parts structure tempo module pitch_range progression_range')
+STYLES = {
+    # Texture and melody play pitches an octave up, the counter-melody an octave down;
+    # the second arpeggio plays the arp notes an octave up
+    'retro': Style(moving_sound.PARTS, moving_sound.STRUCTURE, moving_sound.TEMPO, moving_sound,
+                   (12, 115), {'bass': (0, 127), 'arp': (0, 115), 'pad': (0, 127)}),
+    # The bass doubles each motif note an octave down
+    'dark_fantasy': Style(create_midi.PARTS, create_midi.STRUCTURE, create_midi.tempo, create_midi,
+                          (12, 127), (0, 127)),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def source_hash(style_name):
+    """Hash of the code that composes and serializes a style: its module, soundtrack.py and midi_events.py."""
+    digest = hashlib.blake2b(digest_size=16)
+    for module in (STYLES[style_name].module, soundtrack, midi_events):
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()
+
+
+# --- Pitches and Progressions ---
+def _same_shape(value, template, note_range=(0, 127)):
+    """Whether `value` is laid out like `template`: same dict keys, note lists, notes in `note_range`.
+
+    `note_range` is (lowest, highest), or a dict of them per key where `template` is a dict.
+    """
+    if isinstance(template, dict):
+        ranges = note_range if isinstance(note_range, dict) else dict.fromkeys(template, note_range)
+        return isinstance(value, dict) and value.keys() == template.keys() and \
+            all(_same_shape(value[k], template[k], ranges[k]) for k in template)
+    if isinstance(template, list):
+        return isinstance(value, list) and len(value) > 0 and \
+            all(_same_shape(v, template[0], note_range) for v in value)
+    low, high = note_range
+    return type(value) is int and low <= value <= high
+
+
+def check_pitches(style_name, pitches):
+    """Raises ValueError unless `pitches` are enough notes for the style, all within its pitch range."""
+    style = STYLES[style_name]
+    needed = len(style.structure.pitches)
+    if len(pitches) < needed:
+        raise ValueError(f"style '{style_name}' needs at least {needed} pitches")
+    low, high = style.pitch_range
+    if not all(type(note) is int and low <= note <= high for note in pitches):
+        raise ValueError(f"style '{style_name}' needs pitches in {low}..{high}, as it transposes them by an octave")
+
+
+def check_progression(style_name, progression):
+    """Raises ValueError unless `progression` has the same shape as the style's own chords, within its note ranges."""
+    style = STYLES[style_name]
+    default = style.structure.progression
+    if not _same_shape(progression, default, style.progression_range):
+        raise ValueError(f"progression does not match style '{style_name}', whose chords look like "
+                         f"{json.dumps(default[0])} with notes in {json.dumps(style.progression_range)}")
+
+
+# --- Cache Keys ---
+def variant_params(style_name, seed, tempo=None, bars=None, pitches=None, progression=None):
+    """The full parameter set of one variant, with the style's defaults filled in."""
+    style = STYLES[style_name]
+    structure = style.structure
+    if pitches is not None:
+        check_pitches(style_name, pitches)
+    if progression is not None:
+        check_progression(style_name, progression)
+    return {
+        'version': CACHE_VERSION,
+        'source': source_hash(style_name),
+        'style': style_name,
+        'seed': seed,
+        'tempo': float(tempo or style.tempo),
+        'bars': bars or structure.bars,
+        'pitches': list(pitches or structure.pitches),
+        'progression': progression or structure.progression,
+    }
+
+
+def cache_key(params):
+    """Content hash of a parameter set (canonical JSON)."""
+    canonical = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def soundtrack_for(params):
+    style = STYLES[params['style']]
+    structure = style.structure._replace(bars=params['bars'], pitches=params['pitches'],
+                                         progression=params['progression'])
+    return Soundtrack(style.parts, structure, params['seed'], params['tempo'])
+
+
+# --- Cache ---
+def load_manifest(cache_dir):
+    """key -> manifest entry, for entries whose file still exists."""
+    entries = {}
+    path = os.path.join(cache_dir, 'manifest.jsonl')
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                entry = json.loads(line)
+                if os.path.exists(os.path.join(cache_dir, entry['file'])):
+                    entries[entry['key']] = entry
+    return entries
+
+
+def generate_variants(param_sets, cache_dir, workers=None):
+    """Makes sure every parameter set has a file in cache_dir.
+
+    Returns (manifest entries in the order of param_sets, number newly generated).
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    cached = load_manifest(cache_dir)
+    entries = []
+    missing = {}
+    for params in param_sets:
+        key = cache_key(params)
+        entry = cached.get(key) or missing.get(key)
+        if entry is None:
+            entry = missing[key] = dict(params, key=key, file=f"{key}.mid")
+        entries.append(entry)
+
+    if missing:
+        todo = list(missing.values())
+        with open(os.path.join(cache_dir, 'manifest.jsonl'), 'a') as manifest:
+            for entry, data in zip(todo, render_many([soundtrack_for(e) for e in todo], workers)):
+                path = os.path.join(cache_dir, entry['file'])
+                with open(path + '.tmp', 'wb') as f:
+                    f.write(data)
+                os.replace(path + '.tmp', path) # No half-written file ever sits under its key
+                manifest.write(json.dumps(entry) + '\n')
+    return entries, len(missing)
+
+
+def _note_list(text):
+    return [int(n) for n in text.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded soundtrack variants into a content-addressed cache.")
+    parser.add_argument('--styles', nargs='+', default=sorted(STYLES), choices=sorted(STYLES))
+    parser.add_argument('--count', type=int, default=1, help="variants per style (seeds derived from --seed)")
+    parser.add_argument('--seed', type=int, default=None, help="master seed (random if omitted)")
+    parser.add_argument('--seeds', type=int, nargs='+', default=None, help="explicit variant seeds instead of --count/--seed")
+    parser.add_argument('--tempo', type=float, default=None, help="BPM (default: the style's)")
+    parser.add_argument('--bars', type=int, default=None, help="length in bars (default: the style's)")
+    parser.add_argument('--pitches', type=_note_list, default=None,
+                        help="comma-separated MIDI notes for the style's pitch pool (retro: its scale; dark_fantasy: its bass motif)")
+    parser.add_argument('--progression', type=json.loads, default=None,
+                        help="JSON chord progression in the style's own format")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--out', default='music_cache', help="cache directory")
+    args = parser.parse_args()
+
+    if args.seeds is not None:
+        seeds = args.seeds
+    else:
+        master_seed = args.seed if args.seed is not None else random.randrange(2 ** 63)
+        seeds = [derive_seed(master_seed, i) for i in range(args.count)]
+        print(f"Master seed {master_seed}")
+    if args.pitches is not None or args.progression is not None:
+        if len(args.styles) != 1:
+            parser.error("--pitches and --progression are in one style's format: select exactly one style with --styles")
+        name = args.styles[0]
+        try:
+            if args.pitches is not None:
+                check_pitches(name, args.pitches)
+            if args.progression is not None:
+                check_progression(name, args.progression)
+        except ValueError as e:
+            parser.error(str(e))
+
+    param_sets = [variant_params(name, seed, args.tempo, args.bars, args.pitches, args.progression)
+                  for name in args.styles for seed in seeds]
+    start_time = time.perf_counter()
+    entries, generated = generate_variants(param_sets, args.out, args.workers)
+    elapsed = time.perf_counter() - start_time
+    for entry in entries:
+        print(f"  {entry['style']:<13} seed {entry['seed']:<20} {entry['file']}")
+    print(f"Done: {generated} generated, {len(entries) - generated} cached in {elapsed:.2f}s -> {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""Procedural sound effects synthesized with NumPy.
+
+Sounds are described by small recipes (named tuples of plain numbers, so
+they are hashable) and rendered with oscillators, ADSR envelopes and FIR
+filters into float32 arrays. `SynthCache` turns a recipe into a
+`pygame.mixer.Sound` by creating the Sound first and writing the int16
+samples straight into its buffer through `pygame.sndarray.samples`, so the
+mixer gets the data without an extra copy. Sounds are cached by recipe, so
+a fixed set of pitch variants is synthesized once and then only looked up.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+
+# One note: waveform, frequency (Hz, optionally sweeping to end_freq), timing (s), envelope, filter and level
+Tone = namedtuple('Tone', 'wave freq duration attack decay sustain release cutoff gain end_freq start',
+                  defaults=(0.005, 0.02, 0.6, 0.03, None, 0.5, None, 0.0))
+# A mix of tones, each placed at its own start time
+Chord = namedtuple('Chord', 'tones')
+
+
+def note_freq(midi_note):
+    """Frequency of a MIDI note number (A4 = 69 = 440 Hz)."""
+    return 440.0 * 2.0 ** ((midi_note - 69) / 12.0)
+
+
+# --- Oscillators ---
+def oscillator(wave, freq, duration, rate=SAMPLE_RATE, end_freq=None):
+    """One of 'sine', 'square', 'saw', 'triangle' or 'noise', in [-1, 1].
+
+    With `end_freq` the pitch glides exponentially from freq to end_freq;
+    the phase is integrated from the instantaneous frequency so it stays
+    continuous.
+    """
+    n = int(duration * rate)
+    if wave == 'noise':
+        return np.random.default_rng(0).uniform(-1.0, 1.0, n).astype(np.float32)
+    if end_freq is None:
+        phase = np.arange(n, dtype=np.float64) * (freq / rate)
+    else:
+        freqs = freq * (end_freq / freq) ** np.linspace(0.0, 1.0, n)
+        phase = np.cumsum(freqs / rate)
+    phase %= 1.0
+    if wave == 'sine':
+        out = np.sin(2 * np.pi * phase)
+    elif wave == 'square':
+        out = np.where(phase < 0.5, 1.0, -1.0)
+    elif wave == 'saw':
+        out = 2.0 * phase - 1.0
+    elif wave == 'triangle':
+        out = 1.0 - 4.0 * np.abs(phase - 0.5)
+    else:
+        raise ValueError(f"unknown waveform '{wave}'")
+    return out.astype(np.float32)
+
+
+# --- Envelope ---
+def adsr(n, attack, decay, sustain, release, rate=SAMPLE_RATE):
+    """Attack/decay/sustain/release gain curve over n samples; the release ends the sound."""
+    a, d, r = (min(n, int(t * rate)) for t in (attack, decay, release))
+    env = np.full(n, sustain, dtype=np.float32)
+    env[:a] = np.linspace(0.0, 1.0, a, endpoint=False)
+    env[a:a + d] = np.linspace(1.0, sustain, len(env[a:a + d]), endpoint=False)
+    if r:
+        env[n - r:] *= np.linspace(1.0, 0.0, r)
+    return env
+
+
+# --- Filters ---
+def lowpass(signal, cutoff, rate=SAMPLE_RATE, taps=63):
+    """Windowed-sinc FIR low-pass; `cutoff` in Hz."""
+    fc = cutoff / rate
+    k = np.arange(taps) - (taps - 1) / 2
+    kernel = np.sinc(2 * fc * k) * np.hamming(taps)
+    kernel /= kernel.sum()
+    return np.convolve(signal, kernel.astype(np.float32), mode='same')
+
+
+def highpass(signal, cutoff, rate=SAMPLE_RATE, taps=63):
+    """FIR high-pass by spectral inversion of the low-pass."""
+    return signal - lowpass(signal, cutoff, rate, taps)
+
+
+# --- Rendering ---
+def render_tone(tone, rate=SAMPLE_RATE):
+    out = oscillator(tone.wave, tone.freq, tone.duration, rate, tone.end_freq)
+    out *= adsr(len(out), tone.attack, tone.decay, tone.sustain, tone.release, rate)
+    if tone.cutoff:
+        out = lowpass(out, tone.cutoff, rate)
+    return out * tone.gain
+
+
+def render(recipe, rate=SAMPLE_RATE):
+    """Float32 samples in [-1, 1] for a Tone or Chord."""
+    if isinstance(recipe, Tone):
+        return np.clip(render_tone(recipe, rate), -1.0, 1.0)
+    length = max(int((t.start + t.duration) * rate) for t in recipe.tones)
+    mix = np.zeros(length, dtype=np.float32)
+    for tone in recipe.tones:
+        samples = render_tone(tone, rate)
+        begin = int(tone.start * rate)
+        mix[begin:begin + len(samples)] += samples
+    return np.clip(mix, -1.0, 1.0)
+
+
+# --- Recipes ---
+def move_blip(semitones=0):
+    """Short filtered square blip; `semitones` shifts the pitch."""
+    return Tone('square', note_freq(79 + semitones), 0.07, attack=0.002, decay=0.03, sustain=0.3,
+                release=0.03, cutoff=3500, gain=0.35)
+
+
+def backtrack_blip(semitones=0):
+    """Lower triangle blip gliding down, for moves back onto visited cells."""
+    freq = note_freq(67 + semitones)
+    return Tone('triangle', freq, 0.08, attack=0.002, decay=0.04, sustain=0.4, release=0.03,
+                gain=0.5, end_freq=freq * 0.75)
+
+
+def victory_jingle(root=72, intervals=(0, 4, 7, 12), step=0.12):
+    """Rising arpeggio from MIDI note `root`, with the last note held."""
+    tones = [Tone('saw', note_freq(root + i), step * (3 if n == len(intervals) - 1 else 1.2),
+                  attack=0.005, decay=0.05, sustain=0.7, release=0.08, cutoff=5000, gain=0.3, start=n * step)
+             for n, i in enumerate(intervals)]
+    return Chord(tuple(tones))
+
+
+# --- Mixer Hand-off ---
+class SynthCache:
+    """Renders recipes into mixer Sounds, once per distinct recipe."""
+
+    def __init__(self):
+        import pygame # Only needed for the hand-off; the synthesis above is pure NumPy
+        self.pygame = pygame
+        init = pygame.mixer.get_init()
+        if init is None:
+            raise RuntimeError("the mixer is not initialised")
+        self.rate, size, self.channels = init
+        if size != -16:
+            raise ValueError(f"SynthCache needs a signed 16-bit mixer, not format {size}")
+        self._sounds = {}
+        self.synthesized = 0
+
+    def sound(self, recipe):
+        """The Sound for `recipe`, synthesized on first use."""
+        sound = self._sounds.get(recipe)
+        if sound is None:
+            samples = render(recipe, self.rate)
+            sound = self.pygame.mixer.Sound(buffer=bytes(len(samples) * self.channels * 2))
+            target = self.pygame.sndarray.samples(sound) # A view of the Sound's own buffer
+            scaled = samples * 32767.0
+            if target.ndim == 2:
+                scaled = scaled[:, None] # Same signal on every output channel
+            np.copyto(target, scaled, casting='unsafe')
+            self._sounds[recipe] = sound
+            self.synthesized += 1
+        return sound
+
+    def variants(self, make, semitones):
+        """Sounds for `make(s)` at each pitch offset in `semitones`, e.g. for per-move variation."""
+        return [self.sound(make(s)) for s in semitones]
+
+
+def synthesize_effects(sfx, cache=None):
+    """Replaces the game's WAV effects in an audio.SoundEffects with synthesized ones.
+
+    Moves get five pitch variants a semitone apart, so consecutive moves
+    vary in pitch, and all of them are rendered here, before play starts.
+    """
+    cache = cache or SynthCache()
+    sfx.set_sounds('move', cache.variants(move_blip, (-2, -1, 0, 1, 2)))
+    sfx.set_sounds('backtrack', cache.variants(backtrack_blip, (-1, 0, 1)))
+    sfx.set_sounds('victory', [cache.sound(victory_jingle(72)), cache.sound(victory_jingle(67, (0, 4, 7, 11, 12)))])
+    return cache
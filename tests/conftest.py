@@ -0,0 +1,54 @@
+import os
+import sys
+
+# The modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from maze_grid import TOP, RIGHT, BOTTOM, LEFT
+
+
+def _check_perfect(grid):
+    """Asserts that `grid` (anything with width, height, size and mask()) is a perfect maze.
+
+    Walls agree between neighbours, the border is closed, every cell is
+    reachable from cell 0 and there are exactly size - 1 passages (no loops).
+    """
+    width, height = grid.width, grid.height
+    passages = 0
+    for index in range(grid.size):
+        x, y = index % width, index // width
+        mask = grid.mask(index)
+        if x == width - 1:
+            assert mask & RIGHT, f"cell {(x, y)} is open to the right edge"
+        else:
+            assert bool(mask & RIGHT) == bool(grid.mask(index + 1) & LEFT), f"wall mismatch right of {(x, y)}"
+            passages += not mask & RIGHT
+        if y == height - 1:
+            assert mask & BOTTOM, f"cell {(x, y)} is open to the bottom edge"
+        else:
+            assert bool(mask & BOTTOM) == bool(grid.mask(index + width) & TOP), f"wall mismatch below {(x, y)}"
+            passages += not mask & BOTTOM
+        if x == 0:
+            assert mask & LEFT
+        if y == 0:
+            assert mask & TOP
+    assert passages == grid.size - 1
+
+    seen = {0}
+    stack = [0]
+    steps = ((TOP, -width), (RIGHT, 1), (BOTTOM, width), (LEFT, -1))
+    while stack:
+        cell = stack.pop()
+        mask = grid.mask(cell)
+        for bit, step in steps:
+            if not mask & bit and cell + step not in seen:
+                seen.add(cell + step)
+                stack.append(cell + step)
+    assert len(seen) == grid.size
+
+
+@pytest.fixture
+def check_perfect():
+    return _check_perfect
@@ -0,0 +1,60 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import batch_generate
+from batch_generate import derive_seed, run_batch
+from maze_file import load_maze
+
+
+def test_derive_seed_is_stable_and_distinct():
+    assert derive_seed(42, 0) == derive_seed(42, 0)
+    assert len({derive_seed(42, i) for i in range(100)}) == 100
+    assert derive_seed(42, 1) != derive_seed(43, 1)
+
+
+def test_output_is_identical_for_any_worker_count(tmp_path, check_perfect):
+    outputs = []
+    for workers in (1, 3):
+        out = tmp_path / f"w{workers}"
+        run_batch(12, 9, 7, 'kruskal', 5, str(out), workers)
+        outputs.append(out)
+    manifests = [(out / 'manifest.jsonl').read_bytes() for out in outputs]
+    assert manifests[0] == manifests[1]
+
+    entries = [json.loads(line) for line in manifests[0].splitlines()]
+    assert [entry['index'] for entry in entries] == list(range(12))
+    for entry in entries:
+        files = [(out / entry['file']).read_bytes() for out in outputs]
+        assert files[0] == files[1]
+        grid, header = load_maze(str(outputs[0] / entry['file']))
+        assert header.seed == entry['seed'] == derive_seed(5, entry['index'])
+        check_perfect(grid)
+
+
+def test_a_slow_first_maze_bounds_the_held_back_entries(tmp_path, monkeypatch):
+    real_generate_one = batch_generate.generate_one
+
+    def slow_first(index, *args):
+        if index == 0:
+            time.sleep(0.5)
+        return real_generate_one(index, *args)
+
+    # Threads, so the patched task is the one that runs
+    monkeypatch.setattr(batch_generate, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(batch_generate, 'generate_one', slow_first)
+    done = []
+    held_back = [] # Finished entries not yet written, after each completion
+
+    def on_done(entry):
+        done.append(entry['index'])
+        written = 0
+        while written in done:
+            written += 1
+        held_back.append(len(done) - written)
+
+    workers = 2
+    run_batch(40, 5, 5, 'dfs', 3, str(tmp_path), workers, on_done)
+    assert max(held_back) < workers * 4
+    entries = [json.loads(line) for line in (tmp_path / 'manifest.jsonl').read_text().splitlines()]
+    assert [entry['index'] for entry in entries] == list(range(40))
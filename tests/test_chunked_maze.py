@@ -0,0 +1,54 @@
+import pytest
+
+from chunked_maze import ChunkedMaze, SparseMasks
+
+
+@pytest.mark.parametrize('algorithm', ['dfs', 'kruskal', 'sidewinder'])
+@pytest.mark.parametrize('chunks', [(1, 1), (4, 1), (1, 3), (5, 4)])
+def test_world_is_one_perfect_maze(algorithm, chunks, check_perfect):
+    world = ChunkedMaze(7, *chunks, chunk_size=6, algorithm=algorithm)
+    check_perfect(world)
+
+
+def test_same_seed_same_world():
+    first = ChunkedMaze(3, 4, 4, chunk_size=8)
+    second = ChunkedMaze(3, 4, 4, chunk_size=8)
+    cells = range(0, first.size, 7)
+    assert [first.mask(i) for i in cells] == [second.mask(i) for i in cells]
+    assert [first.mask(i) for i in cells] != [ChunkedMaze(4, 4, 4, chunk_size=8).mask(i) for i in cells]
+
+
+def test_chunks_are_built_on_first_use():
+    world = ChunkedMaze(1, 1000, 1000, chunk_size=16)
+    assert world.chunks_generated == 0
+    world.mask(world.index(5000, 7000))
+    assert world.chunks_generated == 1
+    world.mask(world.index(5001, 7001)) # Same chunk
+    assert world.chunks_generated == 1
+
+
+def test_lru_evicts_the_least_recently_used_chunk():
+    world = ChunkedMaze(1, 10, 1, chunk_size=4, max_chunks=3)
+    for cx in range(3):
+        world.chunk(cx, 0)
+    world.chunk(0, 0) # Chunk 0 is now the most recent, so 1 goes first
+    world.chunk(3, 0)
+    assert list(world._chunks) == [(2, 0), (0, 0), (3, 0)]
+    assert world.chunks_generated == 4
+
+
+def test_evicted_chunks_are_rebuilt_identically():
+    world = ChunkedMaze(9, 10, 1, chunk_size=5, max_chunks=2)
+    before = bytes(world.chunk(0, 0))
+    for cx in range(1, 10):
+        world.chunk(cx, 0)
+    assert (0, 0) not in world._chunks
+    assert bytes(world.chunk(0, 0)) == before
+    assert world.chunks_generated == 11
+
+
+def test_sparse_masks_default_to_zero():
+    masks = SparseMasks()
+    masks[10] |= 4
+    assert masks[10] == 4 and masks[11] == 0
+    assert len(masks) == 1
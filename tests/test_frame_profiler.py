@@ -0,0 +1,107 @@
+import csv
+import json
+
+import pytest
+
+import frame_profiler
+from frame_profiler import TOTAL, FrameProfiler, percentile
+
+
+class FakeClock:
+    """Stands in for perf_counter_ns; `advance` moves it on by some milliseconds."""
+    def __init__(self):
+        self.now = 0
+    def __call__(self):
+        return self.now
+    def advance(self, ms):
+        self.now += int(ms * 1_000_000)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(frame_profiler, 'perf_counter_ns', clock)
+    return clock
+
+
+def run_frame(profiler, clock, phases):
+    profiler.start_frame()
+    for phase, ms in phases:
+        clock.advance(ms)
+        profiler.mark(phase)
+    profiler.end_frame()
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 1.0) == 100
+    assert percentile([7], 0.95) == 7
+    assert percentile([], 0.5) == 0
+
+
+def test_marks_charge_the_time_since_the_previous_mark(clock):
+    profiler = FrameProfiler()
+    run_frame(profiler, clock, [('input', 1), ('sim', 2), ('input', 0.5), ('draw', 4)])
+    row = profiler.trace[0]
+    assert row == {'input': 1_500_000, 'sim': 2_000_000, 'draw': 4_000_000, TOTAL: 7_500_000, 'frame': 0}
+    assert profiler.phases == ['input', 'sim', 'draw', TOTAL]
+
+
+def test_percentiles_cover_the_rolling_window_only(clock):
+    profiler = FrameProfiler(window=4)
+    for ms in (100, 100, 1, 2, 3, 4):
+        run_frame(profiler, clock, [('draw', ms)])
+    assert profiler.percentiles()['draw'] == (2.0, 4.0, 4.0)
+    assert len(profiler.trace) == 6
+
+
+def test_trace_keeps_the_latest_frames(clock):
+    profiler = FrameProfiler(max_trace_frames=3)
+    for _ in range(5):
+        run_frame(profiler, clock, [('draw', 1)])
+    assert [row['frame'] for row in profiler.trace] == [2, 3, 4]
+
+
+def test_dump_csv_and_json(tmp_path, clock):
+    profiler = FrameProfiler()
+    run_frame(profiler, clock, [('input', 1)])
+    run_frame(profiler, clock, [('input', 2), ('draw', 3)]) # A phase first seen in a later frame
+    profiler.dump(str(tmp_path / 'trace.csv'))
+    with open(tmp_path / 'trace.csv', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows == [['frame', 'input', TOTAL, 'draw'],
+                    ['0', '1000000', '1000000', '0'],
+                    ['1', '2000000', '5000000', '3000000']]
+
+    profiler.dump(str(tmp_path / 'trace.json'))
+    data = json.loads((tmp_path / 'trace.json').read_text())
+    assert data['columns'] == rows[0]
+    assert data['frames'] == [[int(v) for v in row] for row in rows[1:]]
+    assert data['percentiles_ms']['draw'] == [3.0, 3.0, 3.0]
+
+
+def test_overlay_is_re_rendered_only_after_the_refresh_interval(clock):
+    pygame = pytest.importorskip('pygame')
+    pygame.font.init()
+    font = pygame.font.Font(None, 20)
+    renders = []
+    real_render = font.render
+    class CountingFont:
+        def render(self, *args):
+            renders.append(args[0])
+            return real_render(*args)
+    profiler = FrameProfiler()
+    run_frame(profiler, clock, [('draw', 1)])
+    screen = pygame.Surface((400, 300))
+    rect = profiler.draw_overlay(screen, CountingFont(), (400, 0), refresh_ms=500)
+    assert rect.right == 400 and rect.top == 0
+    rendered = len(renders)
+    assert rendered == 1 + len(profiler.phases) # Header plus one line per phase
+    clock.advance(100)
+    profiler.draw_overlay(screen, CountingFont(), (400, 0), refresh_ms=500)
+    assert len(renders) == rendered
+    clock.advance(500)
+    profiler.draw_overlay(screen, CountingFont(), (400, 0), refresh_ms=500)
+    assert len(renders) == 2 * rendered
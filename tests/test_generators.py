@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from generators import GENERATORS, generate, get_generator, register
+from maze_grid import MazeGrid
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+@pytest.mark.parametrize('width, height', [(1, 1), (1, 9), (9, 1), (16, 16), (23, 17)])
+def test_generators_make_perfect_mazes(name, width, height, check_perfect):
+    grid = generate(name, width, height, seed=3)
+    check_perfect(grid)
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_same_seed_same_maze(name):
+    first = generate(name, 20, 15, rng=random.Random(42))
+    second = generate(name, 20, 15, rng=random.Random(42))
+    assert first.walls == second.walls
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_generators_carve_in_place_and_return_the_grid(name):
+    grid = MazeGrid(8, 8)
+    assert GENERATORS[name](grid, random.Random(1)) is grid
+
+
+def test_unknown_generator():
+    with pytest.raises(ValueError, match="unknown maze generator"):
+        get_generator('no-such-algorithm')
+
+
+def test_register_adds_a_generator():
+    def generate_corridor(grid, rng=random):
+        for index in range(grid.size - 1):
+            grid.carve(index, index + 1)
+        return grid
+    register('test-corridor', generate_corridor)
+    try:
+        assert generate('test-corridor', 5, 1).mask(2) == 1 | 4
+    finally:
+        del GENERATORS['test-corridor']
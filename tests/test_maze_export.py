@@ -0,0 +1,98 @@
+import re
+import struct
+import zlib
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from generators import generate
+from maze_export import export_png, export_svg
+from maze_file import open_maze, save_maze
+from maze_grid import TOP, RIGHT, BOTTOM, LEFT
+
+
+def naive_raster(grid, cell, wall):
+    """Wall pixels (True = wall) stamped cell by cell, wall by wall."""
+    img = np.zeros((grid.height * cell + wall, grid.width * cell + wall), dtype=bool)
+    for index in range(grid.size):
+        x, y = index % grid.width, index // grid.width
+        mask = grid.mask(index)
+        left, top = x * cell, y * cell
+        if mask & TOP:
+            img[top:top + wall, left:left + cell + wall] = True
+        if mask & BOTTOM:
+            img[top + cell:top + cell + wall, left:left + cell + wall] = True
+        if mask & LEFT:
+            img[top:top + cell + wall, left:left + wall] = True
+        if mask & RIGHT:
+            img[top:top + cell + wall, left + cell:left + cell + wall] = True
+    return img
+
+
+def read_png(path):
+    """Wall pixels of a 1-bit greyscale PNG written by export_png."""
+    data = open(path, 'rb').read()
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    pos, chunks = 8, {}
+    while pos < len(data):
+        length, = struct.unpack_from('>I', data, pos)
+        kind = data[pos + 4:pos + 8]
+        chunks[kind] = chunks.get(kind, b'') + data[pos + 8:pos + 8 + length]
+        pos += length + 12
+    width, height = struct.unpack_from('>II', chunks[b'IHDR'])
+    rows = np.frombuffer(zlib.decompress(chunks[b'IDAT']), dtype=np.uint8).reshape(height, -1)
+    assert not rows[:, 0].any() # Filter type: none
+    return ~np.unpackbits(rows[:, 1:], axis=1)[:, :width].astype(bool)
+
+
+@pytest.mark.parametrize('cell, wall', [(8, 2), (5, 3), (3, 1)])
+def test_png_matches_a_naive_raster_across_bands(tmp_path, cell, wall):
+    grid = generate('kruskal', 13, 11, seed=6)
+    path = tmp_path / 'maze.png'
+    export_png(grid, path, cell, wall, band_rows=4) # Bands end mid-maze, and the last is short
+    assert (read_png(path) == naive_raster(grid, cell, wall)).all()
+
+
+def test_png_from_a_memory_mapped_maze(tmp_path):
+    grid = generate('prim', 9, 7, seed=2)
+    save_maze(tmp_path / 'prim.maze', grid)
+    with open_maze(tmp_path / 'prim.maze') as mapped:
+        export_png(mapped.grid, tmp_path / 'prim.png', band_rows=3)
+    assert (read_png(tmp_path / 'prim.png') == naive_raster(grid, 8, 2)).all()
+
+
+def svg_segments(path):
+    """Unit wall segments ('h' or 'v', x, y) drawn by an SVG from export_svg, checking none is drawn twice."""
+    d = re.search(r' d="([^"]*)"', open(path).read()).group(1)
+    segments = []
+    x = y = 0
+    for command, a, b in re.findall(r'([MmhHvV])(-?\d+)(?: (-?\d+))?', d):
+        a = int(a)
+        if command == 'M':
+            x, y = a, int(b)
+        elif command == 'm':
+            x, y = x + a, y + int(b)
+        elif command == 'h':
+            segments += [('h', x + i, y) for i in range(a)]
+            x += a
+        elif command == 'v':
+            segments += [('v', x, y + i) for i in range(a)]
+            y += a
+    assert len(segments) == len(set(segments))
+    return set(segments)
+
+
+def test_svg_runs_cover_exactly_the_walls(tmp_path):
+    grid = generate('dfs', 14, 9, seed=3)
+    path = tmp_path / 'maze.svg'
+    export_svg(grid, path)
+    walls = set()
+    for index in range(grid.size):
+        x, y = index % grid.width, index // grid.width
+        mask = grid.mask(index)
+        if mask & TOP: walls.add(('h', x, y))
+        if mask & BOTTOM: walls.add(('h', x, y + 1))
+        if mask & LEFT: walls.add(('v', x, y))
+        if mask & RIGHT: walls.add(('v', x + 1, y))
+    assert svg_segments(path) == walls
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+import maze_file
+from generators import generate
+from maze_file import (HEADER, HEADER_SIZE, MAGIC, VERSION, MazeFormatError, PackedWalls,
+                       load_maze, open_maze, pack_walls, parse_header, save_maze, unpack_walls)
+
+
+@pytest.mark.parametrize('size', [0, 1, 2, 7, 100])
+def test_pack_unpack_round_trip(size):
+    walls = bytearray(random.Random(size).randrange(16) for _ in range(size))
+    packed = pack_walls(walls)
+    assert len(packed) == (size + 1) // 2
+    assert unpack_walls(packed, size) == walls
+
+
+def test_pack_layout_is_low_nibble_first():
+    assert pack_walls(bytes([0x1, 0x2, 0xF])) == bytes([0x21, 0x0F])
+
+
+def test_pack_without_numpy_matches(monkeypatch):
+    walls = bytearray(random.Random(1).randrange(16) for _ in range(3 * 1000 + 1))
+    expected = pack_walls(walls)
+    monkeypatch.setattr(maze_file, 'np', None)
+    monkeypatch.setattr(maze_file, 'PACK_BLOCK', 1000) # Several blocks, the last one partial
+    assert pack_walls(walls) == expected
+
+
+def test_save_and_load_round_trip(tmp_path):
+    grid = generate('kruskal', 21, 13, seed=5)
+    path = tmp_path / 'kruskal.maze'
+    save_maze(path, grid, 'kruskal', seed=5, start=(1, 2), end=(20, 0))
+    loaded, header = load_maze(path)
+    assert loaded.walls == grid.walls
+    assert header == (21, 13, (1, 2), (20, 0), 5, 'kruskal')
+
+
+def test_unseeded_maze_has_no_seed(tmp_path):
+    path = tmp_path / 'plain.maze'
+    save_maze(path, generate('dfs', 4, 4, seed=1))
+    assert load_maze(path)[1].seed is None
+
+
+def test_memory_mapped_grid_reads_and_writes(tmp_path, check_perfect):
+    grid = generate('prim', 9, 9, seed=2)
+    path = tmp_path / 'prim.maze'
+    save_maze(path, grid, 'prim', 2)
+    with open_maze(path) as mapped:
+        assert isinstance(mapped.grid.walls, PackedWalls)
+        assert [mapped.grid.mask(i) for i in range(grid.size)] == list(grid.walls)
+        check_perfect(mapped.grid)
+    with open_maze(path, writable=True) as mapped:
+        mapped.grid.set_mask(3, 0xF)
+        mapped.grid.set_mask(4, 0x0)
+    loaded, _ = load_maze(path)
+    assert loaded.mask(3) == 0xF and loaded.mask(4) == 0x0
+    assert loaded.walls[5:] == grid.walls[5:]
+
+
+def header(width=4, height=4, start=(0, 0), end=(3, 3), magic=MAGIC, version=VERSION, algorithm=b'dfs'):
+    return HEADER.pack(magic, version, 0, width, height, *start, *end, 0, algorithm) + bytes((width * height + 1) // 2)
+
+
+def test_parse_header_accepts_a_valid_header():
+    assert parse_header(header()).end == (3, 3)
+
+
+@pytest.mark.parametrize('data, message', [
+    (b'MAZE', "too short"),
+    (header(magic=b'NOPE'), "bad magic"),
+    (header(version=VERSION + 1), "version"),
+    (header()[:HEADER_SIZE + 3], "truncated"),
+    (header(start=(4, 0)), "outside"),
+    (header(end=(0, 4)), "outside"),
+    (header(algorithm=b'df\xe9'), "not ASCII"),
+])
+def test_parse_header_rejects_bad_files(data, message):
+    with pytest.raises(MazeFormatError, match=message):
+        parse_header(data)
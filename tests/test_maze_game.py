@@ -0,0 +1,51 @@
+from collections import deque
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+import maze_game
+from generators import generate
+from maze_file import open_maze, save_maze
+from maze_game import INPUT_QUEUE_SIZE, GoalDistance, buffer_tap
+from solver import solve
+
+
+def solved_moves(grid, start, goal):
+    path, _ = solve(grid, start, goal)
+    return len(path) - 1
+
+
+def test_goal_distance_matches_the_solver_with_a_field():
+    grid = generate('kruskal', 12, 9, seed=4)
+    goal = GoalDistance(grid, (11, 8))
+    assert goal.available
+    goal.field()
+    assert goal.optimal_moves((0, 0)) == solved_moves(grid, 0, grid.size - 1)
+
+
+def test_goal_distance_solves_memory_mapped_mazes(tmp_path):
+    grid = generate('kruskal', 12, 9, seed=4)
+    path = tmp_path / 'k.maze'
+    save_maze(path, grid, 'kruskal', 4)
+    with open_maze(path) as mapped:
+        goal = GoalDistance(mapped.grid, (11, 8))
+        assert not goal.available
+        assert goal.optimal_moves((0, 0)) == solved_moves(grid, 0, grid.size - 1)
+        assert not goal.computed
+
+
+def test_goal_distance_solves_mazes_too_big_for_a_field(monkeypatch):
+    monkeypatch.setattr(maze_game, 'MAX_FIELD_CELLS', 50)
+    grid = generate('prim', 10, 10, seed=8)
+    goal = GoalDistance(grid, (9, 9))
+    assert not goal.available
+    assert goal.optimal_moves((3, 2)) == solved_moves(grid, grid.index(3, 2), grid.size - 1)
+
+
+def test_taps_beyond_the_queue_size_are_dropped():
+    taps = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP, pygame.K_RIGHT, pygame.K_DOWN]
+    input_queue = deque()
+    for key in taps: # All during one move, so none is consumed
+        buffer_tap(input_queue, key)
+    assert list(input_queue) == taps[:INPUT_QUEUE_SIZE]
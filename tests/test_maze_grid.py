@@ -0,0 +1,68 @@
+import pytest
+
+from maze_grid import MazeGrid, VisitedSet, ALL_WALLS, TOP, RIGHT, BOTTOM, LEFT
+
+
+def test_new_grid_has_every_wall():
+    grid = MazeGrid(5, 3)
+    assert grid.size == 15
+    assert bytes(grid.walls) == bytes([ALL_WALLS]) * 15
+
+
+def test_index_and_coords_round_trip():
+    grid = MazeGrid(7, 4)
+    for y in range(4):
+        for x in range(7):
+            assert grid.coords(grid.index(x, y)) == (x, y)
+
+
+@pytest.mark.parametrize('offset, bit, other_bit', [(1, RIGHT, LEFT), (-1, LEFT, RIGHT), (5, BOTTOM, TOP), (-5, TOP, BOTTOM)])
+def test_carve_clears_both_sides_of_a_wall(offset, bit, other_bit):
+    grid = MazeGrid(5, 5)
+    a = grid.index(2, 2)
+    grid.carve(a, a + offset)
+    assert grid.mask(a) == ALL_WALLS ^ bit
+    assert grid.mask(a + offset) == ALL_WALLS ^ other_bit
+    assert grid.open_neighbors(a) == [a + offset]
+
+
+def test_carve_rejects_cells_that_are_not_adjacent():
+    grid = MazeGrid(5, 5)
+    with pytest.raises(ValueError):
+        grid.carve(0, 2)
+
+
+def test_neighbors_stay_in_bounds():
+    grid = MazeGrid(3, 3)
+    assert grid.neighbors(0) == [(1, RIGHT), (3, BOTTOM)]
+    assert grid.neighbors(8) == [(5, TOP), (7, LEFT)]
+    assert len(grid.neighbors(4)) == 4
+
+
+def test_cell_views_read_and_write_the_masks():
+    grid = MazeGrid(4, 4)
+    cell = grid[1][2]
+    assert (cell.x, cell.y) == (1, 2)
+    cell.walls['left'] = False
+    assert grid.mask(grid.index(1, 2)) == ALL_WALLS ^ LEFT
+    assert dict(cell.walls) == {'top': True, 'right': True, 'bottom': True, 'left': False}
+    cell.visited = True
+    assert grid.index(1, 2) in grid.visited
+
+
+def test_reset_restores_walls_and_clears_visited():
+    grid = MazeGrid(4, 4)
+    grid.carve(0, 1)
+    grid.visited.add(3)
+    grid.reset()
+    assert bytes(grid.walls) == bytes([ALL_WALLS]) * 16
+    assert 3 not in grid.visited
+
+
+def test_visited_set():
+    visited = VisitedSet(20)
+    visited.add(0)
+    visited.add(19)
+    assert 0 in visited and 19 in visited and 10 not in visited
+    visited.discard(19)
+    assert 19 not in visited
@@ -0,0 +1,40 @@
+import random
+import time
+
+from batch_generate import derive_seed
+from generators import generate
+from maze_pregen import MazePregenerator
+
+
+def test_nothing_starts_before_the_first_maze_is_asked_for():
+    pregen = MazePregenerator(8, 6, seed=5)
+    assert pregen._pool is None
+    pregen.close()
+
+
+def test_mazes_follow_the_derived_seeds():
+    with MazePregenerator(9, 7, algorithm='prim', seed=42) as pregen:
+        for n in (1, 2, 3):
+            grid, seed = pregen.next()
+            assert seed == derive_seed(42, n)
+            assert grid.walls == generate('prim', 9, 7, rng=random.Random(seed)).walls
+
+
+def test_ready_starts_generation_and_turns_true():
+    with MazePregenerator(5, 5, seed=1) as pregen:
+        deadline = time.monotonic() + 30
+        while not pregen.ready():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        grid, _ = pregen.next()
+        assert grid.size == 25
+
+
+def test_close_stops_a_worker_mid_maze():
+    pregen = MazePregenerator(2000, 2000, depth=1, seed=3)
+    assert not pregen.ready()
+    processes = list(pregen._pool._processes.values())
+    started = time.monotonic()
+    pregen.close()
+    assert time.monotonic() - started < 5
+    assert not any(process.is_alive() for process in processes)
@@ -0,0 +1,95 @@
+import pytest
+
+import midi_events
+from midi_events import EventBuffer, Schedule, _vlq, assemble_smf, bpm2tempo
+
+END_OF_TRACK = bytes((0x00, 0xFF, 0x2F, 0x00))
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def serializer(request, monkeypatch):
+    """Runs a test with the NumPy serializer and again with the pure-Python fallback."""
+    if request.param == 'numpy':
+        if midi_events.np is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setattr(midi_events, 'np', None)
+        monkeypatch.setattr(midi_events, '_ORDER', bytes(midi_events._ORDER))
+        monkeypatch.setattr(midi_events, '_DATA_BYTES', bytes(midi_events._DATA_BYTES))
+    return request.param
+
+
+@pytest.mark.parametrize('value, encoded', [
+    (0, b'\x00'), (0x40, b'\x40'), (0x7F, b'\x7F'), (0x80, b'\x81\x00'), (0x2000, b'\xC0\x00'),
+    (0x3FFF, b'\xFF\x7F'), (0x4000, b'\x81\x80\x00'), (0x1FFFFF, b'\xFF\xFF\x7F'),
+    (0x200000, b'\x81\x80\x80\x00'), (0x0FFFFFFF, b'\xFF\xFF\xFF\x7F'),
+])
+def test_vlq(value, encoded, serializer):
+    assert _vlq(value) == encoded
+    track = EventBuffer()
+    track.note_on(value, 0, 60, 100) # The delta from the start of the track is the tick itself
+    assert track.track_bytes() == encoded + bytes((0x90, 60, 100)) + END_OF_TRACK
+
+
+def test_note_and_program_bytes(serializer):
+    track = EventBuffer()
+    track.program_change(0, 2, 73)
+    track.add_note(0, 2, 67, 85, 480)
+    assert track.track_bytes() == bytes((
+        0x00, 0xC2, 73,
+        0x00, 0x92, 67, 85,
+        0x83, 0x60, 0x82, 67, 0,
+    )) + END_OF_TRACK
+
+
+def test_events_are_sorted_with_note_offs_first(serializer):
+    track = EventBuffer()
+    track.add_note(480, 0, 60, 90, 480) # Added out of order
+    track.add_note(0, 0, 60, 80, 480) # Ends on the tick where the other starts
+    assert track.track_bytes() == bytes((
+        0x00, 0x90, 60, 80,
+        0x83, 0x60, 0x80, 60, 0, # The release comes before the retrigger
+        0x00, 0x90, 60, 90,
+        0x83, 0x60, 0x80, 60, 0,
+    )) + END_OF_TRACK
+
+
+def test_meta_events_are_spliced_in(serializer):
+    track = EventBuffer()
+    track.note_on(10, 0, 60, 100)
+    track.set_tempo(0, bpm2tempo(120))
+    track.time_signature(0, 3, 8)
+    assert track.track_bytes() == bytes((
+        0x00, 0xFF, 0x51, 0x03, 0x07, 0xA1, 0x20,
+        0x00, 0xFF, 0x58, 0x04, 3, 3, 24, 8,
+        0x0A, 0x90, 60, 100,
+    )) + END_OF_TRACK
+
+
+def test_delta_too_large(serializer):
+    track = EventBuffer()
+    track.note_on(1 << 28, 0, 60, 100)
+    with pytest.raises(ValueError, match="too large"):
+        track.track_bytes()
+
+
+def test_negative_tick():
+    with pytest.raises(ValueError):
+        EventBuffer().note_on(-1, 0, 60, 100)
+
+
+def test_smf_header_and_chunks():
+    data = assemble_smf([b'\x00\xFF\x2F\x00', b'ab'], 96)
+    assert data == (b'MThd\x00\x00\x00\x06\x00\x01\x00\x02\x00\x60'
+                    b'MTrk\x00\x00\x00\x04\x00\xFF\x2F\x00'
+                    b'MTrk\x00\x00\x00\x02ab')
+
+
+def test_schedule_writes_beats_as_ticks(serializer):
+    schedule = Schedule(bpm=100, ticks_per_beat=480)
+    lead = schedule.part('lead', 1, program=81)
+    lead.note(1.5, 0.25, 72, 90)
+    assert schedule.part('lead', 1) is lead
+    data = schedule.smf_bytes()
+    assert data.startswith(b'MThd\x00\x00\x00\x06\x00\x01\x00\x02\x01\xE0')
+    assert bytes((0x00, 0xC1, 81, 0x85, 0x50, 0x91, 72, 90, 0x78, 0x81, 72, 0)) + END_OF_TRACK in data
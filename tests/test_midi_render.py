@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import create_midi
+import moving_sound
+from midi_events import Schedule
+from midi_render import VOICES, read_notes, render_midi
+from soundtrack import Soundtrack, render
+
+
+def test_every_soundtrack_program_has_a_voice():
+    programs = {spec.program for spec in moving_sound.PARTS + create_midi.PARTS if spec.program is not None}
+    assert programs <= VOICES.keys()
+
+
+def test_read_notes_follows_the_tempo():
+    schedule = Schedule(bpm=120, ticks_per_beat=480)
+    lead = schedule.part('lead', 1, program=81)
+    lead.note(0, 1, 60, 100)
+    lead.note(2, 0.5, 64, 50)
+    schedule.part('drums', 9).note(1, 0.5, 36, 110)
+    notes = read_notes(schedule.smf_bytes())
+    order = np.argsort(notes.start)
+    assert notes.start[order].tolist() == [0.0, 0.5, 1.0]
+    assert notes.end[order].tolist() == [0.5, 0.75, 1.25]
+    assert notes.note[order].tolist() == [60, 36, 64]
+    assert notes.program[order].tolist() == [81, 0, 81]
+    assert notes.velocity[order].tolist() == [100, 110, 50]
+
+
+def test_read_notes_matches_the_composed_parts():
+    data = render(Soundtrack(create_midi.PARTS, create_midi.STRUCTURE._replace(bars=4), 1, create_midi.tempo))
+    notes = read_notes(data)
+    assert (notes.end > notes.start).all()
+    assert set(notes.channel.tolist()) == {spec.channel for spec in create_midi.PARTS}
+
+
+def test_render_is_normalized_16_bit_pcm():
+    schedule = Schedule(bpm=120)
+    schedule.part('bass', 0, program=38).note(0, 1, 40, 100)
+    pcm = render_midi(schedule.smf_bytes(), rate=8000)
+    assert pcm.dtype == np.int16
+    assert 0.5 * 8000 <= len(pcm) <= 1.0 * 8000
+    assert 0.8 * 32767 < np.abs(pcm).max() <= 32767
@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from generators import generate
+from maze_grid import TOP, RIGHT, BOTTOM, LEFT
+from replay import (HEADER_SIZE, MOVE_SPEED, MOVE_TICKS, TICK_RATE, ReplayError, ReplayRecorder,
+                    compute_score, decode_replay, encode_replay, save_replay, simulate)
+from solver import solve
+from verify_replays import MAX_SIDE, verify_file
+
+SEED = 11
+WIDTH, HEIGHT = 15, 10
+
+
+def solved_replay(detour=False, gap=MOVE_TICKS):
+    """A recorded walk to the goal along the shortest path, one move every `gap` ticks."""
+    grid = generate('dfs', WIDTH, HEIGHT, rng=random.Random(SEED))
+    path, _ = solve(grid, 0, grid.size - 1)
+    cells = list(path)
+    if detour: # Step back and forth once: two extra moves, both onto visited cells
+        cells[1:1] = [cells[1], cells[0]]
+    bits = {1: RIGHT, -1: LEFT, WIDTH: BOTTOM, -WIDTH: TOP}
+    recorder = ReplayRecorder('dfs', SEED, WIDTH, HEIGHT, (0, 0), (WIDTH - 1, HEIGHT - 1))
+    tick = 1
+    for a, b in zip(cells, cells[1:]):
+        recorder.record(tick, bits[b - a])
+        tick += gap
+    return grid, recorder, len(path) - 1
+
+
+def test_move_ticks_follow_move_speed():
+    assert MOVE_TICKS == round(MOVE_SPEED * TICK_RATE)
+    assert MOVE_TICKS / TICK_RATE == pytest.approx(MOVE_SPEED)
+
+
+def test_encode_decode_round_trip():
+    _, recorder, _ = solved_replay(gap=300) # Multi-byte varints too
+    replay = recorder.replay(1234)
+    assert decode_replay(encode_replay(replay)) == replay
+
+
+def test_decode_rejects_bad_data():
+    data = encode_replay(solved_replay()[1].replay())
+    with pytest.raises(ReplayError, match="bad magic"):
+        decode_replay(b'XXXX' + data[4:])
+    with pytest.raises(ReplayError, match="truncated"):
+        decode_replay(data[:-1])
+    with pytest.raises(ReplayError, match="too short"):
+        decode_replay(data[:10])
+
+
+def test_decode_rejects_malformed_moves_and_names():
+    replay = solved_replay()[1].replay()
+    data = encode_replay(replay._replace(moves=replay.moves[:1]))
+    header = data[:HEADER_SIZE]
+    with pytest.raises(ReplayError, match="out of range"):
+        decode_replay(header + b'\xff' * 9 + b'\x7f')
+    with pytest.raises(ReplayError, match="too long"):
+        decode_replay(header + b'\xff' * 10 + b'\x01')
+    name = HEADER_SIZE - 28 # The 16-byte algorithm field sits before the last five fields
+    with pytest.raises(ReplayError, match="not ASCII"):
+        decode_replay(data[:name] + b'\xe9' + data[name + 1:])
+
+
+def test_simulate_scores_like_the_game():
+    grid, recorder, optimal = solved_replay(detour=True)
+    result = simulate(grid, recorder.replay(), optimal)
+    assert result.valid
+    assert result.move_count == optimal + 2
+    assert result.backtrack_count == 2
+    assert result.score == compute_score(result.final_ticks, TICK_RATE, optimal + 2, optimal, 2)
+
+
+def test_simulate_rejects_moves_that_break_the_rules():
+    grid, recorder, optimal = solved_replay(gap=MOVE_TICKS - 1)
+    assert "before the previous move finished" in simulate(grid, recorder.replay(), optimal).reason
+
+    grid, recorder, optimal = solved_replay()
+    wall = next(bit for bit in (TOP, RIGHT, BOTTOM, LEFT) if grid.mask(0) & bit)
+    recorder.moves[0] = (1 << 2) | (TOP, RIGHT, BOTTOM, LEFT).index(wall)
+    assert "walks into a wall" in simulate(grid, recorder.replay(), optimal).reason
+
+
+def test_verify_file_round_trip(tmp_path):
+    grid, recorder, optimal = solved_replay(detour=True)
+    score = simulate(grid, recorder.replay(), optimal).score
+    good = tmp_path / 'good.replay'
+    recorder.save(good, score)
+    entry = verify_file(str(good))
+    assert entry['valid'], entry
+    assert entry['score'] == score
+
+    cheat = tmp_path / 'cheat.replay'
+    recorder.save(cheat, score + 1)
+    entry = verify_file(str(cheat))
+    assert not entry['valid']
+    assert "claimed score" in entry['reason']
+
+
+def test_verify_file_rejects_other_timing_rules(tmp_path):
+    _, recorder, _ = solved_replay()
+    path = tmp_path / 'old.replay'
+    save_replay(path, recorder.replay()._replace(tick_rate=120, move_ticks=15))
+    entry = verify_file(str(path))
+    assert not entry['valid']
+    assert "timing rules differ" in entry['reason']
+
+
+def test_verify_file_rejects_oversized_mazes(tmp_path):
+    _, recorder, _ = solved_replay()
+    path = tmp_path / 'huge.replay'
+    save_replay(path, recorder.replay()._replace(width=MAX_SIDE + 1))
+    entry = verify_file(str(path))
+    assert not entry['valid']
+    assert "verification allows up to" in entry['reason']
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from generators import generate
+from maze_grid import MazeGrid
+from solver import SOLVERS, best_step, distance_field, solve
+
+
+def is_path(grid, path, start, goal):
+    if path[0] != start or path[-1] != goal:
+        return False
+    return all(b in grid.open_neighbors(a) for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize('algorithm', ['dfs', 'kruskal', 'sidewinder', 'division'])
+@pytest.mark.parametrize('seed', range(3))
+def test_solvers_agree_on_the_shortest_path(algorithm, seed):
+    grid = generate(algorithm, 31, 23, seed=seed)
+    rng = random.Random(seed)
+    for _ in range(5):
+        start, goal = rng.randrange(grid.size), rng.randrange(grid.size)
+        lengths = {}
+        for name, solver in SOLVERS.items():
+            path, stats = solver(grid, start, goal)
+            assert is_path(grid, list(path), start, goal), name
+            lengths[name] = len(path)
+        assert len(set(lengths.values())) == 1, lengths
+        assert distance_field(grid, goal)[start] == lengths['bfs'] - 1
+
+
+@pytest.mark.parametrize('name', sorted(SOLVERS))
+def test_start_is_goal(name):
+    grid = generate('dfs', 5, 5, seed=1)
+    path, _ = SOLVERS[name](grid, 12, 12)
+    assert list(path) == [12]
+
+
+@pytest.mark.parametrize('name', sorted(SOLVERS))
+def test_unreachable_goal(name):
+    grid = MazeGrid(3, 3) # Every wall up
+    path, _ = SOLVERS[name](grid, 0, 8)
+    assert not path
+
+
+def test_solve_defaults_to_bidirectional():
+    grid = generate('prim', 12, 12, seed=4)
+    _, stats = solve(grid, 0, grid.size - 1)
+    assert stats.algorithm == 'bidirectional'
+    assert solve(grid, 0, grid.size - 1, 'astar')[1].algorithm == 'astar'
+    with pytest.raises(ValueError, match="unknown solver"):
+        solve(grid, 0, 1, 'dijkstra')
+
+
+def test_best_step_walks_the_distance_field_to_the_goal():
+    grid = generate('wilson', 15, 15, seed=2)
+    goal = grid.size - 1
+    dist = distance_field(grid, goal)
+    cell, steps = 0, 0
+    while cell != goal:
+        cell = best_step(grid, dist, cell)
+        steps += 1
+    assert steps == dist[0]
+    assert best_step(grid, dist, goal) == -1
@@ -0,0 +1,30 @@
+import create_midi
+import moving_sound
+from soundtrack import Soundtrack, Structure, part_seed, render, render_many
+
+
+def test_both_styles_share_one_structure_type():
+    assert type(moving_sound.STRUCTURE) is Structure
+    assert type(create_midi.STRUCTURE) is Structure
+
+
+def test_part_seeds_depend_on_seed_and_name():
+    assert part_seed(1, 'bass') == part_seed(1, 'bass')
+    assert part_seed(1, 'bass') != part_seed(1, 'lead')
+    assert part_seed(1, 'bass') != part_seed(2, 'bass')
+
+
+def test_pool_output_matches_serial_output():
+    soundtracks = [Soundtrack(create_midi.PARTS, create_midi.STRUCTURE._replace(bars=8), seed, create_midi.tempo)
+                   for seed in (1, 2, 3)]
+    serial = [render(s) for s in soundtracks]
+    assert list(render_many(soundtracks, workers=1)) == serial
+    assert list(render_many(soundtracks, workers=2, chunksize=1)) == serial
+    assert serial[0] != serial[1] # The arp and bass follow the seed
+
+
+def test_smf_has_a_conductor_and_one_track_per_part():
+    data = render(Soundtrack(moving_sound.PARTS, moving_sound.STRUCTURE, 5, moving_sound.TEMPO))
+    assert data[:4] == b'MThd'
+    assert int.from_bytes(data[10:12], 'big') == len(moving_sound.PARTS) + 1
+    assert data.count(b'MTrk') == len(moving_sound.PARTS) + 1
@@ -0,0 +1,89 @@
+import pytest
+
+from soundtrack_variants import (cache_key, check_pitches, check_progression, generate_variants, load_manifest,
+                                 main, variant_params)
+
+
+def test_params_fill_in_style_defaults_and_source_hash():
+    params = variant_params('retro', 7)
+    assert params['tempo'] == 120.0 and params['bars'] == 64
+    assert len(params['source']) == 32
+    assert params['source'] != variant_params('dark_fantasy', 7)['source']
+
+
+def test_cache_key_covers_every_parameter():
+    base = variant_params('dark_fantasy', 7)
+    assert cache_key(base) == cache_key(dict(reversed(base.items())))
+    for name, value in [('seed', 8), ('tempo', 90.0), ('bars', 8), ('source', '0' * 32)]:
+        assert cache_key(dict(base, **{name: value})) != cache_key(base)
+
+
+@pytest.mark.parametrize('style, progression', [
+    ('retro', [{'bass': 36, 'arp': [60, 63, 67], 'pad': [60, 63, 67, 70]}]),
+    ('dark_fantasy', [[48, 51, 55], [43]]),
+])
+def test_progressions_in_the_style_format(style, progression):
+    check_progression(style, progression)
+    assert variant_params(style, 1, progression=progression)['progression'] == progression
+
+
+@pytest.mark.parametrize('style, progression', [
+    ('retro', [[48, 51, 55]]),
+    ('retro', [{'bass': 36, 'arp': [60]}]),
+    ('dark_fantasy', [{'bass': 36, 'arp': [60], 'pad': [60]}]),
+    ('dark_fantasy', []),
+    ('dark_fantasy', [[48, 200]]),
+])
+def test_progressions_of_the_wrong_shape(style, progression):
+    with pytest.raises(ValueError, match="does not match"):
+        variant_params(style, 1, progression=progression)
+
+
+@pytest.mark.parametrize('style, progression', [
+    ('retro', [{'bass': 36, 'arp': [60, 116], 'pad': [60]}]), # Arp plays an octave up
+    ('retro', [{'bass': 36, 'arp': [60], 'pad': [128]}]),
+])
+def test_progressions_out_of_the_style_range(style, progression):
+    with pytest.raises(ValueError, match="with notes in"):
+        check_progression(style, progression)
+
+
+def test_progression_notes_at_the_range_edges():
+    check_progression('retro', [{'bass': 0, 'arp': [115], 'pad': [127]}])
+
+
+@pytest.mark.parametrize('style, pitches', [
+    ('retro', [60, 62, 63, 65, 67, 68, 116]), # Texture plays pitches an octave up
+    ('retro', [60, 11, 63, 65, 67, 68, 70]), # Counter-melody an octave down
+    ('dark_fantasy', [11, 45, 46, 48]), # Bass doubles an octave down
+    ('dark_fantasy', [43, 45, 46, 300]),
+])
+def test_pitches_out_of_the_style_range(style, pitches):
+    with pytest.raises(ValueError, match="needs pitches in"):
+        variant_params(style, 1, pitches=pitches)
+
+
+def test_too_few_pitches():
+    with pytest.raises(ValueError, match="at least 7 pitches"):
+        check_pitches('retro', [60, 62, 63, 65, 67])
+
+
+def test_command_line_rejects_out_of_range_pitches(monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr('sys.argv', ['soundtrack_variants.py', '--styles', 'retro', '--seeds', '1',
+                                     '--pitches', '120,121,122,123,124,125,126', '--out', str(tmp_path)])
+    with pytest.raises(SystemExit):
+        main()
+    assert "needs pitches in 12..115" in capsys.readouterr().err
+
+
+def test_variants_are_generated_once(tmp_path):
+    param_sets = [variant_params('dark_fantasy', seed, bars=4) for seed in (1, 2, 1)]
+    entries, generated = generate_variants(param_sets, str(tmp_path), workers=1)
+    assert generated == 2
+    assert entries[0] is entries[2]
+    assert (tmp_path / entries[0]['file']).read_bytes().startswith(b'MThd')
+
+    entries_again, generated = generate_variants(param_sets, str(tmp_path), workers=1)
+    assert generated == 0
+    assert [e['key'] for e in entries_again] == [e['key'] for e in entries]
+    assert set(load_manifest(str(tmp_path))) == {e['key'] for e in entries}
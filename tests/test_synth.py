@@ -0,0 +1,108 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from synth import (SAMPLE_RATE, Chord, SynthCache, Tone, adsr, highpass, lowpass, move_blip, note_freq, oscillator,
+                   render, victory_jingle)
+
+RATE = 8000
+
+
+def peak_freq(samples, rate=RATE):
+    spectrum = np.abs(np.fft.rfft(samples))
+    return np.argmax(spectrum) * rate / len(samples)
+
+
+def test_note_freq():
+    assert note_freq(69) == 440.0
+    assert note_freq(81) == pytest.approx(880.0)
+    assert note_freq(60) == pytest.approx(261.626, abs=1e-3)
+
+
+@pytest.mark.parametrize('wave', ['sine', 'square', 'saw', 'triangle'])
+def test_oscillators_play_their_frequency_in_range(wave):
+    out = oscillator(wave, 250, 1.0, RATE)
+    assert out.dtype == np.float32 and len(out) == RATE
+    assert out.min() >= -1.0 and out.max() <= 1.0
+    assert peak_freq(out) == pytest.approx(250, abs=1)
+
+
+def test_noise_is_repeatable_and_unknown_waves_fail():
+    assert (oscillator('noise', 0, 0.1, RATE) == oscillator('noise', 0, 0.1, RATE)).all()
+    with pytest.raises(ValueError, match="unknown waveform"):
+        oscillator('organ', 440, 0.1, RATE)
+
+
+def test_sweep_glides_without_phase_jumps():
+    out = oscillator('sine', 200, 1.0, RATE, end_freq=800)
+    assert peak_freq(out[:RATE // 10]) == pytest.approx(200, rel=0.15)
+    assert peak_freq(out[-RATE // 10:]) == pytest.approx(800, rel=0.15)
+    # At most one step of the fastest frequency between samples
+    assert np.abs(np.diff(out)).max() <= 2 * np.pi * 800 / RATE + 1e-3
+
+
+def test_adsr_shape():
+    env = adsr(1000, attack=0.01, decay=0.02, sustain=0.5, release=0.03, rate=10000)
+    assert len(env) == 1000
+    assert env[0] == 0.0
+    assert env[99] == pytest.approx(0.99) and env[100] == 1.0 # Attack peaks after 100 samples
+    assert env[300:700] == pytest.approx(np.full(400, 0.5)) # Decayed to the sustain level
+    assert env[-1] == 0.0 and env[699] == 0.5 # Released over the last 300 samples
+
+
+def test_adsr_longer_than_the_sound():
+    env = adsr(50, attack=0.01, decay=0.01, sustain=0.5, release=0.01, rate=10000)
+    assert len(env) == 50 and env[0] == 0.0 and env[-1] == 0.0
+
+
+def test_filters_split_low_from_high():
+    low = oscillator('sine', 100, 1.0, RATE)
+    high = oscillator('sine', 3000, 1.0, RATE)
+    middle = slice(100, -100) # Away from the convolution edges
+    passed = lowpass(low + high, 1000, RATE)
+    assert np.abs(passed - low)[middle].max() < 0.05
+    stopped = highpass(low + high, 1000, RATE)
+    assert np.abs(stopped - high)[middle].max() < 0.05
+
+
+def test_render_tone_is_enveloped_and_clipped():
+    out = render(Tone('square', 300, 0.2, gain=3.0), RATE)
+    assert len(out) == int(0.2 * RATE)
+    assert out.max() == 1.0 and out.min() == -1.0
+    assert out[0] == 0.0
+
+
+def test_render_chord_places_each_tone_at_its_start():
+    chord = Chord((Tone('sine', 200, 0.1, gain=0.2), Tone('sine', 400, 0.1, gain=0.2, start=0.25)))
+    out = render(chord, RATE)
+    assert len(out) == int(0.35 * RATE)
+    assert not out[int(0.1 * RATE):int(0.25 * RATE)].any() # Silence between the two notes
+    assert peak_freq(out[int(0.25 * RATE):]) == pytest.approx(400, rel=0.1)
+
+
+def test_recipes_render_in_range():
+    for recipe in (move_blip(-2), move_blip(2), victory_jingle(67, (0, 4, 7, 11, 12))):
+        out = render(recipe)
+        assert out.dtype == np.float32 and len(out) > 0
+        assert np.abs(out).max() <= 1.0
+    assert len(render(victory_jingle())) == int((3 * 0.12 + 3 * 0.12) * SAMPLE_RATE)
+    assert move_blip(1) != move_blip(0) and move_blip(0) == move_blip(0) # Hashable recipes, one per pitch
+
+
+def test_synth_cache_writes_the_samples_into_the_sound(monkeypatch):
+    pygame = pytest.importorskip('pygame')
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+    try:
+        pygame.mixer.init(22050, -16, 2)
+    except pygame.error as e:
+        pytest.skip(f"no mixer: {e}")
+    try:
+        cache = SynthCache()
+        sound = cache.sound(move_blip())
+        assert cache.sound(move_blip()) is sound and cache.synthesized == 1
+        expected = (render(move_blip(), cache.rate) * 32767.0).astype(np.int16)
+        samples = pygame.sndarray.array(sound)
+        assert samples.shape == (len(expected), 2)
+        assert (samples[:, 0] == expected).all() and (samples[:, 1] == expected).all()
+    finally:
+        pygame.mixer.quit()
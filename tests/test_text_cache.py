@@ -0,0 +1,53 @@
+from text_cache import TextCache
+
+
+class FakeFont:
+    """Records render calls and returns a fresh object for each."""
+    def __init__(self):
+        self.calls = []
+    def render(self, text, antialias, color):
+        self.calls.append((text, antialias, color))
+        return object()
+
+
+def test_each_label_is_rendered_once():
+    hud, win = FakeFont(), FakeFont()
+    cache = TextCache({'hud': hud, 'win': win})
+    first = cache.render('hud', "Moves: 3", (255, 255, 255))
+    assert cache.render('hud', "Moves: 3", (255, 255, 255)) is first
+    assert hud.calls == [("Moves: 3", True, (255, 255, 255))]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_font_colour_and_antialias_are_part_of_the_key():
+    hud, win = FakeFont(), FakeFont()
+    cache = TextCache({'hud': hud, 'win': win})
+    cache.render('hud', "You Win!", (255, 215, 0))
+    cache.render('win', "You Win!", (255, 215, 0))
+    cache.render('hud', "You Win!", (255, 255, 255))
+    cache.render('hud', "You Win!", (255, 215, 0), antialias=False)
+    assert len(hud.calls) == 3 and len(win.calls) == 1
+    assert cache.misses == 4 and cache.hits == 0
+
+
+def test_least_recently_used_label_is_evicted():
+    font = FakeFont()
+    cache = TextCache({'hud': font}, max_entries=2)
+    white = (255, 255, 255)
+    cache.render('hud', "a", white)
+    cache.render('hud', "b", white)
+    cache.render('hud', "a", white) # "b" is now the least recently used
+    cache.render('hud', "c", white)
+    cache.render('hud', "a", white)
+    assert [text for text, _, _ in font.calls] == ["a", "b", "c"]
+    cache.render('hud', "b", white)
+    assert [text for text, _, _ in font.calls] == ["a", "b", "c", "b"]
+
+
+def test_clear_forces_a_re_render():
+    font = FakeFont()
+    cache = TextCache({'hud': font})
+    cache.render('hud', "Time: 1s", (0, 0, 0))
+    cache.clear()
+    cache.render('hud', "Time: 1s", (0, 0, 0))
+    assert len(font.calls) == 2
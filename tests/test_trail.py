@@ -0,0 +1,46 @@
+from maze_grid import MazeGrid, RIGHT, LEFT
+from trail import Trail
+
+
+def walk_back_and_forth(trail, steps, span):
+    cell = 0
+    for i in range(steps):
+        cell += 1 if (i // span) % 2 == 0 else -1
+        trail.add(cell)
+
+
+def test_uncapped_trail_keeps_every_cell():
+    grid = MazeGrid(100, 1)
+    trail = Trail(grid, 0)
+    walk_back_and_forth(trail, 500, 99)
+    assert len(trail) == 500
+    assert len(trail.cells) == 501
+
+
+def test_capped_trail_compacts_its_cells():
+    grid = MazeGrid(1000, 1)
+    trail = Trail(grid, 0, max_segments=50)
+    walk_back_and_forth(trail, 100_000, 999)
+    assert len(trail) == 50
+    assert len(trail.cells) <= 2 * 50 + 2 # The dead prefix never outgrows the live part
+
+
+def test_decayed_segments_clear_their_edges():
+    grid = MazeGrid(10, 1)
+    trail = Trail(grid, 0, max_segments=2)
+    assert trail.add(1) == []
+    assert trail.add(2) == []
+    assert trail.add(3) == [(0, 1)]
+    assert trail.edges[0] == 0
+    assert trail.edges[1] == RIGHT
+    assert trail.edges[2] == LEFT | RIGHT
+    assert trail.edges[3] == LEFT
+
+
+def test_edge_still_used_by_a_live_segment_stays():
+    grid = MazeGrid(10, 1)
+    trail = Trail(grid, 0, max_segments=2)
+    trail.add(1)
+    trail.add(0) # Walks the 0-1 edge again
+    assert trail.add(1) == [] # The oldest 0-1 segment decays, but a newer one still crosses it
+    assert trail.edges[0] == RIGHT
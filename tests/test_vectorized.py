@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from generators.vectorized import generate_binary_tree_np, generate_sidewinder_np
+from maze_file import open_maze, save_maze
+from maze_grid import MazeGrid
+
+
+@pytest.mark.parametrize('func', [generate_binary_tree_np, generate_sidewinder_np])
+def test_numpy_generators_accept_a_numpy_rng(func, check_perfect):
+    grid = func(MazeGrid(30, 20), np.random.default_rng(5))
+    check_perfect(grid)
+
+
+def test_sidewinder_in_small_blocks(monkeypatch, check_perfect):
+    monkeypatch.setattr('generators.vectorized.BLOCK_CELLS', 40 * 3) # Three rows per block
+    check_perfect(generate_sidewinder_np(MazeGrid(40, 41), random.Random(9)))
+
+
+@pytest.mark.parametrize('func', [generate_binary_tree_np, generate_sidewinder_np])
+def test_packed_walls_are_rejected(func, tmp_path):
+    path = tmp_path / 'maze.maze'
+    save_maze(path, MazeGrid(10, 10))
+    with open_maze(path) as maze_file:
+        with pytest.raises(TypeError, match="PackedWalls"):
+            func(maze_file.grid, random.Random(1))
@@ -0,0 +1,37 @@
+"""LRU cache of rendered text surfaces for the HUD.
+
+Fonts are loaded once when the cache is created. A label is only passed to
+`font.render` the first time its exact text/colour is needed. After that
+the cached surface is reused until it ages out of the LRU.
+"""
+
+from collections import OrderedDict
+
+
+class TextCache:
+    """Renders text with named, preloaded fonts and caches the surfaces."""
+
+    def __init__(self, fonts, max_entries=128):
+        self.fonts = dict(fonts) # name -> pygame.font.Font, loaded once by the caller
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font_name, text, color, antialias=True):
+        """Returns the surface for `text`, rendering it only on a cache miss."""
+        key = (font_name, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.fonts[font_name].render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False) # Evict the least recently used label
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
@@ -0,0 +1,75 @@
+"""Compact storage for the player's trail.
+
+The path is an `array('q')` of cell indices. Per-cell edge bits (the same
+TOP/RIGHT/BOTTOM/LEFT layout as the wall masks) record which cell edges the
+trail currently crosses, so any part of the trail can be redrawn from the
+cells on screen alone. With `max_segments` set, only the last N segments
+are kept: older cells are dropped from the front of the array and their
+edges are cleared once no remaining segment uses them.
+"""
+
+from array import array
+from collections import Counter
+
+from maze_grid import TOP, RIGHT, BOTTOM, LEFT, ALL_WALLS
+
+
+class Trail:
+    """The cells the player has walked through, optionally capped to the last N moves."""
+
+    def __init__(self, grid, start_index, max_segments=None, edges=None):
+        self.width = grid.width
+        self.max_segments = max_segments
+        self.cells = array('q', [start_index])
+        self.head = 0 # First live entry of `cells` in capped mode
+        # One mask per cell; pass a sparse mapping (e.g. chunked_maze.SparseMasks) for huge worlds
+        self.edges = bytearray(grid.size) if edges is None else edges
+        # Capped mode only: how many live segments use each edge, at most N entries
+        self._edge_counts = Counter() if max_segments else None
+
+    def __len__(self):
+        """Number of segments currently kept."""
+        return len(self.cells) - self.head - 1
+
+    def _edge(self, a, b):
+        """(cell, bit) identifying the edge between adjacent cells a and b by its lower/right owner."""
+        if b == a + 1: return a, RIGHT
+        if b == a - 1: return b, RIGHT
+        if b > a: return a, BOTTOM
+        return b, BOTTOM
+
+    def _set_edge(self, a, b, present):
+        owner, bit = self._edge(a, b)
+        other, other_bit = (owner + 1, LEFT) if bit == RIGHT else (owner + self.width, TOP)
+        if present:
+            self.edges[owner] |= bit
+            self.edges[other] |= other_bit
+        else:
+            self.edges[owner] &= ALL_WALLS ^ bit
+            self.edges[other] &= ALL_WALLS ^ other_bit
+
+    def add(self, cell):
+        """Extends the trail to `cell`. Returns the (a, b) segments that decayed away."""
+        last = self.cells[-1]
+        self.cells.append(cell)
+        self._set_edge(last, cell, True)
+        if not self.max_segments:
+            return []
+
+        counts = self._edge_counts
+        counts[self._edge(last, cell)] += 1
+        removed = []
+        while len(self) > self.max_segments:
+            a, b = self.cells[self.head], self.cells[self.head + 1]
+            self.head += 1
+            key = self._edge(a, b)
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+                self._set_edge(a, b, False)
+                removed.append((a, b))
+        # Compact once the dead prefix outweighs the live part (amortized O(1))
+        if self.head > len(self.cells) // 2:
+            del self.cells[:self.head]
+            self.head = 0
+        return removed
@@ -0,0 +1,117 @@
+"""Headless replay verification (no pygame needed).
+
+Regenerates each replay's maze from its generator and seed, re-simulates the
+recorded moves with `replay.simulate` and recomputes the score, so submitted
+scores can be checked in bulk. Files are spread over a process pool in
+chunks, and each worker caches recent mazes, so replays of the same maze
+(e.g. a daily challenge) pay for generation only once.
+
+Usage: python verify_replays.py submissions/ --workers 8 --out results.jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from generators import GENERATORS, generate
+from replay import TICK_RATE, MOVE_TICKS, ReplayError, load_replay, simulate
+from solver import solve
+
+
+# --- Worker ---
+# Largest maze side regenerated for verification; the header allows 65535, which
+# would build a multi-gigabyte maze from a single crafted file
+MAX_SIDE = 4096
+
+@lru_cache(maxsize=64)
+def _maze(algorithm, seed, width, height, start, end):
+    """(grid, optimal move count) for a maze, cached per worker process."""
+    grid = generate(algorithm, width, height, rng=random.Random(seed))
+    path, _ = solve(grid, grid.index(*start), grid.index(*end))
+    return grid, len(path) - 1
+
+
+def verify_file(path):
+    """Verifies one replay file. Returns its result entry."""
+    entry = {'file': path, 'valid': False}
+    try:
+        replay = load_replay(path)
+    except (OSError, ReplayError) as e:
+        entry['reason'] = str(e)
+        return entry
+
+    entry['claimed_score'] = replay.claimed_score
+    if replay.tick_rate != TICK_RATE or replay.move_ticks != MOVE_TICKS:
+        entry['reason'] = f"timing rules differ ({replay.tick_rate} ticks/s, {replay.move_ticks} ticks/move)"
+    elif replay.seed is None:
+        entry['reason'] = "maze has no seed, so it cannot be regenerated"
+    elif replay.algorithm not in GENERATORS:
+        entry['reason'] = f"unknown maze generator '{replay.algorithm}'"
+    elif not (0 < replay.width <= MAX_SIDE and 0 < replay.height <= MAX_SIDE):
+        entry['reason'] = f"maze is {replay.width}x{replay.height}, verification allows up to {MAX_SIDE}x{MAX_SIDE}"
+    elif not all(0 <= x < replay.width and 0 <= y < replay.height for x, y in (replay.start, replay.end)):
+        entry['reason'] = "start or end lies outside the maze"
+    else:
+        grid, optimal_moves = _maze(replay.algorithm, replay.seed, replay.width, replay.height, replay.start, replay.end)
+        result = simulate(grid, replay, optimal_moves)
+        entry.update(result._asdict())
+        if result.valid and result.score != replay.claimed_score:
+            entry['valid'] = False
+            entry['reason'] = f"claimed score {replay.claimed_score} but the replay scores {result.score}"
+    return entry
+
+
+# --- Driver ---
+def find_replays(paths):
+    """Expands directories into the .replay files they contain, recursively."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.endswith('.replay'):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def verify_all(paths, workers=None, chunksize=64):
+    """Yields a result entry per replay file, in input order."""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(verify_file, paths, chunksize=chunksize)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify recorded maze replays and their scores.")
+    parser.add_argument('paths', nargs='+', help="replay files or directories of .replay files")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunksize', type=int, default=64, help="replays handed to a worker at a time")
+    parser.add_argument('--out', default=None, help="write one JSON result per replay to this .jsonl file")
+    args = parser.parse_args()
+
+    paths = list(find_replays(args.paths))
+    start_time = time.perf_counter()
+    valid = 0
+    out = open(args.out, 'w') if args.out else None
+    try:
+        for entry in verify_all(paths, args.workers, args.chunksize):
+            if entry['valid']:
+                valid += 1
+            elif not out:
+                print(f"  REJECTED {entry['file']}: {entry['reason']}")
+            if out:
+                out.write(json.dumps(entry) + '\n')
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - start_time
+    print(f"Verified {len(paths)} replays in {elapsed:.2f}s ({len(paths) / max(elapsed, 1e-9):.0f} replays/s): "
+          f"{valid} valid, {len(paths) - valid} rejected")
+
+
+if __name__ == '__main__':
+    main()